@@ -2,12 +2,18 @@
 Pytest configuration and fixtures for YOI tests
 """
 
+import os
 from pathlib import Path
 
-import pytest
+# Keep test runs from writing rotating log files into the repo's logs/engine.
+os.environ.setdefault("YOI_LOG_TO_FILE", "0")
 
+import pytest  # noqa: E402
 
-@pytest.fixture
+from yoi.config import YOIConfig  # noqa: E402
+
+
+@pytest.fixture(scope="session")
 def test_configs_dir():
     """Path to test config fixtures"""
     return Path(__file__).parent / "fixtures" / "configs"
@@ -19,7 +25,13 @@ def test_videos_dir():
     return Path(__file__).parent / "fixtures" / "videos"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_config_path(test_configs_dir):
     """Path to sample line-cross config"""
     return test_configs_dir / "line-cross-sample.yaml"
+
+
+@pytest.fixture(scope="module")
+def parsed_sample_config(sample_config_path):
+    """Sample config parsed once per module; treat as read-only in tests"""
+    return YOIConfig.from_yaml(str(sample_config_path))
@@ -0,0 +1,95 @@
+"""Tests for AlertManager event recording and persistence."""
+
+import json
+
+from yoi.alert import AlertManager
+
+
+def test_record_appends_jsonl_and_refreshes_json(tmp_path):
+    manager = AlertManager(tmp_path)
+
+    written = manager.record(
+        frame_idx=3,
+        feature="line_cross",
+        cctv_id="office",
+        alerts=[{"type": "line_crossing_in", "track_id": 1}, {"type": "line_crossing_out"}],
+        metrics={"total_in": 1},
+    )
+    manager.record(frame_idx=4, feature="line_cross", cctv_id="office", alerts=[{"type": "x"}])
+    manager.close()
+
+    assert written == 2
+    jsonl_lines = manager.alerts_jsonl.read_text(encoding="utf-8").splitlines()
+    assert len(jsonl_lines) == 3
+    assert json.loads(jsonl_lines[0])["alert"]["track_id"] == 1
+
+    records = json.loads(manager.alerts_json.read_text(encoding="utf-8"))
+    assert [record["frame_idx"] for record in records] == [3, 3, 4]
+    assert records[0]["metrics"] == {"total_in": 1}
+
+
+def test_record_without_alerts_writes_nothing(tmp_path):
+    manager = AlertManager(tmp_path)
+
+    assert manager.record(frame_idx=0, feature="line_cross", cctv_id="office", alerts=[]) == 0
+    assert not manager.alerts_jsonl.exists()
+    assert not manager.alerts_json.exists()
+
+
+def test_existing_jsonl_is_kept_in_alerts_json(tmp_path):
+    first = AlertManager(tmp_path)
+    first.record(frame_idx=1, feature="dwell_time", cctv_id="office", alerts=[{"type": "a"}])
+    first.close()
+
+    second = AlertManager(tmp_path)
+    second.record(frame_idx=2, feature="dwell_time", cctv_id="office", alerts=[{"type": "b"}])
+    second.close()
+
+    records = json.loads(second.alerts_json.read_text(encoding="utf-8"))
+    assert [record["alert"]["type"] for record in records] == ["a", "b"]
+
+
+def test_alerts_json_refresh_is_debounced_until_close(tmp_path):
+    manager = AlertManager(
+        tmp_path,
+        json_refresh_every_n_alerts=3,
+        json_refresh_interval_seconds=3600,
+    )
+
+    manager.record(frame_idx=1, feature="line_cross", cctv_id="office", alerts=[{"type": "a"}])
+    manager.record(frame_idx=2, feature="line_cross", cctv_id="office", alerts=[{"type": "b"}])
+    snapshot = json.loads(manager.alerts_json.read_text(encoding="utf-8"))
+    assert len(snapshot) == 1
+
+    manager.record(
+        frame_idx=3,
+        feature="line_cross",
+        cctv_id="office",
+        alerts=[{"type": "c"}, {"type": "d"}],
+    )
+    snapshot = json.loads(manager.alerts_json.read_text(encoding="utf-8"))
+    assert len(snapshot) == 4
+
+    manager.record(frame_idx=4, feature="line_cross", cctv_id="office", alerts=[{"type": "e"}])
+    manager.close()
+    snapshot = json.loads(manager.alerts_json.read_text(encoding="utf-8"))
+    assert len(snapshot) == 5
+
+
+def test_alerts_json_keeps_only_newest_records(tmp_path):
+    manager = AlertManager(tmp_path, json_max_records=2)
+
+    for frame_idx in range(4):
+        manager.record(
+            frame_idx=frame_idx,
+            feature="region_crowd",
+            cctv_id="office",
+            alerts=[{"type": "crowd_warning", "note": "line\nbreak"}],
+        )
+    manager.close()
+
+    snapshot_text = manager.alerts_json.read_text(encoding="utf-8")
+    snapshot = json.loads(snapshot_text)
+    assert [record["frame_idx"] for record in snapshot] == [2, 3]
+    assert snapshot_text == json.dumps(snapshot, ensure_ascii=False, indent=2)
+    assert len(manager.alerts_jsonl.read_text(encoding="utf-8").splitlines()) == 4
@@ -0,0 +1,185 @@
+"""Tests for per-frame analytics and dwell-time summaries."""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from yoi.analytics import analytics as analytics_module
+from yoi.analytics.analytics import AnalyticsEngine, FrameAnalytics
+
+
+def _tracker(tracks):
+    return SimpleNamespace(tracks=tracks, get_track=tracks.get)
+
+
+def _tracked(track_id, frames, class_name="person"):
+    return SimpleNamespace(
+        track_id=track_id,
+        class_name=class_name,
+        history=[(float(i), float(i)) for i in range(frames)],
+        frame_indices=list(range(frames)),
+        frames_alive=frames,
+        confidence_history=[0.5] * (frames - 1) + [0.9],
+    )
+
+
+def test_process_frame_counts_objects_by_class():
+    engine = AnalyticsEngine(fps=10, min_dwell_sec=1.0)
+    tracked_objects = {
+        1: (10.0, 20.0, "person"),
+        2: (30.0, 40.0, "person"),
+        3: (50.0, 60.0, "car"),
+    }
+
+    analytics = engine.process_frame(5, tracked_objects, {}, _tracker({}))
+
+    assert analytics.object_count == 3
+    assert analytics.object_count_by_class == {"person": 2, "car": 1}
+    assert analytics.active_tracks == tracked_objects
+    assert analytics.active_tracks is not tracked_objects
+
+
+def test_process_frame_emits_dwell_event_for_lost_tracks_only():
+    engine = AnalyticsEngine(fps=10, min_dwell_sec=1.0)
+    tracks = {1: _tracked(1, frames=15), 2: _tracked(2, frames=3), 3: _tracked(3, frames=20)}
+    previous = {1: (0.0, 0.0, "person"), 2: (0.0, 0.0, "person"), 3: (0.0, 0.0, "person")}
+    current = {3: (1.0, 1.0, "person")}
+
+    analytics = engine.process_frame(30, current, previous, _tracker(tracks))
+
+    assert [event.track_id for event in analytics.dwell_events] == [1]
+    event = engine.completed_tracks[1]
+    assert event.exit_frame == 30
+    assert event.dwell_time_sec == 1.5
+    assert event.max_confidence == 0.9
+    assert event.avg_confidence == pytest.approx((0.5 * 14 + 0.9) / 15)
+    assert event.entry_position == (0.0, 0.0)
+    assert event.exit_position == (14.0, 14.0)
+
+
+def test_dwell_analytics_confidence_reductions_handle_empty_history():
+    engine = AnalyticsEngine(fps=10, min_dwell_sec=1.0)
+    track = _tracked(4, frames=12)
+    track.confidence_history = []
+
+    event = engine._create_dwell_analytics(track, end_frame=40)
+
+    assert event.max_confidence == 0.0
+    assert event.avg_confidence == 0.0
+
+
+def test_export_summaries_writes_json_and_csv(tmp_path):
+    engine = AnalyticsEngine(fps=10, min_dwell_sec=1.0)
+    engine.completed_tracks[1] = engine._create_dwell_analytics(_tracked(1, frames=15), end_frame=30)
+
+    exported = engine.export_summaries(str(tmp_path))
+
+    payload = json.loads(Path(exported["json"]).read_text(encoding="utf-8"))
+    assert payload["total_objects"] == 1
+    assert payload["dwell_time_analytics"][0]["track_id"] == 1
+    assert payload["dwell_time_analytics"][0]["entry_position"] == [0.0, 0.0]
+
+    csv_lines = Path(exported["csv"]).read_text(encoding="utf-8").splitlines()
+    assert csv_lines == [
+        "track_id,class_name,entry_frame,exit_frame,dwell_time_sec,avg_confidence",
+        "1,person,0,30,1.50,0.527",
+    ]
+
+
+def test_frame_analytics_to_dict_stringifies_track_ids():
+    engine = AnalyticsEngine(fps=10, min_dwell_sec=1.0)
+    tracks = {1: _tracked(1, frames=15)}
+
+    analytics = engine.process_frame(30, {}, {1: (0.0, 0.0, "person")}, _tracker(tracks))
+    analytics.active_tracks = {9: (1.0, 2.0, "person")}
+    data = analytics.to_dict()
+
+    assert data["active_tracks"] == {"9": (1.0, 2.0, "person")}
+    assert data["dwell_events"][0]["track_id"] == 1
+    assert data["dwell_events"][0]["exit_position"] == (14.0, 14.0)
+    assert isinstance(data["timestamp"], str)
+
+
+def test_export_summaries_skips_parquet_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_module, "HAS_PYARROW", False)
+    engine = AnalyticsEngine(fps=10, min_dwell_sec=1.0)
+    assert engine.start_frame_export(str(tmp_path / "frames.parquet")) is False
+    engine.process_frame(0, {1: (1.0, 2.0, "person")}, {}, _tracker({}))
+
+    exported = engine.export_summaries(str(tmp_path))
+
+    assert "parquet" not in exported
+    assert not (tmp_path / "frames.parquet").exists()
+
+
+def test_process_frame_keeps_no_frame_rows_without_an_export():
+    engine = AnalyticsEngine(fps=10, min_dwell_sec=1.0)
+    for frame_idx in range(5):
+        engine.process_frame(frame_idx, {1: (1.0, 2.0, "person")}, {}, _tracker({}))
+
+    assert all(not values for values in engine._frame_columns.values())
+
+
+def test_frame_export_streams_row_groups(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(analytics_module, "_FRAME_ROW_GROUP_SIZE", 2)
+    engine = AnalyticsEngine(fps=10, min_dwell_sec=1.0)
+    assert engine.start_frame_export(str(tmp_path / "frames.parquet"))
+    for frame_idx in range(5):
+        engine.process_frame(frame_idx, {1: (1.0, 2.0, "person")}, {}, _tracker({}))
+
+    assert len(engine._frame_columns["frame_idx"]) == 1
+    parquet_file = engine.close_frame_export()
+
+    assert pq.ParquetFile(parquet_file).num_row_groups == 3
+    assert pq.read_table(parquet_file).column("frame_idx").to_pylist() == [0, 1, 2, 3, 4]
+
+
+def test_failed_frame_write_closes_writer_and_reports_no_parquet(tmp_path, monkeypatch):
+    closed = []
+
+    class _FailingWriter:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
+        def write_table(self, _table):
+            raise OSError("disk full")
+
+        def close(self):
+            closed.append(True)
+
+    monkeypatch.setattr(analytics_module, "HAS_PYARROW", True)
+    monkeypatch.setattr(analytics_module, "pa", SimpleNamespace(table=lambda *_a, **_k: object()))
+    monkeypatch.setattr(analytics_module, "pq", SimpleNamespace(ParquetWriter=_FailingWriter))
+    engine = AnalyticsEngine(fps=10, min_dwell_sec=1.0)
+    engine.start_frame_export(str(tmp_path / "frames.parquet"))
+    engine.process_frame(0, {1: (1.0, 2.0, "person")}, {}, _tracker({}))
+
+    exported = engine.export_summaries(str(tmp_path))
+
+    assert closed == [True]
+    assert "parquet" not in exported
+    assert engine.close_frame_export() is None
+
+
+def test_export_summaries_writes_frame_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    engine = AnalyticsEngine(fps=10, min_dwell_sec=1.0)
+    engine.start_frame_export(str(tmp_path / "frames.parquet"))
+    engine.process_frame(0, {1: (1.0, 2.0, "person")}, {}, _tracker({}))
+    engine.process_frame(1, {1: (1.0, 2.0, "person"), 2: (3.0, 4.0, "car")}, {}, _tracker({}))
+
+    exported = engine.export_summaries(str(tmp_path))
+
+    table = pq.read_table(exported["parquet"])
+    assert table.column("frame_idx").to_pylist() == [0, 1]
+    assert table.column("object_count").to_pylist() == [1, 2]
+    assert json.loads(table.column("object_count_by_class")[1].as_py()) == {"person": 1, "car": 1}
+
+
+def test_frame_analytics_timestamp_serializes_as_naive_utc_iso():
+    analytics = FrameAnalytics(frame_idx=0, timestamp_ns=1_700_000_000_123_456_789)
+
+    assert analytics.to_dict()["timestamp"] == "2023-11-14T22:13:20.123456"
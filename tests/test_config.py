@@ -24,3 +24,77 @@ def test_config_has_lines(sample_config_path):
 
     config = YOIConfig.from_yaml(str(sample_config_path))
     assert len(config.lines) > 0, "Config should have at least one line defined"
+
+
+def test_load_config_missing_input_fails_fast(tmp_path):
+    """Test that configs without an input section are rejected at load time"""
+    config_file = tmp_path / "no-input.yaml"
+    config_file.write_text("feature: line_cross\nmodel:\n  name: demo\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="input"):
+        YOIConfig.from_yaml(str(config_file))
+
+
+def test_load_config_non_mapping_fails_fast(tmp_path):
+    """Test that empty/non-mapping YAML is rejected with a clear error"""
+    config_file = tmp_path / "empty.yaml"
+    config_file.write_text("", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="mapping"):
+        YOIConfig.from_yaml(str(config_file))
+
+
+def test_load_config_cache_returns_independent_objects(sample_config_path):
+    """Test that cached parses never leak mutations between callers"""
+    config1 = YOIConfig.from_yaml(str(sample_config_path))
+    config1.metadata["_active_config_stem"] = "mutated"
+    config1.lines.clear()
+
+    config2 = YOIConfig.from_yaml(str(sample_config_path))
+    assert "_active_config_stem" not in config2.metadata
+    assert len(config2.lines) > 0
+
+
+def test_load_config_cache_invalidated_on_file_change(tmp_path):
+    """Test that editing the YAML file is picked up on next load"""
+    config_file = tmp_path / "cfg.yaml"
+    config_file.write_text("input:\n  source: a.mp4\nfeature: line_cross\n", encoding="utf-8")
+    assert YOIConfig.from_yaml(str(config_file)).feature == "line_cross"
+
+    config_file.write_text("input:\n  source: a.mp4\nfeature: region_crowd\n", encoding="utf-8")
+    assert YOIConfig.from_yaml(str(config_file)).feature == "region_crowd"
+
+
+def test_load_config_rejects_wrong_model_field_types(tmp_path):
+    """Test that model section types are validated once at load time"""
+    config_file = tmp_path / "bad-model.yaml"
+    config_file.write_text(
+        "input:\n  source: a.mp4\nmodel:\n  name: demo\n  conf: high\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="model.conf"):
+        YOIConfig.from_yaml(str(config_file))
+
+
+def test_load_config_accepts_integer_model_device(tmp_path):
+    """Test that an integer GPU index is accepted for model.device"""
+    config_file = tmp_path / "gpu-index.yaml"
+    config_file.write_text(
+        "input:\n  source: a.mp4\nmodel:\n  name: demo\n  device: 0\n",
+        encoding="utf-8",
+    )
+
+    assert YOIConfig.from_yaml(str(config_file)).model.device == 0
+
+
+def test_load_config_rejects_boolean_model_device(tmp_path):
+    """Test that a YAML boolean is still rejected for model.device"""
+    config_file = tmp_path / "bool-device.yaml"
+    config_file.write_text(
+        "input:\n  source: a.mp4\nmodel:\n  name: demo\n  device: true\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="model.device"):
+        YOIConfig.from_yaml(str(config_file))
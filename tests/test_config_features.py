@@ -136,6 +136,19 @@ class TestConfigFeatureLoading:
         assert "person_general_detection" in yaml_str
         assert "office" in yaml_str
 
+    def test_config_to_yaml_str_tracks_mutation(self, config_path):
+        """Ensure memoized YAML output is refreshed after config mutation."""
+        config = _load_test_config(config_path)
+        first = config.to_yaml_str()
+
+        assert config.to_yaml_str() is first
+
+        config.model.name = "renamed_model"
+        updated = config.to_yaml_str()
+
+        assert "renamed_model" in updated
+        assert "person_general_detection" not in updated
+
     def test_all_required_fields_present(self, config_path):
         """Ensure all required top-level fields are present."""
         config = _load_test_config(config_path)
@@ -0,0 +1,71 @@
+"""Tests for mapping tracked objects onto normalized feature detections."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from yoi.components import engine_feature_mapping
+from yoi.components.engine_feature_mapping import build_feature_detections
+
+
+def _det(cx, cy, class_name="person"):
+    return SimpleNamespace(
+        centroid_x=cx,
+        centroid_y=cy,
+        x1=cx - 10,
+        y1=cy - 20,
+        x2=cx + 10,
+        y2=cy + 20,
+        class_name=class_name,
+        class_id=0,
+        confidence=0.9,
+    )
+
+
+def _tracker(stale_ids=()):
+    return SimpleNamespace(
+        frame_idx=8,
+        get_track=lambda track_id: SimpleNamespace(
+            last_frame_idx=6 if track_id in stale_ids else 7
+        ),
+    )
+
+
+def test_tracks_claim_nearest_same_class_detection_in_order():
+    near, far, car = _det(100, 100), _det(300, 100), _det(102, 100, "car")
+    tracked = {1: (105.0, 100.0, "person"), 2: (110.0, 100.0, "person"), 3: (100.0, 100.0, "car")}
+
+    feature_dets, bbox_map = build_feature_detections(
+        _tracker(), [far, near, car], tracked, (200, 400, 3)
+    )
+
+    assert bbox_map == {1: near, 2: far, 3: car}
+    assert [det.track_id for det in feature_dets] == [1, 2, 3]
+    assert feature_dets[0].bbox == pytest.approx([0.225, 0.4, 0.275, 0.6])
+    assert feature_dets[0].centroid == pytest.approx((105.0 / 400, 0.5))
+
+
+def test_stale_tracks_and_surplus_tracks_are_skipped():
+    det = _det(50, 50)
+    tracked = {1: (50.0, 50.0, "person"), 2: (52.0, 50.0, "person"), 3: (51.0, 50.0, "person")}
+
+    feature_dets, bbox_map = build_feature_detections(
+        _tracker(stale_ids={1}), [det], tracked, (100, 100, 3)
+    )
+
+    assert bbox_map == {3: det}
+    assert [d.track_id for d in feature_dets] == [3]
+
+
+def test_assignment_minimizes_total_distance(monkeypatch):
+    pytest.importorskip("scipy")
+    left, right = _det(100, 50), _det(110, 50)
+    # Track 1 is nearest to `left`, but giving it `right` lets track 2 take `left`.
+    tracked = {1: (104.0, 50.0, "person"), 2: (99.0, 50.0, "person")}
+
+    _, bbox_map = build_feature_detections(_tracker(), [left, right], tracked, (100, 200, 3))
+    assert bbox_map == {1: right, 2: left}
+
+    monkeypatch.setattr(engine_feature_mapping, "HAS_SCIPY", False)
+    _, greedy_map = build_feature_detections(_tracker(), [left, right], tracked, (100, 200, 3))
+    assert greedy_map == {1: left, 2: right}
@@ -0,0 +1,47 @@
+"""Tests for VisionEngine per-feature metrics handlers."""
+
+import logging
+
+from yoi.components.engine import VisionEngine
+
+
+def _engine():
+    engine = object.__new__(VisionEngine)
+    engine.logger = logging.getLogger("yoi.test.engine")
+    engine._log_every_n_frames = 60
+    engine._feature_log_every_n_frames = 10
+    engine._init_runtime_state()
+    return engine
+
+
+def test_metrics_handlers_cover_builtin_features():
+    engine = _engine()
+
+    assert set(engine._metrics_handlers) == {"line_cross", "region_crowd", "dwell_time"}
+
+
+def test_line_cross_handler_tracks_last_counts():
+    engine = _engine()
+    metrics = {"feature": "line_cross", "total_in": 2, "total_out": 1, "net_count": 1}
+
+    engine._metrics_handlers["line_cross"](5, metrics, set(), {})
+
+    assert engine._last_line_cross_counts == (2, 1, 1)
+
+
+def test_region_and_dwell_handlers_mark_track_states():
+    engine = _engine()
+    states = {}
+
+    engine._metrics_handlers["region_crowd"](
+        3, {"feature": "region_crowd", "inside_track_ids": [1]}, {1, 2}, states
+    )
+    assert states == {1: "inside", 2: "outside"}
+
+    engine._metrics_handlers["dwell_time"](
+        3,
+        {"feature": "dwell_time", "inside_track_ids": [1, 2], "alerted_track_ids": [2]},
+        {1, 2, 3},
+        states,
+    )
+    assert states == {1: "dwell_inside", 2: "dwell_alert", 3: "dwell_outside"}
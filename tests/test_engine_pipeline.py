@@ -0,0 +1,216 @@
+"""Tests for the background decode/output stages used by VisionEngine."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from yoi.components.engine_pipeline import (
+    AdaptiveSkipper,
+    EventWriter,
+    FramePrefetcher,
+    OrderedWorker,
+)
+
+
+def _frames(count):
+    for idx in range(count):
+        yield idx, f"frame-{idx}"
+
+
+def test_prefetcher_yields_frames_in_order():
+    prefetcher = FramePrefetcher(_frames(20), maxsize=3)
+
+    assert list(prefetcher) == [(idx, f"frame-{idx}") for idx in range(20)]
+    prefetcher.close()
+
+
+def test_prefetcher_reraises_reader_errors_on_consumer_thread():
+    def _broken():
+        yield 0, "frame-0"
+        raise RuntimeError("decode failed")
+
+    prefetcher = FramePrefetcher(_broken(), maxsize=2)
+
+    with pytest.raises(RuntimeError, match="decode failed"):
+        list(prefetcher)
+    prefetcher.close()
+
+
+def test_prefetcher_close_releases_blocked_reader_and_closes_generator():
+    closed = threading.Event()
+
+    def _endless():
+        try:
+            idx = 0
+            while True:
+                yield idx, None
+                idx += 1
+        finally:
+            closed.set()
+
+    prefetcher = FramePrefetcher(_endless(), maxsize=2)
+    first = next(iter(prefetcher))
+    prefetcher.close()
+
+    assert first == (0, None)
+    assert closed.wait(timeout=2.0)
+
+
+def test_prefetcher_stops_waiting_when_stop_requested():
+    def _stalled():
+        time.sleep(5)
+        yield 0, None
+
+    stop = threading.Event()
+    prefetcher = FramePrefetcher(_stalled(), maxsize=2, should_stop=stop.is_set)
+    stop.set()
+
+    assert list(prefetcher) == []
+    prefetcher.close(timeout=0.1)
+
+
+def test_ordered_worker_processes_items_in_submit_order():
+    seen = []
+    worker = OrderedWorker(seen.append, maxsize=2, name="test-worker")
+    for idx in range(50):
+        worker.submit(idx)
+    worker.close()
+
+    assert seen == list(range(50))
+
+
+def test_ordered_worker_reraises_handler_error():
+    def _handler(item):
+        if item == 2:
+            raise ValueError("encode failed")
+
+    worker = OrderedWorker(_handler, maxsize=1, name="test-worker")
+    for idx in range(5):
+        try:
+            worker.submit(idx)
+        except ValueError:
+            break
+
+    with pytest.raises(ValueError, match="encode failed"):
+        worker.close()
+    worker.close(raise_error=False)
+
+
+def test_adaptive_skipper_raises_stride_when_busy_and_relaxes_when_idle():
+    skipper = AdaptiveSkipper(1, 3, idle_seconds=1.0)
+
+    assert skipper.update(0.0, fill_ratio=1.0) == 2
+    assert skipper.update(0.1, fill_ratio=1.0) == 3
+    assert skipper.update(0.2, fill_ratio=1.0) == 3
+
+    assert skipper.update(1.0, fill_ratio=0.0) == 3
+    assert skipper.update(1.5, fill_ratio=0.0) == 3
+    assert skipper.update(2.0, fill_ratio=0.0) == 2
+    assert skipper.update(3.0, fill_ratio=0.0) == 1
+    assert skipper.update(9.0, fill_ratio=0.0) == 1
+
+
+def test_adaptive_skipper_falls_back_to_inference_latency():
+    skipper = AdaptiveSkipper(2, 4)
+
+    assert skipper.update(0.0, infer_seconds=0.1, frame_interval=0.04) == 3
+    assert skipper.update(0.1) == 3
+
+
+def test_adaptive_skipper_disabled_when_bounds_match():
+    skipper = AdaptiveSkipper(2, 2)
+
+    assert not skipper.enabled
+    assert skipper.update(0.0, fill_ratio=1.0) == 2
+
+
+def test_annotation_buffer_ring_reuses_arrays():
+    np = pytest.importorskip("numpy")
+    from yoi.components.engine import VisionEngine
+
+    engine = SimpleNamespace(_annot_bufs=[], _annot_buf_slot=0, _annot_ring_size=2)
+    frames = [np.full((4, 6, 3), idx, dtype=np.uint8) for idx in range(3)]
+
+    first = VisionEngine._annotation_buffer(engine, frames[0])
+    second = VisionEngine._annotation_buffer(engine, frames[1])
+    third = VisionEngine._annotation_buffer(engine, frames[2])
+
+    assert first is not frames[0] and first is not second
+    assert third is first
+    assert int(second[0, 0, 0]) == 1 and int(third[0, 0, 0]) == 2
+
+
+def test_prefetcher_latest_only_skips_to_newest_frame():
+    prefetcher = FramePrefetcher(_frames(10), maxsize=16, latest_only=True)
+    while prefetcher._thread.is_alive():
+        time.sleep(0.01)
+
+    received = list(prefetcher)
+
+    assert received == [(9, "frame-9")]
+    assert prefetcher.dropped == 9
+    prefetcher.close()
+
+
+def test_prefetcher_reader_exits_when_stop_event_is_set():
+    stop_event = threading.Event()
+    prefetcher = FramePrefetcher(_frames(1000), maxsize=2, should_stop=stop_event.is_set)
+
+    stop_event.set()
+    prefetcher._thread.join(timeout=1.0)
+
+    assert not prefetcher._thread.is_alive()
+    assert len(list(prefetcher)) <= 2
+
+
+def test_event_writer_drops_items_instead_of_blocking_when_full():
+    release = threading.Event()
+    handled = []
+
+    def _slow(item):
+        release.wait(timeout=2.0)
+        handled.append(item)
+
+    writer = EventWriter(_slow, maxsize=1, name="test-event-writer")
+    assert writer.submit(0)
+    deadline = time.monotonic() + 2.0
+    while writer.queue.qsize() and time.monotonic() < deadline:
+        time.sleep(0.01)  # wait for the worker to take item 0
+    assert writer.submit(1)
+    assert not writer.submit(2)
+
+    release.set()
+    writer.close()
+
+    assert handled == [0, 1]
+    assert writer.dropped == 1
+    assert not writer.submit(3)
+
+
+def test_event_writer_survives_handler_errors():
+    handled = []
+
+    def _handler(item):
+        if item == "bad":
+            raise OSError("disk full")
+        handled.append(item)
+
+    writer = EventWriter(_handler, maxsize=4, name="test-event-writer")
+    for item in ("a", "bad", "b"):
+        writer.submit(item)
+    writer.close()
+
+    assert handled == ["a", "b"]
+    assert writer.errors == 1
+
+
+def test_prefetcher_latest_only_reader_evicts_oldest_instead_of_blocking():
+    prefetcher = FramePrefetcher(_frames(50), maxsize=2, latest_only=True)
+    prefetcher._thread.join(timeout=2.0)
+
+    assert not prefetcher._thread.is_alive()
+    assert list(prefetcher) == [(49, "frame-49")]
+    assert prefetcher.dropped == 49
+    prefetcher.close()
@@ -0,0 +1,61 @@
+"""Tests for VisionEngine RTSP push health bookkeeping."""
+
+import logging
+from types import SimpleNamespace
+
+from yoi.components.engine import VisionEngine
+
+
+class _FlakyPusher:
+    is_running = True
+
+    def __init__(self, results):
+        self._results = list(results)
+        self.restarts = 0
+
+    def push_frame(self, _frame):
+        return self._results.pop(0)
+
+    def restart(self):
+        self.restarts += 1
+        return True
+
+
+def _engine(monkeypatch, results):
+    monkeypatch.setenv("YOI_RTSP_RECOVER_COOLDOWN_SECONDS", "0")
+    engine = object.__new__(VisionEngine)
+    engine.logger = logging.getLogger("yoi.test.engine")
+    engine.config = SimpleNamespace(config_name="rtsp-test")
+    engine._rtsp_url = "rtsp://example.com/out"
+    engine.rtsp_pusher = _FlakyPusher(results)
+    engine._init_rtsp_state()
+    return engine
+
+
+def test_rtsp_failure_streak_recovers_and_resets(monkeypatch):
+    engine = _engine(monkeypatch, [False, False, True, True])
+
+    for frame_idx in range(4):
+        engine._push_rtsp_frame(frame_idx, None)
+
+    assert engine._rtsp_push_fail_count == 2
+    assert engine._rtsp_push_success_count == 2
+    assert engine.rtsp_pusher.restarts == 2
+    assert engine._rtsp_recover_count == 2
+    assert engine._rtsp_first_fail_ts is None
+    assert engine._rtsp_drop_warned is False
+
+
+def test_successful_pushes_only_check_health_clock_every_n_frames(monkeypatch):
+    from yoi.components import engine as engine_module
+
+    engine = _engine(monkeypatch, [True] * 40)
+    clock_reads = []
+    monkeypatch.setattr(engine_module.time, "monotonic", lambda: clock_reads.append(1) or 0.0)
+
+    for frame_idx in range(1, 41):
+        engine._push_rtsp_frame(frame_idx, None)
+
+    # First push logs health immediately; after that only frame 32 reads the clock.
+    assert len(clock_reads) == 2
+    assert engine._rtsp_push_success_count == 40
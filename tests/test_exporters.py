@@ -0,0 +1,39 @@
+"""Tests for frame-level data export."""
+
+import json
+
+import pytest
+
+pytest.importorskip("cv2")
+
+from yoi.output.exporters import DataExporter  # noqa: E402
+
+
+class _Analytics:
+    def __init__(self):
+        self.to_dict_calls = 0
+
+    def to_dict(self):
+        self.to_dict_calls += 1
+        return {"object_count": 1}
+
+
+def test_analytics_objects_are_serialized_only_on_export(tmp_path):
+    exporter = DataExporter(str(tmp_path))
+    analytics = _Analytics()
+
+    exporter.add_frame(frame_idx=0, detections=[], tracked_objects={}, analytics=analytics)
+    assert analytics.to_dict_calls == 0
+
+    exporter.export_json()
+    exporter.export_csv()
+
+    payload = json.loads((tmp_path / "detections.json").read_text(encoding="utf-8"))
+    assert payload["frames"][0]["analytics"] == {"object_count": 1}
+    assert analytics.to_dict_calls == 1
+    assert '""object_count"": 1' in (tmp_path / "detections.csv").read_text(encoding="utf-8")
+
+
+def test_exporter_reports_whether_it_is_active(tmp_path):
+    assert DataExporter(str(tmp_path)).is_active
+    assert not DataExporter(str(tmp_path), enabled=False).is_active
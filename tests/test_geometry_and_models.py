@@ -1,5 +1,6 @@
 """Tests for geometry parsing and model structure assumptions."""
 
+import dataclasses
 from pathlib import Path
 
 import pytest
@@ -68,6 +69,15 @@ class TestRegionLineLoading:
         assert line.coords[1].x == pytest.approx(0.7060764222822016)
         assert line.coords[1].y == pytest.approx(0.302779857268433)
 
+    def test_line_coordinates_are_immutable(self, config_path):
+        """Test bahwa CoordPoint frozen sehingga aman di-share"""
+        config = _load_config(config_path)
+        point = config.lines[0].coords[0]
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            point.x = 0.0  # type: ignore[misc]
+        assert hash(point) == hash(type(point)(x=point.x, y=point.y))
+
     def test_regions_loaded_from_config(self, config_path):
         """Test bahwa regions terbaca dari config (empty dalam case ini)"""
         config = _load_config(config_path)
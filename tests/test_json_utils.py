@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from yoi.utils import json_utils
+from yoi.utils.json_utils import json_dumps, json_dumps_bytes
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param and not json_utils.HAS_ORJSON:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_utils, "HAS_ORJSON", request.param)
+    return request.param
+
+
+def test_indented_output_matches_stdlib_layout(backend):
+    payload = {"feature": "line_cross", "alert": {"type": "in", "note": "é"}, "ids": [1, 2], "empty": {}}
+
+    assert json_dumps(payload, indent=True) == json.dumps(payload, ensure_ascii=False, indent=2)
+
+
+def test_compact_output_round_trips_non_str_keys(backend):
+    payload = {1: "a", "nested": {"x": 1.5}}
+
+    assert json.loads(json_dumps(payload)) == {"1": "a", "nested": {"x": 1.5}}
+
+
+def test_compact_output_has_no_separator_whitespace(backend):
+    payload = {"feature": "line_cross", "ids": [1, 2]}
+
+    assert json_dumps(payload) == '{"feature":"line_cross","ids":[1,2]}'
+
+
+@pytest.mark.parametrize("indent", [True, False])
+def test_bytes_output_matches_text_output(backend, indent):
+    payload = {"feature": "line_cross", "alert": {"note": "é"}, 3: [1.5, None]}
+
+    assert json_dumps_bytes(payload, indent=indent) == json_dumps(payload, indent=indent).encode("utf-8")
@@ -0,0 +1,61 @@
+"""Tests for centroid tracking state kept on TrackedObject."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from yoi.analytics.analytics import AnalyticsEngine  # noqa: E402
+from yoi.tracking.object_tracker import ObjectTracker  # noqa: E402
+
+
+class _Det:
+    def __init__(self, x: float, y: float, confidence: float, class_name: str = "person"):
+        self.centroid_x = x
+        self.centroid_y = y
+        self.confidence = confidence
+        self.class_name = class_name
+
+
+def test_centroid_track_histories_feed_dwell_analytics():
+    tracker = ObjectTracker(tracker_impl="centroid", max_distance=50.0, reid_enabled=False)
+    for idx, conf in enumerate((0.5, 0.9, 0.7)):
+        tracker.update([_Det(10.0 + idx, 20.0, conf)])
+
+    track = tracker.get_track(1)
+    confidences = track.confidence_array
+
+    assert track.frames_alive == 3
+    assert list(track.frame_indices) == [0, 1, 2]
+    assert confidences.dtype == np.float64
+    assert np.shares_memory(confidences, track.confidence_array)
+    assert confidences.tolist() == [0.5, 0.9, 0.7]
+
+    del confidences
+    event = AnalyticsEngine(fps=10)._create_dwell_analytics(track, end_frame=5)
+    assert event.entry_frame == 0
+    assert event.max_confidence == 0.9
+    assert event.avg_confidence == pytest.approx(0.7)
+    assert event.entry_position == (10.0, 20.0)
+
+
+def test_track_history_is_bounded_but_lifetime_stats_are_kept(monkeypatch):
+    from yoi.tracking import object_tracker
+
+    monkeypatch.setattr(object_tracker, "_TRACK_HISTORY_CAPACITY", 4)
+    tracker = ObjectTracker(tracker_impl="centroid", max_distance=50.0, reid_enabled=False)
+    for idx in range(20):
+        tracker.update([_Det(10.0 + idx, 20.0, 0.5 if idx else 0.9)])
+
+    track = tracker.get_track(1)
+
+    assert len(track.history) <= 8
+    assert len(track.frame_indices) == len(track.confidence_history) == len(track.history)
+    assert list(track.frame_indices)[-1] == 19
+    assert track.frames_alive == 20
+
+    event = AnalyticsEngine(fps=10)._create_dwell_analytics(track, end_frame=25)
+    assert event.entry_frame == 0
+    assert event.entry_position == (10.0, 20.0)
+    assert event.exit_position == (29.0, 20.0)
+    assert event.max_confidence == 0.9
+    assert event.avg_confidence == pytest.approx((0.9 + 0.5 * 19) / 20)
@@ -1,8 +1,8 @@
+import json
 from pathlib import Path
 from types import SimpleNamespace
 
-import cv2
-import numpy as np
+import pytest
 
 from yoi.components import engine_output_lifecycle as output_lifecycle
 from yoi.components.engine_output_lifecycle import (
@@ -12,13 +12,38 @@ from yoi.components.engine_output_lifecycle import (
 
 
 class _DummyInput:
-    def __init__(self, source_path: str):
+    def __init__(self, source_path: str, source_type: str | None = None):
+        self.source_type = source_type
         self._source_path = source_path
 
     def get_source_path(self) -> str:
         return self._source_path
 
 
+class _DummyLogger:
+    def info(self, *args, **kwargs):
+        return None
+
+    def warning(self, *args, **kwargs):
+        return None
+
+    def error(self, *args, **kwargs):
+        return None
+
+
+class _DummyOutput:
+    mode = "development"
+    output_format = "json"
+    save_video = False
+    save_annotations = False
+
+    def __init__(self, output_dir: str):
+        self._output_dir = output_dir
+
+    def get_output_dir(self) -> str:
+        return self._output_dir
+
+
 def _dummy_engine(config_name: str, source_path: str, active_stem: str | None = None):
     metadata = {}
     if active_stem:
@@ -60,103 +85,95 @@ def test_output_path_uses_config_name_when_active_stem_missing():
     assert result.parts[2].startswith("14_")
 
 
-def test_rtsp_source_type_forces_logs_output_dir(tmp_path, monkeypatch):
+@pytest.fixture
+def make_output_engine(tmp_path, monkeypatch):
+    """Factory for engine stubs consumed by initialize_output_engines."""
     monkeypatch.setattr(output_lifecycle, "_initialize_rtsp", lambda engine: None)
 
-    base_logs_dir = tmp_path / "logs"
-    output_dir = tmp_path / "output"
+    def _make(source_type: str, source_path: str, config_name: str, **logs_overrides):
+        logs = {"base_dir": str(tmp_path / "logs"), **logs_overrides}
+        return SimpleNamespace(
+            config=SimpleNamespace(
+                input=_DummyInput(source_path, source_type=source_type),
+                output=_DummyOutput(str(tmp_path / "output")),
+                logs=SimpleNamespace(**logs),
+                metadata={},
+                config_name=config_name,
+            ),
+            video_reader=None,
+            logger=_DummyLogger(),
+        )
 
-    class _DummyInput:
-        source_type = "rtsp"
+    return _make
 
-        @staticmethod
-        def get_source_path() -> str:
-            return "rtsp://example.com/stream"
 
-    class _DummyOutput:
-        mode = "development"
-        output_format = "json"
-        save_video = False
-        save_annotations = False
+def test_rtsp_source_type_forces_logs_output_dir(tmp_path, make_output_engine):
+    engine = make_output_engine("rtsp", "rtsp://example.com/stream", "rtsp-test")
 
-        @staticmethod
-        def get_output_dir() -> str:
-            return str(output_dir)
+    output_lifecycle.initialize_output_engines(engine)
 
-    class _DummyLogger:
-        def info(self, *args, **kwargs):
-            return None
+    assert engine.output_dir == tmp_path / "logs"
+    assert (tmp_path / "logs" / "data.csv").exists()
+    engine._event_writer.close()
 
-        def warning(self, *args, **kwargs):
-            return None
 
-        def error(self, *args, **kwargs):
-            return None
-
-    engine = SimpleNamespace(
-        config=SimpleNamespace(
-            input=_DummyInput(),
-            output=_DummyOutput(),
-            logs=SimpleNamespace(base_dir=str(base_logs_dir)),
-            metadata={},
-            config_name="rtsp-test",
-        ),
-        video_reader=None,
-        logger=_DummyLogger(),
-    )
+def test_initialize_replaces_previous_run_csv_and_keeps_other_files(tmp_path, make_output_engine):
+    logs_dir = tmp_path / "logs"
+    logs_dir.mkdir()
+    (logs_dir / "data.csv").write_text("stale\n", encoding="utf-8")
+    (logs_dir / "notes.txt").write_text("keep\n", encoding="utf-8")
+    engine = make_output_engine("rtsp", "rtsp://example.com/stream", "rtsp-test")
 
     output_lifecycle.initialize_output_engines(engine)
+    engine._event_writer.close()
+    engine._data_csv_file.close()
 
-    assert engine.output_dir == base_logs_dir
-    assert (base_logs_dir / "data.csv").exists()
+    assert (logs_dir / "data.csv").read_text(encoding="utf-8").startswith("image_id,")
+    assert (logs_dir / "notes.txt").exists()
 
 
-def test_logs_config_folder_and_csv_names_are_respected(tmp_path, monkeypatch):
-    monkeypatch.setattr(output_lifecycle, "_initialize_rtsp", lambda engine: None)
-
-    class _DummyInput:
-        source_type = "video"
+def test_remove_stale_files_continues_past_a_failed_unlink(tmp_path, monkeypatch):
+    for name in ("data.csv", "output_annotated.mp4"):
+        (tmp_path / name).write_text("stale", encoding="utf-8")
+    real_unlink = output_lifecycle.os.unlink
 
-        @staticmethod
-        def get_source_path() -> str:
-            return "input/demo.mp4"
+    def _unlink(path):
+        if path.endswith("data.csv"):
+            raise PermissionError(path)
+        real_unlink(path)
 
-    class _DummyOutput:
-        mode = "development"
-        output_format = "json"
-        save_video = False
-        save_annotations = False
+    monkeypatch.setattr(output_lifecycle.os, "unlink", _unlink)
+    engine = SimpleNamespace(output_dir=tmp_path, logger=_DummyLogger())
 
-        @staticmethod
-        def get_output_dir() -> str:
-            return str(tmp_path / "output")
+    output_lifecycle._remove_stale_files(engine, ["data.csv", "output_annotated.mp4"])
 
-    class _DummyLogger:
-        def info(self, *args, **kwargs):
-            return None
+    assert (tmp_path / "data.csv").exists()
+    assert not (tmp_path / "output_annotated.mp4").exists()
 
-        def warning(self, *args, **kwargs):
-            return None
 
-        def error(self, *args, **kwargs):
-            return None
+def test_debug_artifact_flag_starts_analytics_frame_export(tmp_path, make_output_engine, monkeypatch):
+    monkeypatch.setenv("YOI_EXPORT_DEBUG_ARTIFACTS", "1")
+    started = []
+    engine = make_output_engine("rtsp", "rtsp://example.com/stream", "rtsp-test")
+    engine.analytics_engine = SimpleNamespace(start_frame_export=started.append)
 
-    engine = SimpleNamespace(
-        config=SimpleNamespace(
-            input=_DummyInput(),
-            output=_DummyOutput(),
-            logs=SimpleNamespace(
-                base_dir=str(tmp_path / "logs"),
-                data_folder="data_custom",
-                image_folder="image_custom",
-                status_folder="status_custom",
-                csv_file="event_custom.csv",
-            ),
-            metadata={},
-            config_name="video-test",
-        ),
-        video_reader=None,
-        logger=_DummyLogger(),
+    output_lifecycle.initialize_output_engines(engine)
+    engine._event_writer.close()
+    engine._data_csv_file.close()
+
+    assert engine._export_debug_artifacts is True
+    assert started == [str(tmp_path / "logs" / "analytics" / "frames.parquet")]
+
+
+def test_logs_config_folder_and_csv_names_are_respected(make_output_engine):
+    engine = make_output_engine(
+        "video",
+        "input/demo.mp4",
+        "video-test",
+        data_folder="data_custom",
+        image_folder="image_custom",
+        status_folder="status_custom",
+        csv_file="event_custom.csv",
     )
 
     output_lifecycle.initialize_output_engines(engine)
@@ -166,18 +183,12 @@ def test_logs_config_folder_and_csv_names_are_respected(tmp_path, monkeypatch):
     assert engine.status_dir.name == "status_custom"
     assert engine.data_csv_path.name == "event_custom.csv"
     assert engine.data_csv_path.exists()
+    engine._event_writer.close()
 
 
 def test_feature_alert_event_writes_data_image_csv_and_skips_status_for_video(tmp_path):
-    class _DummyLogger:
-        def info(self, *args, **kwargs):
-            return None
-
-        def warning(self, *args, **kwargs):
-            return None
-
-        def error(self, *args, **kwargs):
-            return None
+    cv2 = pytest.importorskip("cv2")
+    np = pytest.importorskip("numpy")
 
     class _Det:
         x1 = 10
@@ -243,11 +254,219 @@ def test_feature_alert_event_writes_data_image_csv_and_skips_status_for_video(tm
     assert image.shape[1] < frame.shape[1]
 
     payload = data_files[0].read_text(encoding="utf-8")
-    assert '"feature": "line_cross"' in payload
-    assert '"warning": "line_crossing_in"' in payload
-    assert '"track_id": 7' in payload
+    assert '"feature":"line_cross"' in payload
+    assert '"warning":"line_crossing_in"' in payload
+    assert '"track_id":7' in payload
 
     csv_lines = data_csv.read_text(encoding="utf-8").splitlines()
     assert len(csv_lines) == 2
     assert "line_cross" in csv_lines[1]
     assert "line_crossing_in" in csv_lines[1]
+
+
+def test_feature_alert_rows_reuse_open_data_csv_handle(make_output_engine):
+    np = pytest.importorskip("numpy")
+
+    engine = make_output_engine("rtsp", "rtsp://example.com/stream", "rtsp-test")
+    output_lifecycle.initialize_output_engines(engine)
+    engine.config.cctv_id = "office"
+    engine._event_counter = 0
+    csv_file = engine._data_csv_file
+
+    feature_result = SimpleNamespace(
+        feature_type="region_crowd",
+        metrics={"feature": "region_crowd"},
+        alerts=[{"type": "crowd_warning"}, {"type": "crowd_critical"}],
+    )
+    frame = np.zeros((40, 60, 3), dtype=np.uint8)
+    handle_feature_alert_events(
+        engine=engine,
+        frame_idx=3,
+        frame=frame,
+        annotated_frame=frame,
+        feature_result=feature_result,
+    )
+
+    assert engine._data_csv_file is csv_file
+    engine._event_writer.close()
+    csv_file.flush()
+    csv_lines = engine.data_csv_path.read_text(encoding="utf-8").splitlines()
+    assert len(csv_lines) == 3
+    assert len(list(engine.image_dir.glob("*.jpg"))) == 2
+    assert len(list(engine.status_dir.glob("*.json"))) == 2
+    csv_file.close()
+
+
+def test_data_csv_rows_are_flushed_in_batches(make_output_engine, monkeypatch):
+    monkeypatch.setattr(output_lifecycle, "_CSV_FLUSH_EVERY_ROWS", 3)
+    monkeypatch.setattr(output_lifecycle, "_CSV_FLUSH_INTERVAL_S", float("inf"))
+    engine = make_output_engine("rtsp", "rtsp://example.com/stream", "rtsp-test")
+    output_lifecycle.initialize_output_engines(engine)
+
+    def _csv_line_count():
+        return len(engine.data_csv_path.read_text(encoding="utf-8").splitlines())
+
+    for index in range(3):
+        assert _csv_line_count() == 1
+        output_lifecycle._append_event_csv_rows(
+            engine, [(f"id{index}", "ts", "region_crowd", "crowd_warning", "d", "i")]
+        )
+
+    assert _csv_line_count() == 4
+    engine._data_csv_file.close()
+    engine._event_writer.close()
+
+
+def test_wide_alert_snapshots_are_downscaled(make_output_engine, monkeypatch):
+    cv2 = pytest.importorskip("cv2")
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(output_lifecycle, "_ALERT_IMAGE_MAX_WIDTH", 80)
+
+    engine = make_output_engine("video", "input/demo.mp4", "video-test")
+    output_lifecycle.initialize_output_engines(engine)
+    engine.config.cctv_id = "office"
+    engine._event_counter = 0
+
+    frame = np.zeros((100, 160, 3), dtype=np.uint8)
+    feature_result = SimpleNamespace(
+        feature_type="region_crowd",
+        metrics={"feature": "region_crowd"},
+        alerts=[{"type": "crowd_warning"}],
+    )
+    handle_feature_alert_events(
+        engine=engine,
+        frame_idx=1,
+        frame=frame,
+        annotated_frame=frame,
+        feature_result=feature_result,
+    )
+    engine._event_writer.close()
+    engine._data_csv_file.close()
+
+    (image_file,) = engine.image_dir.glob("*.jpg")
+    assert cv2.imread(str(image_file)).shape[:2] == (50, 80)
+
+
+def test_alert_jpeg_encoding_prefers_turbojpeg_when_available():
+    np = pytest.importorskip("numpy")
+
+    class _FakeTurbo:
+        def encode(self, image, quality):
+            return b"turbo-%d" % quality
+
+    image = np.zeros((8, 8, 3), dtype=np.uint8)
+    turbo_engine = SimpleNamespace(_turbojpeg=_FakeTurbo())
+    assert output_lifecycle._encode_jpeg(turbo_engine, image) == b"turbo-80"
+
+    encoded = output_lifecycle._encode_jpeg(SimpleNamespace(_turbojpeg=None), image)
+    assert bytes(encoded[:2]) == b"\xff\xd8"
+
+
+def test_event_payload_omits_per_track_metric_lists(make_output_engine):
+    np = pytest.importorskip("numpy")
+
+    engine = make_output_engine("video", "input/demo.mp4", "video-test")
+    output_lifecycle.initialize_output_engines(engine)
+    engine.config.cctv_id = "office"
+    engine._event_counter = 0
+
+    metrics = {
+        "feature": "dwell_time",
+        "inside_track_ids": [1, 2, 3],
+        "alerted_track_ids": [2],
+        "total_dwells_recorded": 4,
+    }
+    frame = np.zeros((20, 20, 3), dtype=np.uint8)
+    handle_feature_alert_events(
+        engine=engine,
+        frame_idx=5,
+        frame=frame,
+        annotated_frame=frame,
+        feature_result=SimpleNamespace(
+            feature_type="dwell_time", metrics=metrics, alerts=[{"type": "dwell_time_alert"}]
+        ),
+    )
+    engine._event_writer.close()
+    engine._data_csv_file.close()
+
+    (data_file,) = engine.data_dir.glob("*.json")
+    payload = json.loads(data_file.read_text(encoding="utf-8"))
+    assert payload["metrics"] == {"feature": "dwell_time", "total_dwells_recorded": 4}
+    assert "inside_track_ids" in metrics
+
+
+def test_alerts_sharing_the_full_frame_encode_it_once(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+
+    encoded = []
+
+    def _fake_encode(engine, image):
+        encoded.append(image)
+        return b"jpeg"
+
+    monkeypatch.setattr(output_lifecycle, "_encode_jpeg", _fake_encode)
+    image = np.zeros((4, 4, 3), dtype=np.uint8)
+    crop = np.ones((2, 2, 3), dtype=np.uint8)
+    paths = [str(tmp_path / name) for name in ("a.jpg", "b.jpg", "c.jpg")]
+
+    output_lifecycle._write_event_files(
+        SimpleNamespace(logger=_DummyLogger()),
+        [(paths[0], image, "alert image"), (paths[1], crop, "alert image"), (paths[2], image, "alert image")],
+    )
+
+    assert len(encoded) == 2
+    assert all(Path(path).read_bytes() == b"jpeg" for path in paths)
+
+
+def test_write_event_files_recreates_a_removed_event_directory(tmp_path):
+    path = tmp_path / "image" / "event.jpg"
+
+    output_lifecycle._write_event_files(
+        SimpleNamespace(logger=_DummyLogger()),
+        [(str(path), b"jpeg", "alert image")],
+    )
+
+    assert path.read_bytes() == b"jpeg"
+
+
+def test_cleanup_summary_reports_dropped_live_frames_separately(tmp_path):
+    messages = []
+    logger = SimpleNamespace(info=messages.append, warning=messages.append)
+    engine = SimpleNamespace(
+        logger=logger,
+        feature_engine=None,
+        video_writer=None,
+        video_reader=None,
+        config=SimpleNamespace(output=None),
+        start_time=output_lifecycle.time.monotonic() - 2.0,
+        frame_count=40,
+        output_dir=tmp_path,
+        _frame_prefetcher=SimpleNamespace(dropped=25, is_alive=False),
+    )
+
+    output_lifecycle.cleanup_engine(engine)
+
+    assert "Frames processed: 40" in messages
+    assert "Frames dropped (stale live frames): 25" in messages
+
+
+def test_cleanup_leaves_reader_open_while_prefetch_thread_is_alive(tmp_path):
+    closed = []
+    engine = SimpleNamespace(
+        logger=_DummyLogger(),
+        feature_engine=None,
+        video_writer=None,
+        video_reader=SimpleNamespace(close=lambda: closed.append(True)),
+        config=SimpleNamespace(output=None),
+        start_time=output_lifecycle.time.monotonic() - 1.0,
+        frame_count=1,
+        output_dir=tmp_path,
+        _frame_prefetcher=SimpleNamespace(dropped=0, is_alive=True),
+    )
+
+    output_lifecycle.cleanup_engine(engine)
+    assert closed == []
+
+    engine._frame_prefetcher.is_alive = False
+    output_lifecycle.cleanup_engine(engine)
+    assert closed == [True]
@@ -0,0 +1,224 @@
+"""Tests for frame overlay rendering in VideoAnnotator."""
+
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+from yoi.annotate import video_annotator  # noqa: E402
+from yoi.annotate.video_annotator import VideoAnnotator  # noqa: E402
+
+
+def _frame(height=240, width=320):
+    return np.full((height, width, 3), 128, dtype=np.uint8)
+
+
+def test_draw_analytics_reuses_cached_text_sizes():
+    annotator = VideoAnnotator()
+    data = {"object_count": 2, "object_count_by_class": {"person": 2}}
+
+    video_annotator._text_size.cache_clear()
+    annotator.draw_analytics(_frame(), data)
+    misses = video_annotator._text_size.cache_info().misses
+    annotator.draw_analytics(_frame(), data)
+
+    assert video_annotator._text_size.cache_info().misses == misses
+
+
+def test_draw_analytics_accepts_frame_analytics_object():
+    from yoi.analytics.analytics import FrameAnalytics
+
+    annotator = VideoAnnotator()
+    analytics = FrameAnalytics(
+        frame_idx=3, object_count=2, object_count_by_class={"person": 2}, active_tracks={}
+    )
+
+    from_object = annotator.draw_analytics(_frame(), analytics)
+    from_dict = annotator.draw_analytics(_frame(), analytics.to_dict())
+
+    assert np.array_equal(from_object, from_dict)
+
+
+def test_draw_tracks_marks_bbox_and_leaves_far_pixels_untouched():
+    annotator = VideoAnnotator()
+    frame = _frame()
+    det = SimpleNamespace(x1=100, y1=100, x2=150, y2=200)
+
+    result = annotator.draw_tracks(frame, {1: (125.0, 150.0, "person")}, {1: det}, {1: "in"})
+
+    assert result is frame
+    assert tuple(frame[150, 100]) == VideoAnnotator.COLOR_IN
+    assert tuple(frame[230, 10]) == (128, 128, 128)
+
+
+def test_draw_panel_blends_only_panel_and_shadow_area():
+    annotator = VideoAnnotator()
+    frame = _frame()
+
+    annotator._draw_panel(frame, (20, 20), (60, 40), alpha=0.5, shadow_alpha=0.2)
+
+    assert tuple(frame[30, 40]) != (128, 128, 128)
+    assert tuple(frame[43, 63]) != (128, 128, 128)
+    assert tuple(frame[44, 64]) == (128, 128, 128)
+    assert tuple(frame[19, 19]) == (128, 128, 128)
+
+
+def test_draw_panel_clips_to_frame_bounds():
+    annotator = VideoAnnotator()
+    frame = _frame(height=50, width=50)
+
+    annotator._draw_panel(frame, (-10, -10), (80, 80))
+    annotator._draw_panel(frame, (60, 60), (90, 90))
+
+    assert tuple(frame[0, 0]) != (128, 128, 128)
+
+
+def test_overlay_scratch_buffer_is_reused_across_panels():
+    annotator = VideoAnnotator()
+    frame = _frame()
+
+    annotator._draw_panel(frame, (10, 10), (300, 120))
+    buffer = annotator._overlay_buf
+    annotator._draw_panel(frame, (150, 100), (200, 130))
+    annotator.draw_analytics(frame, {"object_count": 1, "object_count_by_class": {}})
+
+    assert annotator._overlay_buf is buffer
+
+
+def test_draw_boxes_truncates_float_coordinates():
+    annotator = VideoAnnotator()
+    frame = _frame()
+    det = SimpleNamespace(x1=40.9, y1=80.7, x2=120.2, y2=200.6, class_name="person", confidence=0.87)
+
+    assert annotator.draw_boxes(frame, []) is frame
+    annotator.draw_boxes(frame, [det])
+
+    assert tuple(frame[150, 40]) == VideoAnnotator.COLOR_DEFAULT_BBOX
+    assert tuple(frame[150, 120]) == VideoAnnotator.COLOR_DEFAULT_BBOX
+    assert tuple(frame[150, 80]) == (128, 128, 128)
+
+
+def test_bbox_smoothing_blends_with_previous_frame(monkeypatch):
+    monkeypatch.setenv("YOI_BBOX_SMOOTHING", "1")
+    annotator = VideoAnnotator()
+    first = SimpleNamespace(x1=100.0, y1=100.0, x2=200.0, y2=200.0)
+    second = SimpleNamespace(x1=120.0, y1=100.0, x2=220.0, y2=200.0)
+    objects = {1: (150.0, 150.0, "person"), 2: (20.0, 20.0, "person")}
+
+    annotator.draw_tracks(_frame(), objects, {1: first, 2: first})
+    annotator.draw_tracks(_frame(), objects, {1: second})
+
+    row = annotator._smoothed_index[1]
+    alpha = annotator._bbox_smoothing_alpha
+    assert annotator._smoothed_arr[row][0] == pytest.approx(alpha * 120.0 + (1 - alpha) * 100.0)
+    assert 2 in annotator._smoothed_index
+
+    annotator.draw_tracks(_frame(), {1: objects[1]}, {1: second})
+    assert 2 not in annotator._smoothed_index
+
+
+@pytest.mark.parametrize(
+    ("alert_type", "expected"),
+    [("line_crossing_in", "in"), ("LINE_CROSSING_OUT", "out"), ("checkin", "default"), (None, "default")],
+)
+def test_status_from_alert_type_uses_suffix(alert_type, expected):
+    assert VideoAnnotator._status_from_alert_type(alert_type) == expected
+
+
+def test_bbox_color_falls_back_to_default():
+    annotator = VideoAnnotator()
+
+    assert annotator._bbox_color("dwell_alert") == VideoAnnotator.COLOR_DWELL_ALERT
+    assert annotator._bbox_color("unknown") == VideoAnnotator.COLOR_DEFAULT_BBOX
+
+
+def test_draw_regions_caches_polygon_per_region_and_frame_size():
+    annotator = VideoAnnotator()
+    region = {"id": 1, "coords": [{"x": 0.1, "y": 0.1}, {"x": 0.6, "y": 0.2}, {"x": 0.4, "y": 0.9}]}
+
+    annotator.draw_regions(_frame(), [region])
+    polygon = annotator._polygon_cache[(id(region), 320, 240)][1]
+    annotator.draw_regions(_frame(), [region])
+    annotator.draw_regions(_frame(height=120, width=160), [region])
+
+    assert annotator._polygon_cache[(id(region), 320, 240)][1] is polygon
+    assert polygon.tolist()[0] == [32, 24]
+    assert len(annotator._polygon_cache) == 2
+
+
+def test_cached_text_matches_direct_put_text_closely():
+    annotator = VideoAnnotator()
+    direct = _frame()
+    cached = _frame()
+
+    annotator._draw_text_with_shadow(direct, "PERSON IN", (60, 80), (0, 220, 0), 0.5, cached=False)
+    video_annotator._text_masks.cache_clear()
+    annotator._draw_text_with_shadow(_frame(), "PERSON IN", (60, 80), (0, 220, 0), 0.5)
+    annotator._draw_text_with_shadow(cached, "PERSON IN", (60, 80), (0, 220, 0), 0.5)
+
+    assert video_annotator._text_masks.cache_info().hits == 1
+    diff = np.abs(direct.astype(np.int16) - cached.astype(np.int16))
+    assert diff.max() <= 12
+    assert ((direct != 128).any(axis=2) == (cached != 128).any(axis=2)).mean() > 0.99
+
+
+def test_cached_text_is_clipped_at_frame_edges():
+    annotator = VideoAnnotator()
+    frame = _frame(height=20, width=30)
+
+    annotator._draw_text_with_shadow(frame, "Line 1", (-10, 5), (0, 255, 255), 0.56)
+    annotator._draw_text_with_shadow(frame, "Line 1", (200, 200), (0, 255, 255), 0.56)
+
+    assert frame.shape == (20, 30, 3)
+
+
+def test_draw_regions_tolerates_malformed_region_metrics():
+    annotator = VideoAnnotator()
+    region = {"id": 1, "coords": [{"x": 0.1, "y": 0.1}, {"x": 0.6, "y": 0.2}, {"x": 0.4, "y": 0.9}]}
+
+    for metrics in ({"feature": "region_crowd", "regions": {"region_1": 3}}, {"regions": [1]}, [1]):
+        frame = _frame()
+        annotator.draw_regions(frame, [region], SimpleNamespace(metrics=metrics))
+        assert (frame != 128).any()
+
+
+def test_draw_calls_are_skipped_when_drawing_disabled(monkeypatch):
+    monkeypatch.setenv("YOI_DRAW", "0")
+    annotator = VideoAnnotator()
+    frame = _frame()
+    det = SimpleNamespace(x1=10, y1=10, x2=60, y2=60, class_name="person", confidence=0.9)
+
+    annotator.draw_boxes(frame, [det])
+    annotator.draw_tracks(frame, {1: (30.0, 30.0, "person")}, {1: det})
+    annotator.draw_analytics(frame, {"object_count": 1})
+    annotator.draw_fps(frame, 30.0)
+
+    assert (frame == 128).all()
+
+
+def test_draw_lines_caches_static_line_geometry():
+    annotator = VideoAnnotator()
+    line = {"coords": [{"x": 0.1, "y": 0.5}, {"x": 0.9, "y": 0.5}], "direction": "upward"}
+
+    annotator.draw_lines(_frame(), [line, {"coords": []}])
+    geometry = annotator._line_geometry(0, line, 320, 240)
+
+    assert geometry[:4] == ((32, 120), (288, 120), (160, 120), (160, 90))
+    assert geometry[4] == "Line 1"
+    assert annotator._line_geometry(1, {"coords": []}, 320, 240) is None
+    assert annotator._line_cache[(id(line), 0, 320, 240)][1] is geometry
+
+
+def test_draw_fps_reuses_label_until_value_changes():
+    annotator = VideoAnnotator()
+
+    annotator.draw_fps(_frame(), 24.96)
+    label = annotator._fps_text
+    annotator.draw_fps(_frame(), 24.96)
+
+    assert annotator._fps_text is label
+    assert label == "FPS: 25.0"
+    annotator.draw_fps(_frame(), 12.0)
+    assert annotator._fps_text == "FPS: 12.0"
@@ -0,0 +1,271 @@
+"""Tests for video readers and the frame generator FPS limiter."""
+
+import io
+
+import pytest
+
+from yoi.components import video_reader
+from yoi.components.video_reader import (
+    CachedLoopFileVideoReader,
+    FFmpegRTSPReader,
+    RTSPVideoReader,
+    VideoReader,
+)
+
+
+class _CountingReader:
+    def __init__(self, count):
+        self._remaining = count
+
+    def read_frame(self):
+        self._remaining -= 1
+        return self._remaining >= 0, object()
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now_ns = 0
+        self.sleeps = []
+
+    def monotonic_ns(self):
+        return self.now_ns
+
+    def time(self):
+        return self.now_ns / 1e9
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now_ns += int(seconds * 1e9)
+
+
+class _FakeStopEvent:
+    """threading.Event stand-in whose wait() advances a _FakeClock."""
+
+    def __init__(self, clock, set_on_wait=False):
+        self._clock = clock
+        self._set = False
+        self._set_on_wait = set_on_wait
+
+    def is_set(self):
+        return self._set
+
+    def set(self):
+        self._set = True
+
+    def wait(self, timeout):
+        self._clock.sleep(timeout)
+        if self._set_on_wait:
+            self._set = True
+        return self._set
+
+
+def test_frame_generator_paces_frames_on_a_fixed_deadline(monkeypatch):
+    clock = _FakeClock()
+    monkeypatch.setattr(video_reader, "time", clock)
+
+    frames = []
+    for frame_idx, _ in VideoReader.create_frame_generator(_CountingReader(4), max_fps=10):
+        frames.append(frame_idx)
+        clock.now_ns += 30_000_000  # 30 ms of consumer work per frame
+
+    assert frames == [0, 1, 2, 3]
+    # Sleeps cover only the remainder of each 100 ms slot.
+    assert clock.sleeps == [0.07, 0.07, 0.07]
+
+
+def test_frame_generator_does_not_burst_after_falling_behind(monkeypatch):
+    clock = _FakeClock()
+    monkeypatch.setattr(video_reader, "time", clock)
+
+    generator = VideoReader.create_frame_generator(_CountingReader(3), max_fps=10)
+    next(generator)
+    clock.now_ns += 1_000_000_000  # consumer stalled for a second
+    next(generator)
+    next(generator)
+
+    assert clock.sleeps == [0.1]
+
+
+def test_create_uses_ffmpeg_reader_for_rtsp_when_hwdecode_enabled(monkeypatch):
+    created = []
+
+    class _FakeFFmpegReader:
+        def __init__(self, source, max_fps=None, hwaccel="auto", stop_event=None):
+            created.append((source, max_fps, hwaccel))
+
+    monkeypatch.setattr(video_reader, "FFmpegRTSPReader", _FakeFFmpegReader)
+    monkeypatch.setenv("YOI_USE_HWDECODE", "1")
+    monkeypatch.setenv("YOI_FFMPEG_HWACCEL", "cuda")
+
+    reader = VideoReader.create("rtsp://example.com/in", max_fps=15)
+
+    assert isinstance(reader, _FakeFFmpegReader)
+    assert created == [("rtsp://example.com/in", 15, "cuda")]
+
+
+class _ScriptedCapture:
+    """cv2.VideoCapture stand-in; every instance reads from one shared script."""
+
+    def __init__(self, script):
+        self._script = script
+
+    def isOpened(self):
+        return True
+
+    def get(self, _prop):
+        return 10.0
+
+    def set(self, *_args):
+        pass
+
+    def read(self):
+        ok = next(self._script, False)
+        return (True, object()) if ok else (False, None)
+
+    def release(self):
+        pass
+
+
+def _scripted_rtsp_reader(monkeypatch, script, stop_on_wait=False):
+    reads = iter(script)
+    captures = []
+
+    def _capture(*_args):
+        captures.append(_ScriptedCapture(reads))
+        return captures[-1]
+
+    monkeypatch.setattr(video_reader.cv2, "VideoCapture", _capture)
+    clock = _FakeClock()
+    stop_event = _FakeStopEvent(clock, set_on_wait=stop_on_wait)
+    reader = RTSPVideoReader("rtsp://example.com/in", stop_event=stop_event)
+    reader.captures = captures
+    monkeypatch.setattr(video_reader, "time", clock)
+    return reader, clock
+
+
+def test_rtsp_frame_generator_survives_reconnects_with_backoff(monkeypatch):
+    # Two frames, three failed reads, then the stream recovers for two more.
+    reader, clock = _scripted_rtsp_reader(
+        monkeypatch, [True, True, False, False, False, True, True]
+    )
+
+    frames = [frame_idx for frame_idx, _ in VideoReader.create_frame_generator(reader)]
+
+    assert frames == [0, 1, 2, 3]
+    # Recovery backs off 0.25/0.5/1.0s; the success resets the schedule, so the
+    # final dead stream starts from 0.25s again before giving up.
+    assert clock.sleeps[:3] == [0.25, 0.5, 1.0]
+    assert clock.sleeps[3:] == [0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 8.0, 8.0, 8.0, 8.0]
+    assert reader._backoff.gave_up is True
+    assert reader.read_frame() == (False, None)
+
+
+def test_rtsp_stop_during_backoff_ends_reads_without_reopening(monkeypatch):
+    reader, clock = _scripted_rtsp_reader(monkeypatch, [True, False], stop_on_wait=True)
+
+    frames = [frame_idx for frame_idx, _ in VideoReader.create_frame_generator(reader)]
+
+    assert frames == [0]
+    assert clock.sleeps == [0.25]
+    assert len(reader.captures) == 1  # no capture reopened after the stop
+    assert reader.read_frame() == (False, None)
+
+
+class _RecordingLogger:
+    def __init__(self):
+        self.messages = []
+
+    def _record(self, message, *args):
+        self.messages.append(message % args if args else message)
+
+    debug = info = warning = error = _record
+
+
+class _FakeDecoder:
+    def __init__(self, stdout, stderr=b""):
+        self.stdout = io.BytesIO(stdout)
+        self.stderr = io.BytesIO(stderr)
+
+    def kill(self):
+        pass
+
+    def wait(self):
+        return 0
+
+
+def test_ffmpeg_reader_restarts_decoder_with_backoff_and_logs_stderr(monkeypatch):
+    # 2x1 BGR frames are 6 bytes. The first decoder dies mid-frame after one
+    # frame, the restart yields two frames, then the ffmpeg binary goes missing.
+    decoders = [
+        _FakeDecoder(bytes(6) + bytes(3), b"hwaccel init failed\n"),
+        _FakeDecoder(bytes(12)),
+    ]
+
+    def _popen(*_args, **_kwargs):
+        if not decoders:
+            raise FileNotFoundError("ffmpeg")
+        return decoders.pop(0)
+
+    logger = _RecordingLogger()
+    monkeypatch.setattr(video_reader.logger_service, "get_rtsp_logger", lambda: logger)
+    monkeypatch.setattr(video_reader.subprocess, "Popen", _popen)
+    monkeypatch.setattr(FFmpegRTSPReader, "_probe_stream", lambda self: (2, 1, 10.0))
+    clock = _FakeClock()
+    monkeypatch.setattr(video_reader, "time", clock)
+
+    reader = FFmpegRTSPReader("rtsp://example.com/in", stop_event=_FakeStopEvent(clock))
+    frames = [frame for _, frame in VideoReader.create_frame_generator(reader)]
+
+    assert len(frames) == 3
+    assert all(frame.shape == (1, 2, 3) for frame in frames)
+    assert clock.sleeps == [0.25, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 8.0, 8.0, 8.0, 8.0]
+    assert reader._backoff.gave_up is True
+    assert "FFmpeg decoder: hwaccel init failed" in logger.messages
+    assert any(message.startswith("RTSP DECODER START FAILED") for message in logger.messages)
+
+
+def test_cached_loop_reader_replays_frames_from_memory(tmp_path):
+    np = pytest.importorskip("numpy")
+    cv2 = video_reader.cv2
+    path = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (32, 24))
+    if not writer.isOpened():
+        pytest.skip("OpenCV build cannot write MJPG")
+    for value in (0, 80, 160):
+        writer.write(np.full((24, 32, 3), value, dtype=np.uint8))
+    writer.release()
+
+    reader = VideoReader.create(str(path), loop_cache_mb=1)
+    assert isinstance(reader, CachedLoopFileVideoReader)
+
+    first_pass = [reader.read_frame()[1] for _ in range(3)]
+    assert reader.read_frame()[0] is False
+    assert reader.rewind() is True
+
+    replay = [reader.read_frame()[1] for _ in range(3)]
+    for original, cached in zip(first_pass, replay):
+        assert np.array_equal(original, cached)
+    replay[0][:] = 255  # callers may draw on frames without touching the cache
+    assert reader.read_frame() == (False, None)
+    assert reader.rewind() is True
+    assert np.array_equal(reader.read_frame()[1], first_pass[0])
+    reader.close()
+
+
+def test_ffmpeg_reader_spawns_no_decoder_after_close(monkeypatch):
+    spawned = []
+
+    def _popen(*_args, **_kwargs):
+        spawned.append(_FakeDecoder(bytes(6)))
+        return spawned[-1]
+
+    monkeypatch.setattr(video_reader.logger_service, "get_rtsp_logger", lambda: _RecordingLogger())
+    monkeypatch.setattr(video_reader.subprocess, "Popen", _popen)
+    monkeypatch.setattr(FFmpegRTSPReader, "_probe_stream", lambda self: (2, 1, 10.0))
+
+    reader = FFmpegRTSPReader("rtsp://example.com/in")
+    assert reader.read_frame()[0] is True
+    reader.close()
+
+    assert reader.read_frame() == (False, None)
+    assert len(spawned) == 1
@@ -57,3 +57,43 @@ def test_yolo_init_raises_in_strict_mode_when_cuda_unavailable(monkeypatch):
         assert "Strict GPU mode is enabled but CUDA is unavailable" in str(exc)
 
     assert raised is True
+
+
+def test_yolo_warmup_runs_dummy_frames_of_requested_shape():
+    inferencer = object.__new__(yolo_module.YOLOInferencer)
+    shapes = []
+    inferencer.infer = lambda frame: shapes.append(frame.shape)
+
+    elapsed = inferencer.warmup((48, 64, 3), runs=2)
+
+    assert shapes == [(48, 64, 3), (48, 64, 3)]
+    assert elapsed >= 0.0
+
+
+def _bare_inferencer(model):
+    inferencer = object.__new__(yolo_module.YOLOInferencer)
+    inferencer.model = model
+    inferencer.conf_threshold = 0.5
+    inferencer.iou_threshold = 0.7
+    inferencer.device = "cpu"
+    inferencer._imgsz = None
+    inferencer.strict_device = False
+    inferencer.logger = yolo_module.logger_service.get_inference_logger()
+    return inferencer
+
+
+def test_yolo_infer_batch_uses_single_model_call():
+    calls = []
+
+    def model(source, **_kwargs):
+        calls.append(source)
+        count = len(source) if isinstance(source, list) else 1
+        return [type("Result", (), {"boxes": None})() for _ in range(count)]
+
+    inferencer = _bare_inferencer(model)
+
+    results = inferencer.infer_batch(["f0", "f1", "f2"])
+
+    assert calls == [["f0", "f1", "f2"]]
+    assert [result.frame_idx for result in results] == [0, 1, 2]
+    assert all(result.detections == [] for result in results)
@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 import json
+import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, TextIO
 
+from yoi.utils.json_utils import json_dumps
 
-@dataclass
+
+@dataclass(slots=True)
 class AlertRecord:
     """Normalized alert payload persisted by AlertManager."""
 
@@ -34,7 +38,14 @@ class AlertRecord:
 class AlertManager:
     """Persist alerts from all features to a single destination."""
 
-    def __init__(self, output_dir: Path, logger=None):
+    def __init__(
+        self,
+        output_dir: Path,
+        logger=None,
+        json_refresh_every_n_alerts: int = 50,
+        json_refresh_interval_seconds: float = 5.0,
+        json_max_records: int = 10_000,
+    ):
         self.output_dir = Path(output_dir)
         self.logger = logger
 
@@ -44,6 +55,18 @@ class AlertManager:
         self.alerts_jsonl = self.alerts_dir / "alerts.jsonl"
         self.alerts_json = self.alerts_dir / "alerts.json"
 
+        # JSONL is the full audit log; alerts.json only keeps the newest records
+        # so memory stays bounded on long-running streams.
+        self._records: Deque[Dict[str, Any]] = deque(maxlen=max(1, int(json_max_records)))
+        self._load_existing_records()
+        self._jsonl_file: Optional[TextIO] = None
+
+        # alerts.json is a snapshot of alerts.jsonl; rewrite it in debounced batches.
+        self._json_refresh_every_n_alerts = max(1, int(json_refresh_every_n_alerts))
+        self._json_refresh_interval_seconds = max(0.0, float(json_refresh_interval_seconds))
+        self._pending_json_alerts = 0
+        self._last_json_refresh_ts: Optional[float] = None
+
     def record(
         self,
         *,
@@ -57,47 +80,86 @@ class AlertManager:
         if not alerts:
             return 0
 
-        written = 0
-        json_records: List[Dict[str, Any]] = []
-
+        # Alerts in one batch come from the same frame; share a single timestamp.
+        timestamp = datetime.utcnow().isoformat()
+        payloads: List[Dict[str, Any]] = []
         for alert in alerts:
             record = AlertRecord(
-                timestamp=datetime.utcnow().isoformat(),
+                timestamp=timestamp,
                 frame_idx=frame_idx,
                 feature=feature,
                 cctv_id=cctv_id,
                 alert=alert,
                 metrics=metrics or {},
             )
-            payload = record.to_dict()
-            json_records.append(payload)
+            payloads.append(record.to_dict())
 
-            with self.alerts_jsonl.open("a", encoding="utf-8") as file_obj:
-                file_obj.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        jsonl_file = self._open_jsonl()
+        jsonl_file.write("".join(json_dumps(payload) + "\n" for payload in payloads))
+        jsonl_file.flush()
 
-            written += 1
+        self._records.extend(payloads)
+        written = len(payloads)
 
-        self._refresh_alerts_json()
+        self._pending_json_alerts += written
+        self._maybe_refresh_alerts_json()
 
         if self.logger is not None:
             self.logger.info(f"AlertManager persisted {written} alert(s) to {self.alerts_dir}")
 
         return written
 
-    def _refresh_alerts_json(self) -> None:
-        """Materialize compact JSON array from the JSONL stream."""
-        records: List[Dict[str, Any]] = []
-        if self.alerts_jsonl.exists():
-            for line in self.alerts_jsonl.read_text(encoding="utf-8").splitlines():
+    def close(self) -> None:
+        """Flush pending alerts.json snapshot and release the JSONL append handle."""
+        if self._pending_json_alerts:
+            self._refresh_alerts_json()
+
+        if self._jsonl_file is not None:
+            self._jsonl_file.close()
+            self._jsonl_file = None
+
+    def _open_jsonl(self) -> TextIO:
+        if self._jsonl_file is None or self._jsonl_file.closed:
+            self._jsonl_file = self.alerts_jsonl.open("a", encoding="utf-8", buffering=1 << 16)
+        return self._jsonl_file
+
+    def _load_existing_records(self) -> None:
+        """Seed the snapshot with alerts persisted by a previous run."""
+        if not self.alerts_jsonl.exists():
+            return
+
+        with self.alerts_jsonl.open("r", encoding="utf-8") as file_obj:
+            for line in file_obj:
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    records.append(json.loads(line))
+                    self._records.append(json.loads(line))
                 except json.JSONDecodeError:
                     continue
 
-        self.alerts_json.write_text(
-            json.dumps(records, ensure_ascii=False, indent=2),
-            encoding="utf-8",
+    def _maybe_refresh_alerts_json(self) -> None:
+        """Rewrite alerts.json every N alerts or T seconds, whichever comes first."""
+        if not self._pending_json_alerts:
+            return
+
+        due = (
+            self._last_json_refresh_ts is None
+            or self._pending_json_alerts >= self._json_refresh_every_n_alerts
+            or (time.monotonic() - self._last_json_refresh_ts)
+            >= self._json_refresh_interval_seconds
         )
+        if due:
+            self._refresh_alerts_json()
+
+    def _refresh_alerts_json(self) -> None:
+        """Stream the in-memory alert records to alerts.json as a JSON array."""
+        with self.alerts_json.open("w", encoding="utf-8") as file_obj:
+            file_obj.write("[")
+            for index, record in enumerate(self._records):
+                file_obj.write(",\n  " if index else "\n  ")
+                # JSON encoders escape newlines inside strings, so re-indenting is safe.
+                file_obj.write(json_dumps(record, indent=True).replace("\n", "\n  "))
+            file_obj.write("\n]" if self._records else "]")
+        self._pending_json_alerts = 0
+        self._last_json_refresh_ts = time.monotonic()
@@ -1,13 +1,44 @@
 """Analytics engine for dwell-time and object counting."""
 
-import json
-from dataclasses import dataclass, field
-from datetime import datetime
+import csv
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
+from yoi.utils.json_utils import json_dumps
 from yoi.utils.logger import logger_service
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    HAS_PYARROW = True
+except ImportError:
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+    HAS_PYARROW = False
+
+_EPOCH = datetime(1970, 1, 1)
+# Per-frame summary rows buffered before they are written as one Parquet row group.
+_FRAME_ROW_GROUP_SIZE = 4096
+_FRAME_SCHEMA = (
+    pa.schema(
+        [
+            ("frame_idx", pa.int64()),
+            ("timestamp_ns", pa.int64()),
+            ("object_count", pa.int64()),
+            ("object_count_by_class", pa.string()),
+        ]
+    )
+    if HAS_PYARROW
+    else None
+)
+
 
 @dataclass
 class DwellTimeAnalytics:
@@ -25,18 +56,7 @@ class DwellTimeAnalytics:
     avg_confidence: float = 0.0
 
     def to_dict(self) -> Dict:
-        return {
-            "track_id": self.track_id,
-            "class_name": self.class_name,
-            "entry_frame": self.entry_frame,
-            "exit_frame": self.exit_frame,
-            "dwell_time_frames": self.dwell_time_frames,
-            "dwell_time_sec": self.dwell_time_sec,
-            "entry_position": self.entry_position,
-            "exit_position": self.exit_position,
-            "max_confidence": self.max_confidence,
-            "avg_confidence": self.avg_confidence,
-        }
+        return asdict(self)
 
 
 @dataclass
@@ -44,12 +64,18 @@ class FrameAnalytics:
     """Analytics results for a single frame."""
 
     frame_idx: int
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    # Wall-clock ns since epoch (UTC); converted to ISO only when serialized.
+    timestamp_ns: int = field(default_factory=time.time_ns)
     object_count: int = 0
     object_count_by_class: Dict[str, int] = field(default_factory=dict)
     active_tracks: Dict[int, Tuple] = field(default_factory=dict)
     dwell_events: List[DwellTimeAnalytics] = field(default_factory=list)
 
+    @property
+    def timestamp(self) -> datetime:
+        """Naive UTC datetime, same form the engine previously stored."""
+        return _EPOCH + timedelta(microseconds=self.timestamp_ns // 1000)
+
     def to_dict(self) -> Dict:
         return {
             "frame_idx": self.frame_idx,
@@ -78,6 +104,16 @@ class AnalyticsEngine:
 
         self.completed_tracks: Dict[int, DwellTimeAnalytics] = {}
         self.frame_idx = 0
+        # Per-frame summary, collected only once start_frame_export() is called
+        # and streamed to Parquet in row groups so a long run stays bounded.
+        self._frames_path: Optional[Path] = None
+        self._frame_writer = None
+        self._frame_columns: Dict[str, List] = {
+            "frame_idx": [],
+            "timestamp_ns": [],
+            "object_count": [],
+            "object_count_by_class": [],
+        }
 
     def process_frame(
         self,
@@ -102,29 +138,29 @@ class AnalyticsEngine:
 
         # Count objects by class
         analytics.object_count = len(tracked_objects)
-        for track_id, (x, y, class_name) in tracked_objects.items():
-            analytics.object_count_by_class[class_name] = (
-                analytics.object_count_by_class.get(class_name, 0) + 1
-            )
-            analytics.active_tracks[track_id] = (x, y, class_name)
-
-        # Check completed tracks (dwell-time events).
-        if hasattr(tracker_obj, "tracks"):
-            for track_id, track_obj in tracker_obj.tracks.items():
-                if track_id not in previous_tracks and track_id in tracked_objects:
-                    # New track detected
-                    pass
-
-            # Check tracks that disappeared.
-            for prev_track_id in previous_tracks:
-                if prev_track_id not in tracked_objects:
-                    # Track lost - calculate dwell time
-                    if hasattr(tracker_obj, "get_track"):
-                        track = tracker_obj.get_track(prev_track_id)
-                        if track and track.frames_alive >= (self.min_dwell_sec * self.fps):
-                            dwell_analytics = self._create_dwell_analytics(track, frame_idx)
-                            analytics.dwell_events.append(dwell_analytics)
-                            self.completed_tracks[prev_track_id] = dwell_analytics
+        analytics.object_count_by_class = dict(Counter(obj[2] for obj in tracked_objects.values()))
+        analytics.active_tracks = dict(tracked_objects)
+
+        # Check tracks that disappeared (dwell-time events).
+        get_track = getattr(tracker_obj, "get_track", None)
+        if hasattr(tracker_obj, "tracks") and get_track is not None:
+            min_frames = self.min_dwell_sec * self.fps
+            for prev_track_id in previous_tracks.keys() - tracked_objects.keys():
+                # Track lost - calculate dwell time
+                track = get_track(prev_track_id)
+                if track and track.frames_alive >= min_frames:
+                    dwell_analytics = self._create_dwell_analytics(track, frame_idx)
+                    analytics.dwell_events.append(dwell_analytics)
+                    self.completed_tracks[prev_track_id] = dwell_analytics
+
+        if self._frames_path is not None:
+            columns = self._frame_columns
+            columns["frame_idx"].append(frame_idx)
+            columns["timestamp_ns"].append(analytics.timestamp_ns)
+            columns["object_count"].append(analytics.object_count)
+            columns["object_count_by_class"].append(json_dumps(analytics.object_count_by_class))
+            if len(columns["frame_idx"]) >= _FRAME_ROW_GROUP_SIZE:
+                self._flush_frame_rows()
 
         self.frame_idx = frame_idx
         return analytics
@@ -134,20 +170,26 @@ class AnalyticsEngine:
         dwell_frames = tracked_obj.frames_alive
         dwell_sec = dwell_frames / self.fps
 
-        entry_pos = tracked_obj.history[0] if tracked_obj.history else None
         exit_pos = tracked_obj.history[-1] if tracked_obj.history else None
 
-        max_conf = max(tracked_obj.confidence_history) if tracked_obj.confidence_history else 0
-        avg_conf = (
-            sum(tracked_obj.confidence_history) / len(tracked_obj.confidence_history)
-            if tracked_obj.confidence_history
-            else 0
-        )
+        avg_conf = getattr(tracked_obj, "avg_confidence", None)
+        if avg_conf is not None:
+            # TrackedObject keeps lifetime figures; its per-frame history only
+            # holds recent entries.
+            entry_frame = tracked_obj.entry_frame
+            entry_pos = tracked_obj.entry_position
+            max_conf = tracked_obj.max_confidence
+        else:
+            entry_frame = tracked_obj.frame_indices[0]
+            entry_pos = tracked_obj.history[0] if tracked_obj.history else None
+            confidences = np.asarray(tracked_obj.confidence_history, dtype=np.float64)
+            max_conf = float(confidences.max()) if confidences.size else 0.0
+            avg_conf = float(confidences.mean()) if confidences.size else 0.0
 
         return DwellTimeAnalytics(
             track_id=tracked_obj.track_id,
             class_name=tracked_obj.class_name,
-            entry_frame=tracked_obj.frame_indices[0],
+            entry_frame=entry_frame,
             exit_frame=end_frame,
             dwell_time_frames=dwell_frames,
             dwell_time_sec=dwell_sec,
@@ -157,6 +199,53 @@ class AnalyticsEngine:
             avg_confidence=avg_conf,
         )
 
+    def start_frame_export(self, path: str) -> bool:
+        """Stream per-frame summaries to a Parquet file; False without pyarrow."""
+        if not HAS_PYARROW:
+            self.logger.info("pyarrow not installed; per-frame analytics export disabled")
+            return False
+        self._frames_path = Path(path)
+        return True
+
+    def _flush_frame_rows(self) -> None:
+        columns = self._frame_columns
+        if not columns["frame_idx"]:
+            return
+        try:
+            if self._frame_writer is None:
+                self._frames_path.parent.mkdir(parents=True, exist_ok=True)
+                self._frame_writer = pq.ParquetWriter(
+                    str(self._frames_path), _FRAME_SCHEMA, compression="zstd"
+                )
+            self._frame_writer.write_table(pa.table(columns, schema=_FRAME_SCHEMA))
+        except Exception as exc:
+            self.logger.warning(f"Per-frame analytics export disabled: {exc}")
+            self._frames_path = None
+            self._close_frame_writer()
+        for values in columns.values():
+            values.clear()
+
+    def close_frame_export(self) -> Optional[str]:
+        """Write buffered frame rows and close the Parquet file, returning its path."""
+        if self._frames_path is None:
+            return None
+        self._flush_frame_rows()
+        if self._frame_writer is None:
+            # Nothing was written, or the last flush failed and disabled the export.
+            return None
+        frames_path, self._frames_path = self._frames_path, None
+        self._close_frame_writer()
+        return str(frames_path)
+
+    def _close_frame_writer(self) -> None:
+        writer, self._frame_writer = self._frame_writer, None
+        if writer is None:
+            return
+        try:
+            writer.close()
+        except Exception as exc:
+            self.logger.warning(f"Failed to close per-frame analytics file: {exc}")
+
     def get_dwell_time_summary(self) -> List[DwellTimeAnalytics]:
         """Get summary of completed dwell-time tracks."""
         return list(self.completed_tracks.values())
@@ -173,7 +262,8 @@ class AnalyticsEngine:
             output_dir: Output directory
 
         Returns:
-            Dict with exported file paths
+            Dict with exported file paths ("parquet" only when a frame export
+            was started with pyarrow installed)
         """
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
@@ -185,21 +275,37 @@ class AnalyticsEngine:
             "total_objects": len(self.completed_tracks),
             "dwell_time_analytics": [dt.to_dict() for dt in self.completed_tracks.values()],
         }
-        json_file.write_text(json.dumps(json_data, indent=2, ensure_ascii=False))
+        json_file.write_text(json_dumps(json_data, indent=True), encoding="utf-8")
 
         # Export CSV
         csv_file = output_path / "analytics_summary.csv"
-        csv_lines = ["track_id,class_name,entry_frame,exit_frame,dwell_time_sec,avg_confidence"]
-        for dt in self.completed_tracks.values():
-            csv_lines.append(
-                f"{dt.track_id},{dt.class_name},{dt.entry_frame},"
-                f"{dt.exit_frame},{dt.dwell_time_sec:.2f},{dt.avg_confidence:.3f}"
+        with csv_file.open("w", encoding="utf-8", newline="") as handle:
+            writer = csv.writer(handle, lineterminator="\n")
+            writer.writerow(
+                ["track_id", "class_name", "entry_frame", "exit_frame", "dwell_time_sec", "avg_confidence"]
+            )
+            writer.writerows(
+                (
+                    dt.track_id,
+                    dt.class_name,
+                    dt.entry_frame,
+                    dt.exit_frame,
+                    f"{dt.dwell_time_sec:.2f}",
+                    f"{dt.avg_confidence:.3f}",
+                )
+                for dt in self.completed_tracks.values()
             )
-        csv_file.write_text("\n".join(csv_lines))
-
-        self.logger.info(f"Analytics exported to {output_dir}")
 
-        return {
+        exported = {
             "json": str(json_file),
             "csv": str(csv_file),
         }
+
+        # Per-frame summary (columnar, optional)
+        parquet_file = self.close_frame_export()
+        if parquet_file:
+            exported["parquet"] = parquet_file
+
+        self.logger.info(f"Analytics exported to {output_dir}")
+
+        return exported
@@ -1,6 +1,7 @@
 """Frame annotation utilities for detections, tracks, and overlays."""
 
 import os
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 import cv2
@@ -9,6 +10,54 @@ import numpy as np
 from yoi.utils.logger import logger_service
 
 
+@lru_cache(maxsize=4096)
+def _text_size(text: str, font: int, scale: float, thickness: int) -> Tuple[Tuple[int, int], int]:
+    """Cached cv2.getTextSize; overlay labels repeat across frames."""
+    return cv2.getTextSize(text, font, scale, thickness)
+
+
+@lru_cache(maxsize=512)
+def _text_masks(
+    text: str, font: int, scale: float, thickness: int
+) -> Tuple[np.ndarray, np.ndarray, int, int]:
+    """Rasterize a label and its shadow once as uint8 coverage masks.
+
+    Returns (shadow_mask, text_mask, org_x, org_y); org is the putText origin
+    inside the mask canvas. Masks are color-free so one entry serves any color.
+    """
+    (text_w, text_h), baseline = cv2.getTextSize(text, font, scale, thickness + 2)
+    pad = thickness + 4
+    height = text_h + baseline + 2 * pad
+    width = text_w + 2 * pad
+    org_x, org_y = pad, pad + text_h
+
+    shadow = np.zeros((height, width), dtype=np.uint8)
+    cv2.putText(shadow, text, (org_x + 1, org_y + 1), font, scale, 255, thickness + 2, cv2.LINE_AA)
+    mask = np.zeros_like(shadow)
+    cv2.putText(mask, text, (org_x, org_y), font, scale, 255, thickness, cv2.LINE_AA)
+    shadow.setflags(write=False)
+    mask.setflags(write=False)
+    return shadow, mask, org_x, org_y
+
+
+def _blend_mask(
+    frame: np.ndarray, mask: np.ndarray, x: int, y: int, color: Tuple[int, int, int]
+) -> None:
+    """Alpha-blend a solid color into frame at (x, y) using a coverage mask."""
+    h, w = frame.shape[:2]
+    fx1, fy1 = max(0, x), max(0, y)
+    fx2, fy2 = min(w, x + mask.shape[1]), min(h, y + mask.shape[0])
+    if fx1 >= fx2 or fy1 >= fy2:
+        return
+    alpha = mask[fy1 - y : fy2 - y, fx1 - x : fx2 - x, None].astype(np.uint16)
+    roi = frame[fy1:fy2, fx1:fx2]
+    blended = roi * (255 - alpha) + np.asarray(color, dtype=np.uint16) * alpha + 127
+    roi[:] = (blended // 255).astype(np.uint8)
+
+
+_ALERT_SUFFIX_STATUS = {"in": "in", "out": "out"}
+
+
 class VideoAnnotator:
     """Annotate frames with detection, tracking, and analytics info."""
 
@@ -24,14 +73,36 @@ class VideoAnnotator:
     COLOR_TEXT = (230, 230, 230)
     COLOR_SHADOW = (0, 0, 0)
     COLOR_PANEL = (20, 20, 20)
+    _BBOX_COLOR_MAP: Dict[str, Tuple[int, int, int]] = {
+        "dwell_alert": COLOR_DWELL_ALERT,
+        "dwell_inside": COLOR_DWELL_INSIDE,
+        "dwell_outside": COLOR_DWELL_OUTSIDE,
+        "inside": COLOR_REGION_INSIDE,
+        "outside": COLOR_REGION_OUTSIDE,
+        "in": COLOR_IN,
+        "out": COLOR_OUT,
+    }
 
     def __init__(self):
         self.logger = logger_service.get_output_logger()
-        self._smoothed_bboxes: Dict[int, Tuple[float, float, float, float]] = {}
+        # EMA-smoothed bboxes as (N, 4) rows, indexed by track id.
+        self._smoothed_arr: np.ndarray = np.empty((0, 4), dtype=np.float64)
+        self._smoothed_index: Dict[int, int] = {}
         self._bbox_smoothing_alpha: float = 0.45
         self._enable_bbox_smoothing: bool = os.getenv(
             "YOI_BBOX_SMOOTHING", "0"
         ).strip().lower() in {"1", "true", "on", "yes"}
+        # Headless/benchmark runs can skip all overlay drawing with YOI_DRAW=0.
+        self._draw_enabled: bool = os.getenv(
+            "YOI_DRAW", "1"
+        ).strip().lower() not in {"0", "false", "off", "no"}
+        self._overlay_buf: Optional[np.ndarray] = None
+        # (id(region), width, height) -> (region, pixel polygon, clamped bounds)
+        self._polygon_cache: Dict[Tuple[int, int, int], Tuple[Any, np.ndarray, Tuple]] = {}
+        # (id(line), index, width, height) -> (line, static geometry or None)
+        self._line_cache: Dict[Tuple[int, int, int, int], Tuple[Any, Optional[Tuple]]] = {}
+        self._fps_value: Optional[float] = None
+        self._fps_text = ""
 
     def _draw_text_with_shadow(
         self,
@@ -41,7 +112,16 @@ class VideoAnnotator:
         color: Tuple[int, int, int],
         scale: float = 0.55,
         thickness: int = 1,
+        cached: bool = True,
     ) -> None:
+        if cached:
+            # Labels repeat across frames: blit cached glyph masks instead of re-rasterizing.
+            shadow, mask, org_x, org_y = _text_masks(text, self.FONT, scale, thickness)
+            x, y = org[0] - org_x, org[1] - org_y
+            _blend_mask(frame, shadow, x, y, self.COLOR_SHADOW)
+            _blend_mask(frame, mask, x, y, color)
+            return
+
         cv2.putText(
             frame,
             text,
@@ -65,29 +145,28 @@ class VideoAnnotator:
 
     @staticmethod
     def _status_from_alert_type(alert_type: str) -> str:
-        alert_type = (alert_type or "").lower()
-        if alert_type.endswith("_in"):
-            return "in"
-        if alert_type.endswith("_out"):
-            return "out"
-        return "default"
+        _, sep, suffix = (alert_type or "").rpartition("_")
+        if not sep:
+            return "default"
+        return _ALERT_SUFFIX_STATUS.get(suffix.lower(), "default")
 
     def _bbox_color(self, status: str) -> Tuple[int, int, int]:
-        if status == "dwell_alert":
-            return self.COLOR_DWELL_ALERT
-        if status == "dwell_inside":
-            return self.COLOR_DWELL_INSIDE
-        if status == "dwell_outside":
-            return self.COLOR_DWELL_OUTSIDE
-        if status == "inside":
-            return self.COLOR_REGION_INSIDE
-        if status == "outside":
-            return self.COLOR_REGION_OUTSIDE
-        if status == "in":
-            return self.COLOR_IN
-        if status == "out":
-            return self.COLOR_OUT
-        return self.COLOR_DEFAULT_BBOX
+        return self._BBOX_COLOR_MAP.get(status, self.COLOR_DEFAULT_BBOX)
+
+    def _overlay_scratch(self, roi: np.ndarray) -> np.ndarray:
+        """Return a reusable scratch view holding a copy of roi."""
+        rh, rw = roi.shape[:2]
+        buf = self._overlay_buf
+        if buf is None or buf.shape[2:] != roi.shape[2:] or buf.dtype != roi.dtype:
+            buf = np.empty((rh, rw) + roi.shape[2:], dtype=roi.dtype)
+            self._overlay_buf = buf
+        elif buf.shape[0] < rh or buf.shape[1] < rw:
+            grown = (max(rh, buf.shape[0]), max(rw, buf.shape[1])) + roi.shape[2:]
+            buf = np.empty(grown, dtype=roi.dtype)
+            self._overlay_buf = buf
+        scratch = buf[:rh, :rw]
+        np.copyto(scratch, roi)
+        return scratch
 
     def _draw_panel(
         self,
@@ -98,19 +177,32 @@ class VideoAnnotator:
         shadow_alpha: float = 0.22,
     ) -> None:
         shadow_offset = 3
-        shadow_overlay = frame.copy()
+        h, w = frame.shape[:2]
+        x1 = max(0, min(top_left[0], bottom_right[0]))
+        y1 = max(0, min(top_left[1], bottom_right[1]))
+        x2 = min(w, max(top_left[0], bottom_right[0]) + shadow_offset + 1)
+        y2 = min(h, max(top_left[1], bottom_right[1]) + shadow_offset + 1)
+        if x1 >= x2 or y1 >= y2:
+            return
+
+        # Blend only the panel ROI (panel + shadow) instead of the whole frame.
+        roi = frame[y1:y2, x1:x2]
+        local_tl = (top_left[0] - x1, top_left[1] - y1)
+        local_br = (bottom_right[0] - x1, bottom_right[1] - y1)
+
+        shadow_overlay = self._overlay_scratch(roi)
         cv2.rectangle(
             shadow_overlay,
-            (top_left[0] + shadow_offset, top_left[1] + shadow_offset),
-            (bottom_right[0] + shadow_offset, bottom_right[1] + shadow_offset),
+            (local_tl[0] + shadow_offset, local_tl[1] + shadow_offset),
+            (local_br[0] + shadow_offset, local_br[1] + shadow_offset),
             self.COLOR_SHADOW,
             -1,
         )
-        cv2.addWeighted(shadow_overlay, shadow_alpha, frame, 1 - shadow_alpha, 0, frame)
+        roi[:] = cv2.addWeighted(shadow_overlay, shadow_alpha, roi, 1 - shadow_alpha, 0)
 
-        overlay = frame.copy()
-        cv2.rectangle(overlay, top_left, bottom_right, (0, 0, 0), -1)
-        cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
+        overlay = self._overlay_scratch(roi)
+        cv2.rectangle(overlay, local_tl, local_br, (0, 0, 0), -1)
+        roi[:] = cv2.addWeighted(overlay, alpha, roi, 1 - alpha, 0)
 
     def _draw_badge(
         self,
@@ -120,7 +212,7 @@ class VideoAnnotator:
         color: Tuple[int, int, int],
         scale: float = 0.52,
     ) -> None:
-        (text_w, text_h), baseline = cv2.getTextSize(text, self.FONT, scale, 1)
+        (text_w, text_h), baseline = _text_size(text, self.FONT, scale, 1)
         x1, y1 = top_left
         x2 = x1 + text_w + 12
         y2 = y1 + text_h + baseline + 10
@@ -138,17 +230,61 @@ class VideoAnnotator:
 
     def draw_boxes(self, frame: np.ndarray, detections: List) -> np.ndarray:
         """Draw detection bounding boxes and labels."""
-        for det in detections:
-            x1, y1, x2, y2 = int(det.x1), int(det.y1), int(det.x2), int(det.y2)
-            color = self.COLOR_DEFAULT_BBOX
+        if not self._draw_enabled:
+            return frame
+        if not detections:
+            return frame
 
+        # Convert all box coordinates in one pass instead of four int() calls per box.
+        coords = np.fromiter(
+            (v for det in detections for v in (det.x1, det.y1, det.x2, det.y2)),
+            dtype=np.float64,
+            count=4 * len(detections),
+        )
+        boxes = coords.reshape(-1, 4).astype(np.int32).tolist()
+        labels = [f"{det.class_name.upper()} {det.confidence:.2f}" for det in detections]
+        color = self.COLOR_DEFAULT_BBOX
+
+        for (x1, y1, x2, y2), label in zip(boxes, labels):
             cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-            label = f"{det.class_name.upper()} {det.confidence:.2f}"
             badge_y = max(4, y1 - 30)
             self._draw_badge(frame, label, (x1, badge_y), self.COLOR_TEXT, scale=0.50)
 
         return frame
 
+    def _smooth_bboxes(
+        self, track_ids: List[int], current: np.ndarray, active_ids: Any
+    ) -> np.ndarray:
+        """EMA-smooth (K, 4) bboxes against the previous frame in one vectorized step."""
+        prev_index = self._smoothed_index
+        smoothed = current
+        if self._enable_bbox_smoothing and prev_index and track_ids:
+            rows = np.fromiter(
+                (prev_index.get(tid, -1) for tid in track_ids), dtype=np.intp, count=len(track_ids)
+            )
+            has_prev = rows >= 0
+            if has_prev.any():
+                alpha = self._bbox_smoothing_alpha
+                smoothed = current.copy()
+                smoothed[has_prev] = (
+                    alpha * current[has_prev] + (1.0 - alpha) * self._smoothed_arr[rows[has_prev]]
+                )
+
+        # Keep boxes of tracks that are still active but have no bbox this frame.
+        # With a stable track set there is nothing missing and the scan is skipped.
+        missing = prev_index.keys() - track_ids
+        carried = (
+            [tid for tid in prev_index if tid in missing and tid in active_ids] if missing else []
+        )
+        if carried:
+            carried_rows = self._smoothed_arr[[prev_index[tid] for tid in carried]]
+            self._smoothed_arr = np.vstack([smoothed, carried_rows])
+        else:
+            self._smoothed_arr = smoothed
+        if carried or missing or list(prev_index) != track_ids:
+            self._smoothed_index = {tid: row for row, tid in enumerate([*track_ids, *carried])}
+        return smoothed
+
     def draw_tracks(
         self,
         frame: np.ndarray,
@@ -157,10 +293,27 @@ class VideoAnnotator:
         track_states: Optional[Dict[int, str]] = None,
     ) -> np.ndarray:
         """Draw tracking info with optional bbox-linked ID labels."""
-        active_ids = set(tracked_objects.keys())
-        self._smoothed_bboxes = {
-            tid: bbox for tid, bbox in self._smoothed_bboxes.items() if tid in active_ids
-        }
+        if not self._draw_enabled:
+            return frame
+        bbox_ids: List[int] = []
+        current: List[Tuple[float, float, float, float]] = []
+        if track_bbox_map is not None:
+            for track_id in tracked_objects:
+                if track_id not in track_bbox_map:
+                    continue
+                det = track_bbox_map[track_id]
+                try:
+                    current.append((float(det.x1), float(det.y1), float(det.x2), float(det.y2)))
+                except AttributeError:
+                    continue
+                bbox_ids.append(track_id)
+
+        smoothed = self._smooth_bboxes(
+            bbox_ids, np.array(current, dtype=np.float64).reshape(-1, 4), tracked_objects
+        )
+        pixel_bboxes = dict(zip(bbox_ids, smoothed.astype(np.int32).tolist()))
+        bbox_color = self._BBOX_COLOR_MAP.get
+        default_color = self.COLOR_DEFAULT_BBOX
 
         for track_id, (x, y, _) in tracked_objects.items():
             if track_bbox_map is not None and track_id not in track_bbox_map:
@@ -170,59 +323,28 @@ class VideoAnnotator:
             if track_states and track_id in track_states:
                 status = track_states[track_id]
 
-            color = self._bbox_color(status)
+            color = bbox_color(status, default_color)
             x, y = int(x), int(y)
             cv2.circle(frame, (x, y), 5, color, -1)
 
-            if track_bbox_map is not None and track_id in track_bbox_map:
-                det = track_bbox_map[track_id]
-                try:
-                    current_bbox = (
-                        float(det.x1),
-                        float(det.y1),
-                        float(det.x2),
-                        float(det.y2),
-                    )
-                    if self._enable_bbox_smoothing:
-                        previous_bbox = self._smoothed_bboxes.get(track_id)
-                        if previous_bbox is None:
-                            smoothed_bbox = current_bbox
-                        else:
-                            alpha = self._bbox_smoothing_alpha
-                            smoothed_bbox = (
-                                alpha * current_bbox[0] + (1.0 - alpha) * previous_bbox[0],
-                                alpha * current_bbox[1] + (1.0 - alpha) * previous_bbox[1],
-                                alpha * current_bbox[2] + (1.0 - alpha) * previous_bbox[2],
-                                alpha * current_bbox[3] + (1.0 - alpha) * previous_bbox[3],
-                            )
-                        self._smoothed_bboxes[track_id] = smoothed_bbox
-                    else:
-                        self._smoothed_bboxes[track_id] = current_bbox
-                        smoothed_bbox = current_bbox
-
-                    x1 = int(smoothed_bbox[0])
-                    y1 = int(smoothed_bbox[1])
-                    x2 = int(smoothed_bbox[2])
-                    y2 = int(smoothed_bbox[3])
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), color, 3)
-                    tx = max(0, x2 - 62)
-                    ty = max(10, y1 - 5)
-
-                    state_text = "PERSON"
-                    if status == "in":
-                        state_text = "PERSON IN"
-                    elif status == "out":
-                        state_text = "PERSON OUT"
-                    self._draw_badge(
-                        frame,
-                        state_text,
-                        (x1 + 2, max(4, y1 - 32)),
-                        color,
-                        scale=0.50,
-                    )
-                except AttributeError:
-                    tx = x + 10
-                    ty = y
+            if track_id in pixel_bboxes:
+                x1, y1, x2, y2 = pixel_bboxes[track_id]
+                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 3)
+                tx = max(0, x2 - 62)
+                ty = max(10, y1 - 5)
+
+                state_text = "PERSON"
+                if status == "in":
+                    state_text = "PERSON IN"
+                elif status == "out":
+                    state_text = "PERSON OUT"
+                self._draw_badge(
+                    frame,
+                    state_text,
+                    (x1 + 2, max(4, y1 - 32)),
+                    color,
+                    scale=0.50,
+                )
             else:
                 tx = x + 10
                 ty = y
@@ -237,19 +359,26 @@ class VideoAnnotator:
 
         return frame
 
-    def draw_analytics(self, frame: np.ndarray, analytics_data: Dict) -> np.ndarray:
-        """Draw analytics summary on frame."""
-        class_counts = analytics_data.get("object_count_by_class", {})
+    def draw_analytics(self, frame: np.ndarray, analytics_data: Any) -> np.ndarray:
+        """Draw analytics summary on frame (FrameAnalytics or its to_dict())."""
+        if not self._draw_enabled:
+            return frame
+        if isinstance(analytics_data, dict):
+            object_count = analytics_data.get("object_count", 0)
+            class_counts = analytics_data.get("object_count_by_class", {})
+        else:
+            object_count = getattr(analytics_data, "object_count", 0)
+            class_counts = getattr(analytics_data, "object_count_by_class", {})
         if not isinstance(class_counts, dict):
             class_counts = {}
 
-        lines = [f"Objects: {analytics_data.get('object_count', 0)}"]
+        lines = [f"Objects: {object_count}"]
         for class_name, count in class_counts.items():
             lines.append(f"{class_name}: {count}")
 
         max_text_width = 0
         for line in lines:
-            (text_w, _), _ = cv2.getTextSize(
+            (text_w, _), _ = _text_size(
                 line, self.FONT, 0.62 if line.startswith("Objects:") else 0.54, 1
             )
             max_text_width = max(max_text_width, text_w)
@@ -268,7 +397,7 @@ class VideoAnnotator:
 
         y_offset = panel_y1 + 24
 
-        text = f"Objects: {analytics_data.get('object_count', 0)}"
+        text = lines[0]
         self._draw_text_with_shadow(
             frame, text, (panel_x1 + 10, y_offset), self.COLOR_TEXT, 0.62, 1
         )
@@ -285,8 +414,15 @@ class VideoAnnotator:
 
     def draw_fps(self, frame: np.ndarray, fps: float) -> np.ndarray:
         """Draw current processing FPS on frame."""
+        if not self._draw_enabled:
+            return frame
         _, w = frame.shape[:2]
-        text = f"FPS: {fps:.1f}"
+        # The engine refreshes the FPS value a few times per second, so the
+        # label (and its cached text sprite) is reused between updates.
+        if fps != self._fps_value:
+            self._fps_value = fps
+            self._fps_text = f"FPS: {fps:.1f}"
+        text = self._fps_text
 
         box_w, box_h = 165, 40
         x1 = max(10, w - box_w - 12)
@@ -295,37 +431,38 @@ class VideoAnnotator:
         y2 = y1 + box_h
 
         self._draw_panel(frame, (x1, y1), (x2, y2), alpha=0.44, shadow_alpha=0.16)
-        self._draw_text_with_shadow(frame, text, (x1 + 14, y1 + 27), self.COLOR_TEXT, 0.66, 1)
+        self._draw_text_with_shadow(
+            frame, text, (x1 + 14, y1 + 27), self.COLOR_TEXT, 0.66, 1
+        )
 
         return frame
 
-    def draw_lines(self, frame: np.ndarray, lines: List, feature_result=None) -> np.ndarray:
-        """Draw configured lines and line-cross counters."""
-        if not lines:
-            return frame
-
-        h, w = frame.shape[:2]
-
-        for idx, line in enumerate(lines):
-            if isinstance(line, dict):
-                coords = line.get("coords", [])
-                direction = line.get("direction", "downward")
-                orientation = line.get("orientation", "horizontal")
-            else:
-                coords = getattr(line, "coords", [])
-                direction = getattr(line, "direction", "downward")
-                orientation = getattr(line, "orientation", "horizontal")
-
-            if len(coords) < 2:
-                continue
-
-            pixel_coords = self._coords_to_pixels(coords, w, h)
+    def _line_geometry(self, idx: int, line: Any, width: int, height: int) -> Optional[Tuple]:
+        """Static pixel geometry of a configured line, cached across frames.
+
+        Returns (start, end, mid, arrow_end, label, label_org), or None when the
+        line has fewer than two points.
+        """
+        key = (id(line), idx, width, height)
+        cached = self._line_cache.get(key)
+        if cached is not None and cached[0] is line:
+            return cached[1]
+
+        if isinstance(line, dict):
+            coords = line.get("coords", [])
+            direction = line.get("direction", "downward")
+            orientation = line.get("orientation", "horizontal")
+        else:
+            coords = getattr(line, "coords", [])
+            direction = getattr(line, "direction", "downward")
+            orientation = getattr(line, "orientation", "horizontal")
+
+        geometry = None
+        if len(coords) >= 2:
+            pixel_coords = self._coords_to_pixels(coords, width, height)
             x1, y1 = pixel_coords[0]
             x2, y2 = pixel_coords[1]
 
-            line_color = (0, 255, 255)
-            cv2.line(frame, (x1, y1), (x2, y2), line_color, 3)
-
             mid_x = (x1 + x2) // 2
             mid_y = (y1 + y2) // 2
 
@@ -341,13 +478,40 @@ class VideoAnnotator:
                 else:
                     arrow_end = (mid_x - arrow_length, mid_y)
 
-            cv2.arrowedLine(frame, (mid_x, mid_y), arrow_end, (0, 0, 255), 2, tipLength=0.3)
-
-            label = f"Line {idx + 1}"
-            self._draw_text_with_shadow(
-                frame, label, (x1 - 10, max(14, y1 - 10)), line_color, 0.56, 1
+            geometry = (
+                (x1, y1),
+                (x2, y2),
+                (mid_x, mid_y),
+                arrow_end,
+                f"Line {idx + 1}",
+                (x1 - 10, max(14, y1 - 10)),
             )
 
+        if len(self._line_cache) >= 256:
+            self._line_cache.clear()
+        self._line_cache[key] = (line, geometry)
+        return geometry
+
+    def draw_lines(self, frame: np.ndarray, lines: List, feature_result=None) -> np.ndarray:
+        """Draw configured lines and line-cross counters."""
+        if not self._draw_enabled:
+            return frame
+        if not lines:
+            return frame
+
+        h, w = frame.shape[:2]
+
+        line_color = (0, 255, 255)
+        for idx, line in enumerate(lines):
+            geometry = self._line_geometry(idx, line, w, h)
+            if geometry is None:
+                continue
+
+            start, end, mid, arrow_end, label, label_org = geometry
+            cv2.line(frame, start, end, line_color, 3)
+            cv2.arrowedLine(frame, mid, arrow_end, (0, 0, 255), 2, tipLength=0.3)
+            self._draw_text_with_shadow(frame, label, label_org, line_color, 0.56, 1)
+
         if feature_result and feature_result.metrics:
             metrics = feature_result.metrics
             y_pos = h - 100
@@ -377,22 +541,43 @@ class VideoAnnotator:
 
         return frame
 
+    def _region_polygon(
+        self, region: Any, coords: List[Any], width: int, height: int
+    ) -> Tuple[np.ndarray, Tuple[int, int, int, int]]:
+        """Pixel polygon and clamped bounds for a region, cached across frames."""
+        key = (id(region), width, height)
+        cached = self._polygon_cache.get(key)
+        # The region itself is kept in the entry so its id cannot be reused while cached.
+        if cached is not None and cached[0] is region:
+            return cached[1], cached[2]
+
+        polygon = np.asarray(self._coords_to_pixels(coords, width, height), dtype=np.int32)
+        px1, py1 = np.maximum(polygon.min(axis=0), 0).tolist()
+        px2, py2 = np.minimum(polygon.max(axis=0) + 1, (width, height)).tolist()
+        if len(self._polygon_cache) >= 256:
+            self._polygon_cache.clear()
+        self._polygon_cache[key] = (region, polygon, (px1, py1, px2, py2))
+        return polygon, (px1, py1, px2, py2)
+
     def draw_regions(self, frame: np.ndarray, regions: List, feature_result=None) -> np.ndarray:
         """Draw configured regions and region-crowd counters/warnings."""
+        if not self._draw_enabled:
+            return frame
         if not regions:
             return frame
 
         h, w = frame.shape[:2]
         metrics = feature_result.metrics if feature_result and feature_result.metrics else {}
-        feature_type = str(metrics.get("feature", "")).lower() if isinstance(metrics, dict) else ""
-        region_metrics = metrics.get("regions", {}) if isinstance(metrics, dict) else {}
-
-        warning_threshold = (
-            int(metrics.get("warning_threshold", 0)) if isinstance(metrics, dict) else 0
-        )
-        critical_threshold = (
-            int(metrics.get("critical_threshold", 0)) if isinstance(metrics, dict) else 0
-        )
+        # Normalize metrics once so the per-region loop needs no type guards.
+        has_metrics = isinstance(metrics, dict)
+        if not has_metrics:
+            metrics = {}
+        feature_type = str(metrics.get("feature", "")).lower()
+        region_metrics = metrics.get("regions", {})
+        if not isinstance(region_metrics, dict):
+            region_metrics = {}
+        warning_threshold = int(metrics.get("warning_threshold", 0))
+        critical_threshold = int(metrics.get("critical_threshold", 0))
 
         for idx, region in enumerate(regions):
             if isinstance(region, dict):
@@ -405,18 +590,16 @@ class VideoAnnotator:
             if len(coords) < 3:
                 continue
 
-            polygon_points = self._coords_to_pixels(coords, w, h)
+            polygon, (px1, py1, px2, py2) = self._region_polygon(region, coords, w, h)
 
             key = f"region_{region_id}"
-            info = region_metrics.get(key, {}) if isinstance(region_metrics, dict) else {}
-            current_count = int(info.get("current_count", 0)) if isinstance(info, dict) else 0
-            status = (
-                str(info.get("status", "normal")).lower() if isinstance(info, dict) else "normal"
-            )
-            current_dwelling = int(info.get("current_dwelling", 0)) if isinstance(info, dict) else 0
-            current_dwell_times = (
-                info.get("current_dwell_times", []) if isinstance(info, dict) else []
-            )
+            info = region_metrics.get(key)
+            if not isinstance(info, dict):
+                info = {}
+            current_count = int(info.get("current_count", 0))
+            status = str(info.get("status", "normal")).lower()
+            current_dwelling = int(info.get("current_dwelling", 0))
+            current_dwell_times = info.get("current_dwell_times", [])
             max_current_dwell = (
                 float(max(current_dwell_times))
                 if isinstance(current_dwell_times, list) and current_dwell_times
@@ -432,18 +615,20 @@ class VideoAnnotator:
             elif feature_type == "dwell_time":
                 color = (255, 200, 0) if current_dwelling > 0 else (160, 160, 160)
 
-            overlay = frame.copy()
-            cv2.fillPoly(overlay, [np.array(polygon_points, dtype=np.int32)], color)
-            cv2.addWeighted(overlay, 0.12, frame, 0.88, 0, frame)
+            if px1 < px2 and py1 < py2:
+                roi = frame[py1:py2, px1:px2]
+                overlay = self._overlay_scratch(roi)
+                cv2.fillPoly(overlay, [polygon - (px1, py1)], color)
+                roi[:] = cv2.addWeighted(overlay, 0.12, roi, 0.88, 0)
             cv2.polylines(
                 frame,
-                [np.array(polygon_points, dtype=np.int32)],
+                [polygon],
                 isClosed=True,
                 color=color,
                 thickness=3,
             )
 
-            anchor_x, anchor_y = polygon_points[0]
+            anchor_x, anchor_y = polygon[0].tolist()
             if feature_type == "dwell_time":
                 label = f"REGION {region_id}: dwell={current_dwelling} max={max_current_dwell:.1f}s"
             else:
@@ -461,30 +646,22 @@ class VideoAnnotator:
                 scale=0.50,
             )
 
-        if isinstance(metrics, dict):
+        if has_metrics:
             panel_top = h - 135
             self._draw_panel(
                 frame, (10, panel_top), (360, panel_top + 120), alpha=0.44, shadow_alpha=0.16
             )
 
             if feature_type == "dwell_time":
-                total_dwelling = (
-                    sum(
-                        int(region_info.get("current_dwelling", 0))
-                        for region_info in region_metrics.values()
-                        if isinstance(region_info, dict)
-                    )
-                    if isinstance(region_metrics, dict)
-                    else 0
+                total_dwelling = sum(
+                    int(region_info.get("current_dwelling", 0))
+                    for region_info in region_metrics.values()
+                    if isinstance(region_info, dict)
                 )
-                total_completed = (
-                    sum(
-                        int(region_info.get("total_completed", 0))
-                        for region_info in region_metrics.values()
-                        if isinstance(region_info, dict)
-                    )
-                    if isinstance(region_metrics, dict)
-                    else 0
+                total_completed = sum(
+                    int(region_info.get("total_completed", 0))
+                    for region_info in region_metrics.values()
+                    if isinstance(region_info, dict)
                 )
                 overall_max = float(metrics.get("overall_max_dwell_seconds", 0.0))
 
@@ -2,9 +2,12 @@
 
 import os
 import signal
+import threading
 import time
-from dataclasses import asdict, is_dataclass
-from typing import Any, Dict, Optional
+from dataclasses import asdict, is_dataclass, replace
+from typing import AbstractSet, Any, Dict, List, Optional
+
+import numpy as np
 
 from yoi.analytics.analytics import AnalyticsEngine
 from yoi.components.engine_feature_mapping import build_feature_detections
@@ -13,6 +16,7 @@ from yoi.components.engine_output_lifecycle import (
     handle_feature_alert_events,
     initialize_output_engines,
 )
+from yoi.components.engine_pipeline import AdaptiveSkipper, FramePrefetcher, OrderedWorker
 from yoi.components.video_reader import VideoReader
 from yoi.config import YOIConfig
 from yoi.features import get_feature
@@ -21,6 +25,9 @@ from yoi.stream import RTSPPusher
 from yoi.tracking.object_tracker import ObjectTracker
 from yoi.utils.logger import logger_service
 
+# Successful RTSP pushes only check the health-log interval every N frames.
+_RTSP_HEALTH_CHECK_FRAMES = 32
+
 
 class VisionEngine:
     """Main YOI Vision AI Engine"""
@@ -47,8 +54,15 @@ class VisionEngine:
         self.video_writer: Any = None
         self.data_exporter: Any = None
         self.alert_manager: Any = None
+        self._is_live: bool = False
+
+        # Created before the video reader, whose reconnect backoff waits on it.
+        self._stop_requested = False
+        self._stop_event = threading.Event()
+        self._stop_reason: Optional[str] = None
 
         # Initialize components
+        self._init_input_loop_mode()
         self._init_video_reader()
         self.logger.info("STAGE 2/6 - INPUT READY")
         self._init_inference_engine()
@@ -64,9 +78,6 @@ class VisionEngine:
         self._init_runtime_tunables()
         self._init_runtime_state()
         self._init_rtsp_state()
-        self._init_input_loop_mode()
-        self._stop_requested = False
-        self._stop_reason: Optional[str] = None
 
     def request_stop(self, reason: str = "external request") -> None:
         """Request graceful stop; processing loop will exit and cleanup will run."""
@@ -74,6 +85,7 @@ class VisionEngine:
             return
         self._stop_requested = True
         self._stop_reason = reason
+        self._stop_event.set()
         self.logger.warning("Graceful stop requested: %s", reason)
 
     def _init_runtime_tunables(self) -> None:
@@ -102,6 +114,40 @@ class VisionEngine:
             default=1,
             min_value=1,
         )
+        # Live streams raise the inference stride up to YOI_MAX_SKIP while the
+        # pipeline falls behind; file inputs keep the fixed stride above.
+        is_live_source = self._is_live
+        max_skip = self._env_int("YOI_MAX_SKIP", default=8, min_value=1)
+        self._frame_skipper = AdaptiveSkipper(
+            self._infer_every_n_frames,
+            max_skip if is_live_source else self._infer_every_n_frames,
+            idle_seconds=self._env_float("YOI_SKIP_IDLE_SECONDS", default=2.0, min_value=0.0),
+            logger=self.logger,
+        )
+        # Reuse the last annotated frame on skipped (non-inference) frames.
+        self._interpolate_skipped: bool = self._env_enabled("YOI_INTERPOLATE_SKIPPED", default=False)
+        # Keyframes per batched inference call (1 = per-frame inference).
+        self._infer_batch_size: int = self._env_int("YOI_INFER_BATCH", default=1, min_value=1)
+        # Live sources hand the engine only the newest prefetched frame.
+        self._drop_stale_frames: bool = self._env_enabled("YOI_DROP_STALE_FRAMES", default=True)
+        # Count-style features can reuse keyframe results on skipped frames;
+        # time-integrated ones (dwell_time) must still run every frame.
+        self._feature_keyframes_only: bool = self._env_enabled(
+            "YOI_FEATURE_KEYFRAMES_ONLY",
+            default=False,
+        ) and self.config.feature in {"line_cross", "region_crowd"}
+        # FPS overlay refresh period; the label is reused between refreshes.
+        self._fps_update_interval: float = self._env_float(
+            "YOI_FPS_UPDATE_SECONDS",
+            default=0.5,
+            min_value=0.0,
+        )
+        # Queue depth between decode / engine loop / output threads (0 = serial loop).
+        self._pipeline_depth: int = self._env_int(
+            "YOI_PIPELINE_DEPTH",
+            default=4,
+            min_value=0,
+        )
         self._max_inference_seconds: float = self._env_float(
             "YOI_MAX_INFERENCE_SECONDS",
             default=0.0,
@@ -121,13 +167,29 @@ class VisionEngine:
                 self._infer_every_n_frames,
             )
 
+        if self._interpolate_skipped:
+            self.logger.warning(
+                "Skipped-frame interpolation enabled: non-inference frames reuse the last annotated frame"
+            )
+
     def _init_runtime_state(self) -> None:
         """Initialize per-event runtime state."""
         # State for per-event outputs (images / status / CSV)
         self._event_counter: int = 0
         self._last_line_cross_counts: Optional[tuple[int, int, int]] = None
-        self._last_feature_signature: Optional[str] = None
         self._track_visual_states: Dict[int, str] = {}
+        # Per-feature metrics logging, keyed by metrics["feature"].
+        self._metrics_handlers = {
+            "line_cross": self._log_line_cross,
+            "region_crowd": self._log_region_crowd,
+            "dwell_time": self._log_dwell_time,
+        }
+        self._frame_prefetcher: Optional[FramePrefetcher] = None
+        # Reusable annotation buffers; a ring so the output thread can still
+        # encode earlier frames while the engine annotates the current one.
+        self._annot_bufs: List[np.ndarray] = []
+        self._annot_buf_slot: int = 0
+        self._annot_ring_size: int = 1
 
     def _init_rtsp_state(self) -> None:
         """Initialize RTSP health and recovery state."""
@@ -187,6 +249,16 @@ class VisionEngine:
                 source=source_path,
                 max_fps=self.config.input.max_fps,
                 buffer_size=self.config.input.buffer_size,
+                stop_event=self._stop_event,
+                loop_cache_mb=(
+                    self._env_int("YOI_LOOP_CACHE_MB", 512, min_value=0)
+                    if self._loop_file_input
+                    else 0
+                ),
+            )
+            # Live sources (RTSP / unknown length) are read at the live edge.
+            self._is_live = (
+                source_path.startswith("rtsp://") or self.video_reader.get_frame_count() <= 0
             )
             self.logger.info(f"Video reader ready: {source_path}")
         except Exception as e:
@@ -237,6 +309,25 @@ class VisionEngine:
             self.logger.error(f"Failed to initialize inference engine: {e}")
             raise
 
+        self._warmup_inferencer()
+
+    def _warmup_inferencer(self) -> None:
+        """Run dummy inferences so the first real frame runs at steady-state latency."""
+        warmup_runs = self._env_int("YOI_WARMUP_FRAMES", default=3, min_value=0)
+        if warmup_runs == 0:
+            return
+
+        frame_shape = (640, 640, 3)
+        try:
+            if self.video_reader is not None:
+                width, height = self.video_reader.get_frame_size()
+                if width > 0 and height > 0:
+                    frame_shape = (int(height), int(width), 3)
+            seconds = self.inferencer.warmup(frame_shape, warmup_runs)
+            self.logger.info("Warm-up done in %.2fs (%s run(s))", seconds, warmup_runs)
+        except Exception as e:
+            self.logger.warning(f"Inference warm-up failed: {e}")
+
     def _init_tracker(self):
         """Initialize object tracker"""
         # Use feature_params tracking config if available
@@ -374,19 +465,18 @@ class VisionEngine:
                         f"RTSP OUTPUT: cooldown {wait_sec}s before inference "
                         "(allow publisher/clients stabilize)"
                     )
-                    for _ in range(wait_sec):
-                        if self._stop_requested:
-                            self.logger.warning(
-                                "Stop requested during RTSP cooldown - skipping inference"
-                            )
-                            break
-                        time.sleep(1)
+                    # Event.wait returns as soon as request_stop() fires.
+                    if self._stop_event.wait(timeout=wait_sec):
+                        self.logger.warning(
+                            "Stop requested during RTSP cooldown - skipping inference"
+                        )
         except Exception as e:
             self.logger.warning(f"Error during RTSP cooldown before processing: {e}")
 
         self.logger.info("STAGE 6/6 - INFERENCE STARTED")
 
-        self.start_time = time.time()
+        # Monotonic: only ever used for elapsed-time and FPS deltas.
+        self.start_time = time.monotonic()
 
         frame_generator = VideoReader.create_frame_generator(
             self.video_reader,
@@ -394,12 +484,86 @@ class VisionEngine:
             loop_file=self._loop_file_input,
         )
 
+        frames = frame_generator
+        self._frame_prefetcher = None
+        output_worker: Optional[OrderedWorker] = None
+        if self._pipeline_depth > 0:
+            self._frame_prefetcher = FramePrefetcher(
+                frame_generator,
+                self._pipeline_depth,
+                should_stop=self._stop_event.is_set,
+                latest_only=self._is_live and self._drop_stale_frames,
+            )
+            frames = self._frame_prefetcher
+            if self.rtsp_pusher is not None or self.video_writer:
+                output_worker = OrderedWorker(
+                    self._emit_annotated_frame,
+                    self._pipeline_depth,
+                    name="yoi-frame-output",
+                )
+
+        # Queued frames + the one being emitted + the one being annotated.
+        self._annot_ring_size = self._pipeline_depth + 2 if output_worker is not None else 1
+
         previous_tracks = {}
         cached_detections = []
+        frame_skipper = self._frame_skipper
+        frames_since_infer = frame_skipper.stride
+        frame_interval = None
+        if frame_skipper.enabled and self.video_reader is not None:
+            reader_fps = self.video_reader.get_fps()
+            frame_interval = 1.0 / reader_fps if reader_fps else None
+
+        batched = self._infer_batch_size > 1
+        if batched:
+            frames = self._batched_keyframes(frames, self._infer_batch_size, frame_interval)
+        else:
+            frames = ((frame_idx, frame, None) for frame_idx, frame in frames)
+
+        # Hot-loop locals: bound methods and tunables resolved once per run.
+        now = time.monotonic
+        start_time = self.start_time
+        max_runtime_seconds = self._max_inference_runtime_seconds
+        log_every = self._log_every_n_frames
+        infer = self.inferencer.infer
+        tracker = self.tracker
+        tracker_update = tracker.update
+        feature_process = self.feature_engine.process if self.feature_engine else None
+        process_analytics = self.analytics_engine.process_frame
+        annotation_buffer = self._annotation_buffer
+        annotator = self.annotator
+        draw_tracks = annotator.draw_tracks
+        draw_boxes = annotator.draw_boxes
+        draw_lines = annotator.draw_lines
+        draw_regions = annotator.draw_regions
+        draw_analytics = annotator.draw_analytics
+        draw_fps = annotator.draw_fps
+        lines = self.config.lines
+        regions = self.config.regions
+        emit_frame = output_worker.submit if output_worker is not None else self._emit_annotated_frame
+        add_frame = self.data_exporter.add_frame if self.data_exporter.is_active else None
+        logger = self.logger
+        stop_is_set = self._stop_event.is_set
+        fps_update_interval = self._fps_update_interval
+        displayed_fps = 0.0
+        next_fps_update_ts = 0.0
+        last_log_ts = start_time
+        last_log_frame_count = 0
+        # Frames actually handled; frame_idx also counts live frames the
+        # prefetcher dropped, so it cannot stand in for throughput.
+        frame_count = 0
+        metrics_handlers = self._metrics_handlers
+        interpolate_skipped = self._interpolate_skipped
+        has_output = self.rtsp_pusher is not None or bool(self.video_writer)
+        last_annotated_frame = None
+        feature_keyframes_only = self._feature_keyframes_only
+        stale_feature_result = None
+        stale_track_bbox_map = None
+        log_generic_feature = self._log_generic_feature
 
         try:
-            for frame_idx, frame in frame_generator:
-                if self._stop_requested:
+            for frame_idx, frame, keyframe_detections in frames:
+                if stop_is_set():
                     self.logger.warning(
                         "Stopping processing loop at frame %s (reason: %s)",
                         frame_idx,
@@ -407,9 +571,11 @@ class VisionEngine:
                     )
                     break
 
-                if self._max_inference_runtime_seconds is not None and self.start_time is not None:
-                    elapsed_seconds = time.time() - self.start_time
-                    if elapsed_seconds >= self._max_inference_runtime_seconds:
+                # Single clock read per frame, shared by the runtime limit and FPS overlay.
+                frame_ts = now()
+                if max_runtime_seconds is not None and start_time is not None:
+                    elapsed_seconds = frame_ts - start_time
+                    if elapsed_seconds >= max_runtime_seconds:
                         self.request_stop(
                             f"max inference runtime reached ({self._max_inference_seconds:.2f} second(s))"
                         )
@@ -420,39 +586,64 @@ class VisionEngine:
                         break
 
                 # Run inference (optionally frame-skipped for higher throughput)
-                should_infer = frame_idx % self._infer_every_n_frames == 0 or not cached_detections
-                if should_infer:
-                    inference_result = self.inferencer.infer(frame)
+                is_keyframe = True
+                if keyframe_detections is not None:
+                    detections = keyframe_detections
+                    cached_detections = detections
+                elif (not batched and frames_since_infer >= frame_skipper.stride) or not cached_detections:
+                    inference_result = infer(frame)
                     detections = inference_result.detections
                     cached_detections = detections
+                    frames_since_infer = 1
+                    if frame_skipper.enabled:
+                        infer_end = now()
+                        prefetcher = self._frame_prefetcher
+                        frame_skipper.update(
+                            infer_end,
+                            fill_ratio=prefetcher.fill_ratio if prefetcher is not None else None,
+                            infer_seconds=infer_end - frame_ts,
+                            frame_interval=frame_interval,
+                        )
                 else:
+                    is_keyframe = False
                     detections = cached_detections
+                    frames_since_infer += 1
+                    if interpolate_skipped and (not has_output or last_annotated_frame is not None):
+                        # Non-keyframe: repeat the previous annotated frame instead of
+                        # re-running tracking, analytics and drawing.
+                        frame_count += 1
+                        self.frame_count = frame_count
+                        if has_output:
+                            emit_frame((frame_idx, last_annotated_frame))
+                        continue
 
                 # Update tracker
-                tracked_objects = self.tracker.update(detections, frame)
+                tracked_objects = tracker_update(detections, frame)
 
                 # Process feature (line-cross, region-crowd, etc.) if configured
                 feature_result = None
+                feature_alerts = None
                 track_bbox_map = None
-                active_track_ids = set(tracked_objects.keys())
-                self._track_visual_states = {
-                    track_id: state
-                    for track_id, state in self._track_visual_states.items()
-                    if track_id in active_track_ids
-                }
-                track_alert_states: Dict[int, str] = dict(self._track_visual_states)
-                if self.feature_engine:
+                active_track_ids = tracked_objects.keys()
+                track_visual_states = self._track_visual_states
+                for stale_track_id in track_visual_states.keys() - active_track_ids:
+                    del track_visual_states[stale_track_id]
+                track_alert_states: Dict[int, str] = track_visual_states.copy()
+                if feature_process is not None and (
+                    is_keyframe or not feature_keyframes_only or stale_feature_result is None
+                ):
                     feature_detections, track_bbox_map = build_feature_detections(
-                        tracker=self.tracker,
+                        tracker=tracker,
                         detections=detections,
                         tracked_objects=tracked_objects,
                         frame_shape=frame.shape,
                     )
 
-                    feature_result = self.feature_engine.process(feature_detections, frame_idx)
+                    feature_result = feature_process(feature_detections, frame_idx)
+                    feature_alerts = feature_result.alerts if feature_result else None
 
-                    if feature_result and getattr(feature_result, "alerts", None):
-                        for alert in feature_result.alerts:
+                    if feature_alerts:
+                        for alert in feature_alerts:
                             if not isinstance(alert, dict):
                                 continue
                             track_id = alert.get("track_id")
@@ -468,255 +659,81 @@ class VisionEngine:
                                 track_alert_states[normalized_track_id] = "out"
                                 self._track_visual_states[normalized_track_id] = "out"
 
-                    # Log feature events (throttled): only when changed or periodic.
-                    if feature_result and feature_result.metrics:
-                        metrics = feature_result.metrics
-                        if metrics.get("feature") == "line_cross":
-                            current_counts = (
-                                int(metrics.get("total_in", 0)),
-                                int(metrics.get("total_out", 0)),
-                                int(metrics.get("net_count", 0)),
-                            )
-                            should_log = (
-                                self._last_line_cross_counts != current_counts
-                                or frame_idx % self._log_every_n_frames == 0
-                            )
-                            if should_log:
-                                self.logger.info(
-                                    "Frame %s - line_cross in=%s out=%s net=%s active=%s",
-                                    frame_idx,
-                                    current_counts[0],
-                                    current_counts[1],
-                                    current_counts[2],
-                                    int(metrics.get("active_tracks", 0)),
-                                )
-                                self._last_line_cross_counts = current_counts
-                        elif metrics.get("feature") == "region_crowd":
-                            inside_track_ids = {
-                                int(track_id) for track_id in metrics.get("inside_track_ids", [])
-                            }
-                            for track_id in active_track_ids:
-                                track_alert_states[track_id] = (
-                                    "inside" if track_id in inside_track_ids else "outside"
-                                )
-                            signature = str(
-                                (
-                                    metrics.get("total_current"),
-                                    metrics.get("total_max"),
-                                    tuple(sorted(inside_track_ids)),
-                                    str(metrics.get("regions", {})),
-                                )
-                            )
-                            should_log = frame_idx % self._feature_log_every_n_frames == 0
-                            if should_log:
-                                self.logger.info(
-                                    "Frame %s - region_crowd current=%s max=%s inside=%s",
-                                    frame_idx,
-                                    int(metrics.get("total_current", 0)),
-                                    int(metrics.get("total_max", 0)),
-                                    len(inside_track_ids),
-                                )
-                                self._last_feature_signature = signature
-                        elif metrics.get("feature") == "dwell_time":
-                            inside_track_ids = {
-                                int(track_id) for track_id in metrics.get("inside_track_ids", [])
-                            }
-                            alerted_track_ids = {
-                                int(track_id) for track_id in metrics.get("alerted_track_ids", [])
-                            }
-                            for track_id in active_track_ids:
-                                if track_id in alerted_track_ids:
-                                    track_alert_states[track_id] = "dwell_alert"
-                                else:
-                                    track_alert_states[track_id] = (
-                                        "dwell_inside"
-                                        if track_id in inside_track_ids
-                                        else "dwell_outside"
-                                    )
-                            signature = str(
-                                (
-                                    tuple(sorted(inside_track_ids)),
-                                    tuple(sorted(alerted_track_ids)),
-                                    str(metrics.get("regions", {})),
-                                )
-                            )
-                            should_log = frame_idx % self._feature_log_every_n_frames == 0
-                            if should_log:
-                                self.logger.info(
-                                    "Frame %s - dwell_time inside=%s alerted=%s max=%.2fs",
-                                    frame_idx,
-                                    len(inside_track_ids),
-                                    len(alerted_track_ids),
-                                    float(metrics.get("overall_max_dwell_seconds", 0.0) or 0.0),
-                                )
-                                self._last_feature_signature = signature
-                        else:
-                            signature = str(metrics)
-                            should_log = frame_idx % self._feature_log_every_n_frames == 0
-                            if should_log:
-                                self.logger.info(
-                                    "Frame %s - feature=%s metrics_update",
-                                    frame_idx,
-                                    metrics.get("feature", "unknown"),
-                                )
-                                self._last_feature_signature = signature
+                    if feature_keyframes_only and feature_result is not None:
+                        # Skipped frames reuse these metrics without re-raising alerts.
+                        stale_feature_result = replace(feature_result, alerts=[])
+                        stale_track_bbox_map = track_bbox_map
+                elif feature_process is not None:
+                    feature_result = stale_feature_result
+                    track_bbox_map = stale_track_bbox_map
+
+                # Log feature events (throttled): only when changed or periodic.
+                feature_metrics = feature_result.metrics if feature_result else None
+                if feature_metrics:
+                    handler = metrics_handlers.get(feature_metrics.get("feature"))
+                    (handler or log_generic_feature)(
+                        frame_idx, feature_metrics, active_track_ids, track_alert_states
+                    )
 
                 # Run analytics
-                analytics_result = self.analytics_engine.process_frame(
+                analytics_result = process_analytics(
                     frame_idx=frame_idx,
                     tracked_objects=tracked_objects,
                     previous_tracks=previous_tracks,
-                    tracker_obj=self.tracker,
+                    tracker_obj=tracker,
                 )
 
-                annotated_frame = frame.copy()
+                annotated_frame = annotation_buffer(frame)
 
                 # Draw detections and tracking
                 if tracked_objects:
-                    annotated_frame = self.annotator.draw_tracks(
+                    annotated_frame = draw_tracks(
                         annotated_frame,
                         tracked_objects,
                         track_bbox_map,
                         track_alert_states,
                     )
                 else:
-                    annotated_frame = self.annotator.draw_boxes(
+                    annotated_frame = draw_boxes(
                         annotated_frame,
                         detections,
                     )
 
                 # Draw lines and feature results (line-cross counts)
-                if self.config.lines:
-                    annotated_frame = self.annotator.draw_lines(
-                        annotated_frame, self.config.lines, feature_result
-                    )
+                if lines:
+                    annotated_frame = draw_lines(annotated_frame, lines, feature_result)
 
-                if self.config.regions:
-                    annotated_frame = self.annotator.draw_regions(
+                if regions:
+                    annotated_frame = draw_regions(
                         annotated_frame,
-                        self.config.regions,
+                        regions,
                         feature_result,
                     )
 
-                annotated_frame = self.annotator.draw_analytics(
-                    annotated_frame, analytics_result.to_dict()
-                )
+                annotated_frame = draw_analytics(annotated_frame, analytics_result)
 
                 # Render current FPS on the annotated frame.
-                self.frame_count = frame_idx + 1
-                elapsed = time.time() - self.start_time if self.start_time else 0
-                current_fps = self.frame_count / elapsed if elapsed > 0 else 0
-
-                annotated_frame = self.annotator.draw_fps(
-                    annotated_frame,
-                    current_fps,
-                )
-
-                # Push annotated frame to RTSP stream if enabled
-                if self.rtsp_pusher is not None:
-                    if not self.rtsp_pusher.is_running:
-                        try:
-                            self.logger.warning(
-                                "RTSP pusher not running during processing; trying restart"
-                            )
-                            self.rtsp_pusher.restart()
-                            self._rtsp_recover_count += 1
-                            self._rtsp_last_recover_attempt_ts = time.time()
-                        except Exception as e:
-                            self.logger.warning(f"Failed to restart RTSP pusher: {e}")
-
-                    pushed = self.rtsp_pusher.push_frame(annotated_frame)
-                    now_ts = time.time()
-                    if pushed:
-                        self._rtsp_push_success_count += 1
-                        if self._rtsp_first_fail_ts is not None and self._rtsp_drop_warned:
-                            down_for = now_ts - self._rtsp_first_fail_ts
-                            self.logger.info(
-                                "RTSP stream recovered after %.1fs downtime (%s)",
-                                down_for,
-                                self._rtsp_url or "unknown",
-                            )
-                        self._rtsp_first_fail_ts = None
-                        self._rtsp_drop_warned = False
-                    else:
-                        self._rtsp_push_fail_count += 1
-                        if self._rtsp_first_fail_ts is None:
-                            self._rtsp_first_fail_ts = now_ts
-                        down_for = now_ts - self._rtsp_first_fail_ts
-                        if down_for >= self._rtsp_drop_warn_seconds and not self._rtsp_drop_warned:
-                            self.logger.warning(
-                                "RTSP stream appears down for %.1fs (%s)",
-                                down_for,
-                                self._rtsp_url or "unknown",
-                            )
-                            self._rtsp_drop_warned = True
-
-                        if self._rtsp_auto_recover_enabled:
-                            should_attempt_recover = (
-                                self._rtsp_last_recover_attempt_ts is None
-                                or (now_ts - self._rtsp_last_recover_attempt_ts)
-                                >= self._rtsp_recover_cooldown_seconds
-                            )
-                            if should_attempt_recover:
-                                try:
-                                    self.logger.warning(
-                                        "RTSP push failed; attempting pusher recovery (url=%s)",
-                                        self._rtsp_url or "unknown",
-                                    )
-                                    recovered = self.rtsp_pusher.restart()
-                                    self._rtsp_last_recover_attempt_ts = now_ts
-                                    if recovered:
-                                        self._rtsp_recover_count += 1
-                                        self.logger.info(
-                                            "RTSP pusher recovery succeeded (count=%s, url=%s)",
-                                            self._rtsp_recover_count,
-                                            self._rtsp_url or "unknown",
-                                        )
-                                    else:
-                                        self.logger.warning(
-                                            "RTSP pusher recovery attempt failed (url=%s)",
-                                            self._rtsp_url or "unknown",
-                                        )
-                                except Exception as recover_error:
-                                    self._rtsp_last_recover_attempt_ts = now_ts
-                                    self.logger.warning(
-                                        "RTSP pusher recovery error: %s",
-                                        recover_error,
-                                    )
-
-                    should_log_health = (
-                        self._rtsp_last_health_log_ts is None
-                        or (now_ts - self._rtsp_last_health_log_ts)
-                        >= self._rtsp_health_log_interval_seconds
-                    )
-                    if should_log_health:
-                        stream_status = "up" if pushed else "down"
-                        self.logger.info(
-                            "RTSP health [%s]: status=%s success=%s fail=%s recover=%s url=%s",
-                            self.config.config_name,
-                            stream_status,
-                            self._rtsp_push_success_count,
-                            self._rtsp_push_fail_count,
-                            self._rtsp_recover_count,
-                            self._rtsp_url or "unknown",
-                        )
-                        self._rtsp_last_health_log_ts = now_ts
+                frame_count += 1
+                self.frame_count = frame_count
+                elapsed = frame_ts - start_time if start_time else 0
+                if frame_ts >= next_fps_update_ts:
+                    displayed_fps = frame_count / elapsed if elapsed > 0 else 0.0
+                    next_fps_update_ts = frame_ts + fps_update_interval
 
-                    if not pushed and frame_idx < 10:
-                        self.logger.warning(
-                            f"RTSP push failed at frame {frame_idx}; check yoi.rtsp logs"
-                        )
+                annotated_frame = draw_fps(annotated_frame, displayed_fps)
 
-                if feature_result is not None and getattr(feature_result, "metrics", None):
-                    metrics: Dict[str, Any] = feature_result.metrics
+                # Push to RTSP / write video (on the output thread when pipelined)
+                emit_frame((frame_idx, annotated_frame))
+                last_annotated_frame = annotated_frame
 
-                    if self.alert_manager is not None and getattr(feature_result, "alerts", None):
+                if feature_metrics and feature_alerts:
+                    if self.alert_manager is not None:
                         self.alert_manager.record(
                             frame_idx=frame_idx,
-                            feature=str(metrics.get("feature", self.config.feature or "unknown")),
+                            feature=str(feature_metrics.get("feature", self.config.feature or "unknown")),
                             cctv_id=self.config.cctv_id,
-                            alerts=feature_result.alerts,
-                            metrics=metrics,
+                            alerts=feature_alerts,
+                            metrics=feature_metrics,
                         )
 
                     handle_feature_alert_events(
@@ -726,40 +743,329 @@ class VisionEngine:
                         annotated_frame=annotated_frame,
                         feature_result=feature_result,
                         track_bbox_map=track_bbox_map,
+                        alerts=feature_alerts,
+                        metrics=feature_metrics,
                     )
 
-                # Write to video
-                if self.video_writer:
-                    self.video_writer.write_frame(annotated_frame)
-
                 # Export frame data
-                self.data_exporter.add_frame(
-                    frame_idx=frame_idx,
-                    detections=detections,
-                    tracked_objects=tracked_objects,
-                    analytics=analytics_result.to_dict(),
-                )
+                if add_frame is not None:
+                    add_frame(
+                        frame_idx=frame_idx,
+                        detections=detections,
+                        tracked_objects=tracked_objects,
+                        analytics=analytics_result,
+                    )
 
-                # Log progress (throttled)
-                if (frame_idx + 1) % self._log_every_n_frames == 0:
-                    elapsed = time.time() - self.start_time if self.start_time else 0
-                    fps = self.frame_count / elapsed if elapsed > 0 else 0
-                    self.logger.info(
-                        f"Processed {self.frame_count} frames "
-                        f"({fps:.1f} FPS) - Objects: {len(tracked_objects)}"
+                # Log progress (throttled by frames handled since the last log)
+                if frame_count - last_log_frame_count >= log_every:
+                    current_fps = frame_count / elapsed if elapsed > 0 else 0
+                    since_last_log = frame_ts - last_log_ts
+                    recent_fps = (
+                        (frame_count - last_log_frame_count) / since_last_log
+                        if since_last_log > 0
+                        else 0
+                    )
+                    last_log_ts = frame_ts
+                    last_log_frame_count = frame_count
+                    logger.info(
+                        "Processed %d frames (%.1f FPS, recent %.1f FPS) - Objects: %d",
+                        frame_count,
+                        current_fps,
+                        recent_fps,
+                        len(tracked_objects),
                     )
 
-                previous_tracks = tracked_objects.copy()
+                # tracker.update() builds a fresh dict each frame and nothing
+                # downstream mutates it, so the reference can be kept as-is.
+                previous_tracks = tracked_objects
+
+            if output_worker is not None:
+                output_worker.close()
 
         except Exception as e:
             self.logger.error(f"Error during processing: {e}", exc_info=True)
             raise
 
         finally:
+            if self._frame_prefetcher is not None:
+                # Wake a reader waiting out reconnect backoff on the prefetch
+                # thread; _stop_requested (not the event) marks a user stop.
+                self._stop_event.set()
+                self._frame_prefetcher.close()
+            if output_worker is not None:
+                output_worker.close(raise_error=False)
             signal.signal(signal.SIGTERM, previous_sigterm_handler)
             signal.signal(signal.SIGINT, previous_sigint_handler)
             self._cleanup()
 
+    def _log_line_cross(
+        self,
+        frame_idx: int,
+        metrics: Dict[str, Any],
+        active_track_ids: AbstractSet[int],
+        track_alert_states: Dict[int, str],
+    ) -> None:
+        """Log line-cross counts when they change or every N frames."""
+        # LineCrossFeature reports native ints; no per-frame coercion needed.
+        current_counts = (
+            metrics.get("total_in", 0),
+            metrics.get("total_out", 0),
+            metrics.get("net_count", 0),
+        )
+        should_log = (
+            self._last_line_cross_counts != current_counts
+            or frame_idx % self._log_every_n_frames == 0
+        )
+        if should_log:
+            self.logger.info(
+                "Frame %s - line_cross in=%s out=%s net=%s active=%s",
+                frame_idx,
+                current_counts[0],
+                current_counts[1],
+                current_counts[2],
+                metrics.get("active_tracks", 0),
+            )
+            self._last_line_cross_counts = current_counts
+
+    def _log_region_crowd(
+        self,
+        frame_idx: int,
+        metrics: Dict[str, Any],
+        active_track_ids: AbstractSet[int],
+        track_alert_states: Dict[int, str],
+    ) -> None:
+        """Mark tracks inside/outside crowd regions and log periodically."""
+        # Feature metrics already carry int track ids.
+        inside_track_ids = frozenset(metrics.get("inside_track_ids", ()))
+        track_alert_states.update(dict.fromkeys(active_track_ids, "outside"))
+        track_alert_states.update(dict.fromkeys(active_track_ids & inside_track_ids, "inside"))
+        if frame_idx % self._feature_log_every_n_frames == 0:
+            self.logger.info(
+                "Frame %s - region_crowd current=%s max=%s inside=%s",
+                frame_idx,
+                metrics.get("total_current", 0),
+                metrics.get("total_max", 0),
+                len(inside_track_ids),
+            )
+
+    def _log_dwell_time(
+        self,
+        frame_idx: int,
+        metrics: Dict[str, Any],
+        active_track_ids: AbstractSet[int],
+        track_alert_states: Dict[int, str],
+    ) -> None:
+        """Mark dwell states per track and log periodically."""
+        inside_track_ids = frozenset(metrics.get("inside_track_ids", ()))
+        alerted_track_ids = frozenset(metrics.get("alerted_track_ids", ()))
+        track_alert_states.update(dict.fromkeys(active_track_ids, "dwell_outside"))
+        track_alert_states.update(dict.fromkeys(active_track_ids & inside_track_ids, "dwell_inside"))
+        track_alert_states.update(dict.fromkeys(active_track_ids & alerted_track_ids, "dwell_alert"))
+        if frame_idx % self._feature_log_every_n_frames == 0:
+            self.logger.info(
+                "Frame %s - dwell_time inside=%s alerted=%s max=%.2fs",
+                frame_idx,
+                len(inside_track_ids),
+                len(alerted_track_ids),
+                float(metrics.get("overall_max_dwell_seconds", 0.0) or 0.0),
+            )
+
+    def _log_generic_feature(
+        self,
+        frame_idx: int,
+        metrics: Dict[str, Any],
+        active_track_ids: AbstractSet[int],
+        track_alert_states: Dict[int, str],
+    ) -> None:
+        """Periodic log for features without a dedicated handler."""
+        if frame_idx % self._feature_log_every_n_frames == 0:
+            self.logger.info(
+                "Frame %s - feature=%s metrics_update",
+                frame_idx,
+                metrics.get("feature", "unknown"),
+            )
+
+    def _batched_keyframes(self, frames, batch_size: int, frame_interval: Optional[float]):
+        """Yield (frame_idx, frame, detections) with keyframes inferred in batches.
+
+        Keyframes follow the current inference stride and are collected until
+        batch_size of them are pending; skipped frames are yielded in order with
+        None and reuse cached detections in the processing loop.
+        """
+        infer_batch = self.inferencer.infer_batch
+        frame_skipper = self._frame_skipper
+        pending: List[tuple] = []
+        keyframes: List[np.ndarray] = []
+
+        def flush() -> List[tuple]:
+            infer_start = time.monotonic()
+            results = iter(infer_batch(keyframes)) if keyframes else iter(())
+            if frame_skipper.enabled and keyframes:
+                infer_end = time.monotonic()
+                prefetcher = self._frame_prefetcher
+                frame_skipper.update(
+                    infer_end,
+                    fill_ratio=prefetcher.fill_ratio if prefetcher is not None else None,
+                    infer_seconds=(infer_end - infer_start) / len(keyframes),
+                    frame_interval=frame_interval,
+                )
+            ready = [
+                (frame_idx, frame, next(results).detections if is_key else None)
+                for frame_idx, frame, is_key in pending
+            ]
+            pending.clear()
+            keyframes.clear()
+            return ready
+
+        frames_since_infer = frame_skipper.stride
+        for frame_idx, frame in frames:
+            is_key = frames_since_infer >= frame_skipper.stride
+            frames_since_infer = 1 if is_key else frames_since_infer + 1
+            pending.append((frame_idx, frame, is_key))
+            if is_key:
+                keyframes.append(frame)
+                if len(keyframes) >= batch_size:
+                    yield from flush()
+        if pending:
+            yield from flush()
+
+    def _annotation_buffer(self, frame: np.ndarray) -> np.ndarray:
+        """Copy frame into the next reusable annotation buffer."""
+        slot = self._annot_buf_slot
+        bufs = self._annot_bufs
+        buf = bufs[slot] if slot < len(bufs) else None
+        if buf is None or buf.shape != frame.shape or buf.dtype != frame.dtype:
+            buf = np.empty_like(frame)
+            if slot < len(bufs):
+                bufs[slot] = buf
+            else:
+                bufs.append(buf)
+        np.copyto(buf, frame)
+        self._annot_buf_slot = (slot + 1) % self._annot_ring_size
+        return buf
+
+    def _emit_annotated_frame(self, item: tuple) -> None:
+        """Push an annotated frame to RTSP and the video writer, in frame order."""
+        frame_idx, annotated_frame = item
+        if self.rtsp_pusher is not None:
+            self._push_rtsp_frame(frame_idx, annotated_frame)
+        if self.video_writer:
+            self.video_writer.write_frame(annotated_frame)
+
+    def _push_rtsp_frame(self, frame_idx: int, annotated_frame) -> None:
+        """Push one frame to the RTSP pusher with health logging and auto-recovery."""
+        pusher = self.rtsp_pusher
+        if not pusher.is_running:
+            self._rtsp_restart_stopped_pusher()
+
+        pushed = pusher.push_frame(annotated_frame)
+        # Steady-state successful pushes only read the clock every
+        # _RTSP_HEALTH_CHECK_FRAMES frames; failures and recoveries always do.
+        now_ts = None
+        if pushed:
+            self._rtsp_push_success_count += 1
+            if self._rtsp_first_fail_ts is not None:
+                now_ts = time.monotonic()
+                self._rtsp_note_recovered(now_ts)
+        else:
+            now_ts = time.monotonic()
+            self._rtsp_handle_failure(frame_idx, now_ts)
+
+        last_health_log_ts = self._rtsp_last_health_log_ts
+        if now_ts is None:
+            if last_health_log_ts is not None and frame_idx % _RTSP_HEALTH_CHECK_FRAMES:
+                return
+            now_ts = time.monotonic()
+        if (
+            last_health_log_ts is None
+            or now_ts - last_health_log_ts >= self._rtsp_health_log_interval_seconds
+        ):
+            self._rtsp_log_health(pushed, now_ts)
+
+    def _rtsp_restart_stopped_pusher(self) -> None:
+        try:
+            self.logger.warning("RTSP pusher not running during processing; trying restart")
+            self.rtsp_pusher.restart()
+            self._rtsp_recover_count += 1
+            self._rtsp_last_recover_attempt_ts = time.monotonic()
+        except Exception as e:
+            self.logger.warning("Failed to restart RTSP pusher: %s", e)
+
+    def _rtsp_note_recovered(self, now_ts: float) -> None:
+        """First successful push after a failure streak."""
+        if self._rtsp_drop_warned:
+            down_for = now_ts - self._rtsp_first_fail_ts
+            self.logger.info(
+                "RTSP stream recovered after %.1fs downtime (%s)",
+                down_for,
+                self._rtsp_url or "unknown",
+            )
+        self._rtsp_first_fail_ts = None
+        self._rtsp_drop_warned = False
+
+    def _rtsp_handle_failure(self, frame_idx: int, now_ts: float) -> None:
+        """Track downtime, warn once it is long enough and try pusher recovery."""
+        self._rtsp_push_fail_count += 1
+        if self._rtsp_first_fail_ts is None:
+            self._rtsp_first_fail_ts = now_ts
+        down_for = now_ts - self._rtsp_first_fail_ts
+        if down_for >= self._rtsp_drop_warn_seconds and not self._rtsp_drop_warned:
+            self.logger.warning(
+                "RTSP stream appears down for %.1fs (%s)",
+                down_for,
+                self._rtsp_url or "unknown",
+            )
+            self._rtsp_drop_warned = True
+
+        if self._rtsp_auto_recover_enabled:
+            should_attempt_recover = (
+                self._rtsp_last_recover_attempt_ts is None
+                or (now_ts - self._rtsp_last_recover_attempt_ts)
+                >= self._rtsp_recover_cooldown_seconds
+            )
+            if should_attempt_recover:
+                try:
+                    self.logger.warning(
+                        "RTSP push failed; attempting pusher recovery (url=%s)",
+                        self._rtsp_url or "unknown",
+                    )
+                    recovered = self.rtsp_pusher.restart()
+                    self._rtsp_last_recover_attempt_ts = now_ts
+                    if recovered:
+                        self._rtsp_recover_count += 1
+                        self.logger.info(
+                            "RTSP pusher recovery succeeded (count=%s, url=%s)",
+                            self._rtsp_recover_count,
+                            self._rtsp_url or "unknown",
+                        )
+                    else:
+                        self.logger.warning(
+                            "RTSP pusher recovery attempt failed (url=%s)",
+                            self._rtsp_url or "unknown",
+                        )
+                except Exception as recover_error:
+                    self._rtsp_last_recover_attempt_ts = now_ts
+                    self.logger.warning(
+                        "RTSP pusher recovery error: %s",
+                        recover_error,
+                    )
+
+        if frame_idx < 10:
+            self.logger.warning("RTSP push failed at frame %s; check yoi.rtsp logs", frame_idx)
+
+    def _rtsp_log_health(self, pushed: bool, now_ts: float) -> None:
+        stream_status = "up" if pushed else "down"
+        self.logger.info(
+            "RTSP health [%s]: status=%s success=%s fail=%s recover=%s url=%s",
+            self.config.config_name,
+            stream_status,
+            self._rtsp_push_success_count,
+            self._rtsp_push_fail_count,
+            self._rtsp_recover_count,
+            self._rtsp_url or "unknown",
+        )
+        self._rtsp_last_health_log_ts = now_ts
+
     def _cleanup(self):
         """Cleanup and persist final outputs."""
         cleanup_engine(self)
@@ -8,6 +8,14 @@ import numpy as np
 
 from yoi.features.base import Detection as FeatureDetection
 
+try:
+    from scipy.optimize import linear_sum_assignment
+
+    HAS_SCIPY = True
+except ImportError:  # pragma: no cover - scipy normally ships with ultralytics
+    linear_sum_assignment = None
+    HAS_SCIPY = False
+
 
 def build_feature_detections(
     tracker,
@@ -20,43 +28,71 @@ def build_feature_detections(
     track_bbox_map: Dict[int, Any] = {}
     feature_detections = []
 
-    indexed_detections = list(enumerate(detections))
-    used_detection_indices = set()
     current_tracker_frame = max(0, tracker.frame_idx - 1)
 
+    # Tracks updated this frame, in tracker order: (track_id, x, y, class_name).
+    eligible = []
     for track_id, (track_x, track_y, class_name) in tracked_objects.items():
         track_obj = tracker.get_track(track_id)
         if not track_obj or track_obj.last_frame_idx != current_tracker_frame:
             continue
-
-        best_det = None
-        best_det_idx = None
-        min_dist = float("inf")
-
-        for det_idx, det in indexed_detections:
-            if det_idx in used_detection_indices:
-                continue
-            if det.class_name != class_name:
-                continue
-
-            dist = np.sqrt((det.centroid_x - track_x) ** 2 + (det.centroid_y - track_y) ** 2)
-            if dist < min_dist:
-                min_dist = dist
-                best_det = det
-                best_det_idx = det_idx
-
-        if best_det is None or best_det_idx is None:
+        eligible.append((track_id, track_x, track_y, class_name))
+
+    if not eligible or not detections:
+        return feature_detections, track_bbox_map
+
+    det_count = len(detections)
+    det_cx = np.fromiter((det.centroid_x for det in detections), dtype=np.float64, count=det_count)
+    det_cy = np.fromiter((det.centroid_y for det in detections), dtype=np.float64, count=det_count)
+    columns_by_class: Dict[str, list] = {}
+    for det_idx, det in enumerate(detections):
+        columns_by_class.setdefault(det.class_name, []).append(det_idx)
+
+    # Per-class minimum-cost assignment on squared centroid distances (Hungarian
+    # via SciPy); without SciPy, greedy nearest matching in tracker order.
+    matched: Dict[int, int] = {}
+    for class_name, columns in columns_by_class.items():
+        rows = [row for row, entry in enumerate(eligible) if entry[3] == class_name]
+        if not rows:
             continue
-
-        used_detection_indices.add(best_det_idx)
-
-        norm_bbox = [
-            best_det.x1 / w,
-            best_det.y1 / h,
-            best_det.x2 / w,
-            best_det.y2 / h,
-        ]
-        norm_centroid = (track_x / w, track_y / h)
+        cols = np.asarray(columns)
+        track_x = np.array([eligible[row][1] for row in rows], dtype=np.float64)[:, None]
+        track_y = np.array([eligible[row][2] for row in rows], dtype=np.float64)[:, None]
+        dx = det_cx[cols][None, :] - track_x
+        dy = det_cy[cols][None, :] - track_y
+        dist2 = dx * dx + dy * dy
+        if HAS_SCIPY:
+            row_ind, col_ind = linear_sum_assignment(dist2)
+            for pos, best in zip(row_ind.tolist(), col_ind.tolist()):
+                matched[rows[pos]] = int(cols[best])
+            continue
+        for pos, row in enumerate(rows):
+            best = int(np.argmin(dist2[pos]))
+            if dist2[pos, best] == np.inf:
+                break
+            matched[row] = int(cols[best])
+            dist2[:, best] = np.inf
+
+    chosen = [(row, matched[row]) for row in range(len(eligible)) if row in matched]
+
+    # Normalize every selected bbox and centroid in one multiply by (1/w, 1/h).
+    inv_w, inv_h = 1.0 / w, 1.0 / h
+    bbox_arr = np.array(
+        [
+            (detections[det_idx].x1, detections[det_idx].y1, detections[det_idx].x2, detections[det_idx].y2)
+            for _, det_idx in chosen
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+    norm_bboxes = (bbox_arr * np.array([inv_w, inv_h, inv_w, inv_h])).tolist()
+    centroid_arr = np.array(
+        [(eligible[row][1], eligible[row][2]) for row, _ in chosen], dtype=np.float64
+    ).reshape(-1, 2)
+    norm_centroids = (centroid_arr * np.array([inv_w, inv_h])).tolist()
+
+    for (row, det_idx), norm_bbox, norm_centroid in zip(chosen, norm_bboxes, norm_centroids):
+        track_id, _, _, class_name = eligible[row]
+        best_det = detections[det_idx]
 
         feature_det = FeatureDetection(
             track_id=track_id,
@@ -64,7 +100,7 @@ def build_feature_detections(
             class_name=class_name,
             confidence=best_det.confidence,
             bbox=norm_bbox,
-            centroid=norm_centroid,
+            centroid=tuple(norm_centroid),
         )
         feature_detections.append(feature_det)
         track_bbox_map[track_id] = best_det
@@ -2,18 +2,44 @@
 
 from __future__ import annotations
 
-import json
 import os
+import re
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 import cv2
 
 from yoi.annotate.video_annotator import VideoAnnotator
+from yoi.components.engine_pipeline import EventWriter
 from yoi.output.exporters import DataExporter, VideoWriter
 from yoi.stream import RTSPPushConfig, RTSPPusher
+from yoi.utils.json_utils import json_dumps_bytes
+
+try:
+    from turbojpeg import TurboJPEG
+
+    HAS_TURBOJPEG = True
+except ImportError:
+    TurboJPEG = None
+    HAS_TURBOJPEG = False
+
+# Event rows are flushed to data.csv in batches rather than per row.
+_CSV_FLUSH_EVERY_ROWS = 32
+_CSV_FLUSH_INTERVAL_S = 0.25
+# Frames of alert output that may wait for the event writer before new ones drop.
+_EVENT_QUEUE_SIZE = 64
+# Alert snapshots are downscaled to this width and JPEG-encoded at this quality.
+_ALERT_IMAGE_MAX_WIDTH = 1280
+_ALERT_JPEG_QUALITY = 80
+_ALERT_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, _ALERT_JPEG_QUALITY, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+# Per-track id lists in feature metrics only drive on-screen track states; they
+# grow with the crowd and are left out of per-event payloads.
+_EVENT_METRICS_EXCLUDED_KEYS = frozenset({"inside_track_ids", "alerted_track_ids"})
+# Characters replaced by "_" in event file-name tokens (one "_" per character).
+_UNSAFE_TOKEN_RE = re.compile(r"[^\w-]")
 
 
 def _flag_enabled(value: Any) -> bool:
@@ -24,6 +50,14 @@ def _flag_enabled(value: Any) -> bool:
     return False
 
 
+@lru_cache(maxsize=128)
+def _annotated_output_names(config_name: str, source_path: str) -> Tuple[str, str]:
+    """Return (config folder, video stem) for the annotated output layout."""
+    config_folder = Path(config_name).name or "default"
+    video_name = Path(source_path).stem if source_path else ""
+    return config_folder, video_name
+
+
 def _resolve_annotated_output_path(engine, base_output_dir: Path) -> Path:
     """Resolve output path as: base/config_name/video_name_timestamp."""
     run_timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
@@ -38,17 +72,12 @@ def _resolve_annotated_output_path(engine, base_output_dir: Path) -> Path:
     else:
         config_name = str(getattr(engine.config, "config_name", "default") or "default").strip()
 
-    config_name = Path(config_name).name or "default"
-    output_path = base_output_dir / config_name
-
     source_path = engine.config.input.get_source_path() if engine.config.input else ""
-    video_name = Path(source_path).stem if source_path else ""
-    if video_name:
-        output_path = output_path / f"{video_name}_{run_timestamp}"
-    else:
-        output_path = output_path / run_timestamp
+    # Only the name derivation is cached; the run timestamp must stay per call.
+    config_folder, video_name = _annotated_output_names(config_name, source_path or "")
 
-    return output_path
+    run_folder = f"{video_name}_{run_timestamp}" if video_name else run_timestamp
+    return Path(os.path.join(base_output_dir, config_folder, run_folder))
 
 
 def _is_rtsp_input(engine) -> bool:
@@ -64,6 +93,24 @@ def _is_rtsp_input(engine) -> bool:
     return source_path.startswith("rtsp://")
 
 
+def _remove_stale_files(engine, filenames: List[str]) -> None:
+    """Remove previous-run files from the output dir found in a single scan."""
+    try:
+        with os.scandir(engine.output_dir) as entries:
+            present = {entry.name for entry in entries if entry.is_file()}
+    except OSError as exc:
+        engine.logger.warning(f"Failed to scan {engine.output_dir} for old files: {exc}")
+        return
+    for filename in filenames:
+        if filename not in present:
+            continue
+        file_path = os.path.join(engine.output_dir, filename)
+        try:
+            os.unlink(file_path)
+        except OSError as exc:
+            engine.logger.warning(f"Failed to remove old file {file_path}: {exc}")
+
+
 def initialize_output_engines(engine) -> None:
     """Initialize output directory, writers, exporters, and RTSP pusher."""
     is_rtsp = _is_rtsp_input(engine)
@@ -106,41 +153,62 @@ def initialize_output_engines(engine) -> None:
     engine.image_dir = engine.output_dir / image_folder
     engine.data_dir = engine.output_dir / data_folder
     engine.status_dir = engine.output_dir / status_folder
+    # Plain string prefixes so per-event file paths skip Path construction.
+    engine._image_dir_str = str(engine.image_dir) + os.sep
+    engine._data_dir_str = str(engine.data_dir) + os.sep
+    engine._status_dir_str = str(engine.status_dir) + os.sep
     engine._event_status_enabled = is_rtsp
 
-    for filename in (csv_filename,):
-        file_path = engine.output_dir / filename
-        if file_path.exists():
-            try:
-                file_path.unlink()
-            except Exception as exc:
-                engine.logger.warning(f"Failed to remove old file {file_path}: {exc}")
+    save_video = _flag_enabled(engine.config.output.save_video) if engine.config.output else False
+    stale_files = [csv_filename]
+    if save_video:
+        stale_files.append("output_annotated.mp4")
+    _remove_stale_files(engine, stale_files)
 
     engine.data_csv_path = engine.output_dir / csv_filename
+    # Kept open for the whole run so per-event rows skip the open/close cycle.
+    engine._data_csv_file = None
+    engine._data_csv_pending_rows = 0
+    engine._data_csv_last_flush = time.monotonic()
     try:
-        engine.data_csv_path.write_text(
-            "image_id,timestamp,feature,status,data_path,image_path\n",
-            encoding="utf-8",
-        )
+        engine._data_csv_file = engine.data_csv_path.open("w", encoding="utf-8", buffering=1 << 16)
+        engine._data_csv_file.write("image_id,timestamp,feature,status,data_path,image_path\n")
+        engine._data_csv_file.flush()
     except Exception as exc:
         engine.logger.warning(f"Failed to initialize data CSV {engine.data_csv_path}: {exc}")
 
+    # Alert payload fields that stay fixed for the whole run.
+    engine._cached_source_name = _source_name_from_input(engine)
+    engine._cached_config_name = str(getattr(engine.config, "config_name", "default") or "default")
+
+    engine._turbojpeg = _create_turbojpeg(engine)
+    engine._event_writer = EventWriter(
+        lambda batch: _write_event_batch(engine, batch),
+        _EVENT_QUEUE_SIZE,
+        name="yoi-event-writer",
+    )
+
+    # Debug artifacts (analytics summaries, per-frame Parquet) are opt-in so the
+    # default output layout stays minimal.
+    export_env = os.getenv("YOI_EXPORT_DEBUG_ARTIFACTS", "0").strip().lower()
+    engine._export_debug_artifacts = export_env in {"1", "true", "on", "yes"}
+    analytics_engine = getattr(engine, "analytics_engine", None)
+    if engine._export_debug_artifacts and analytics_engine is not None:
+        analytics_engine.start_frame_export(str(engine.output_dir / "analytics" / "frames.parquet"))
+
     engine.logs_dir = Path(engine.config.logs.base_dir) if engine.config.logs else Path("logs")
     engine.logs_dir.mkdir(parents=True, exist_ok=True)
 
-    save_video = _flag_enabled(engine.config.output.save_video) if engine.config.output else False
     if save_video:
         frame_size = engine.video_reader.get_frame_size()
         video_dir = engine.output_dir / "video"
         video_dir.mkdir(parents=True, exist_ok=True)
         video_path = video_dir / "output_annotated.mp4"
 
-        for old_path in (engine.output_dir / "output_annotated.mp4", video_path):
-            if old_path.exists():
-                try:
-                    old_path.unlink()
-                except Exception as exc:
-                    engine.logger.warning(f"Failed to remove old video file {old_path}: {exc}")
+        try:
+            video_path.unlink(missing_ok=True)
+        except OSError as exc:
+            engine.logger.warning(f"Failed to remove old video file {video_path}: {exc}")
 
         try:
             engine.video_writer = VideoWriter(
@@ -156,7 +224,9 @@ def initialize_output_engines(engine) -> None:
         engine.video_writer = None
 
     engine.annotator = VideoAnnotator()
-    engine.data_exporter = DataExporter(str(engine.output_dir))
+    # cleanup_engine never writes the frame-level exports (minimal output
+    # layout), so the exporter stays inactive and the loop skips add_frame.
+    engine.data_exporter = DataExporter(str(engine.output_dir), enabled=False)
     engine.alert_manager = None
 
     _initialize_rtsp(engine)
@@ -179,11 +249,22 @@ def _source_name_from_input(engine) -> str:
 
 
 def _safe_token(raw: str) -> str:
-    cleaned = "".join(ch if (ch.isalnum() or ch in {"_", "-"}) else "_" for ch in raw)
-    cleaned = cleaned.strip("_")
+    cleaned = _UNSAFE_TOKEN_RE.sub("_", raw).strip("_")
     return cleaned or "event"
 
 
+def _prepare_snapshot(image, deferred: bool):
+    """Downscale wide snapshots; copy when the event writer encodes later."""
+    image_w = image.shape[1]
+    if image_w > _ALERT_IMAGE_MAX_WIDTH:
+        scale = _ALERT_IMAGE_MAX_WIDTH / image_w
+        return cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    if deferred:
+        # Frame and annotation buffers are reused by the engine loop.
+        return image.copy()
+    return image
+
+
 def _resolve_track_crop(frame, track_bbox_map: Dict[int, Any] | None, track_id: int | None):
     if frame is None or track_bbox_map is None or track_id is None:
         return None
@@ -206,22 +287,103 @@ def _resolve_track_crop(frame, track_bbox_map: Dict[int, Any] | None, track_id:
         return None
 
 
-def _append_event_csv_row(
-    engine,
-    image_id: str,
-    timestamp: str,
-    feature_name: str,
-    warning_label: str,
-    data_rel: str,
-    image_rel: str,
+def _create_turbojpeg(engine):
+    """Return a TurboJPEG encoder, or None to encode with OpenCV."""
+    if not HAS_TURBOJPEG:
+        return None
+    try:
+        return TurboJPEG()
+    except Exception as exc:
+        # PyTurboJPEG is installed but the libturbojpeg shared library is not.
+        engine.logger.warning(f"TurboJPEG unavailable, using OpenCV JPEG encoder: {exc}")
+        return None
+
+
+def _encode_jpeg(engine, image) -> Any:
+    turbojpeg = getattr(engine, "_turbojpeg", None)
+    if turbojpeg is not None:
+        return turbojpeg.encode(image, quality=_ALERT_JPEG_QUALITY)
+    encoded_ok, encoded = cv2.imencode(".jpg", image, _ALERT_JPEG_PARAMS)
+    if not encoded_ok:
+        raise RuntimeError("JPEG encoding failed")
+    return encoded
+
+
+def _write_event_files(engine, writes: List[Tuple[str, Any, str]]) -> None:
+    """Write event files; ndarray payloads are JPEG-encoded first, once per array."""
+    encoded_by_id: Dict[int, Any] = {}
+    for path, payload, description in writes:
+        try:
+            if not isinstance(payload, bytes):
+                encoded = encoded_by_id.get(id(payload))
+                if encoded is None:
+                    encoded = encoded_by_id[id(payload)] = _encode_jpeg(engine, payload)
+                payload = encoded
+            _write_bytes(path, payload)
+        except Exception as exc:
+            engine.logger.warning("Failed to write %s %s: %s", description, path, exc)
+
+
+def _write_bytes(path: str, payload: bytes) -> None:
+    try:
+        with open(path, "wb") as file_obj:
+            file_obj.write(payload)
+    except FileNotFoundError:
+        # Event directories are created once at init; recreate one removed mid-run.
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file_obj:
+            file_obj.write(payload)
+
+
+def _write_event_batch(engine, batch: Tuple[List[Tuple[str, Any, str]], List[Tuple[str, ...]]]) -> None:
+    """Write one frame's event files, then append their data.csv rows."""
+    writes, csv_rows = batch
+    _write_event_files(engine, writes)
+    _append_event_csv_rows(engine, csv_rows)
+
+
+def _submit_event_batch(
+    engine, writes: List[Tuple[str, Any, str]], csv_rows: List[Tuple[str, ...]]
 ) -> None:
+    """Hand one frame's event output to the event writer, or write it inline."""
+    if not writes and not csv_rows:
+        return
+    event_writer = getattr(engine, "_event_writer", None)
+    if event_writer is None:
+        _write_event_batch(engine, (writes, csv_rows))
+    elif not event_writer.submit((writes, csv_rows)):
+        engine.logger.warning(
+            "Event writer queue full; dropped %s alert event(s) (total dropped batches=%s)",
+            len(csv_rows),
+            event_writer.dropped,
+        )
+
+
+def _append_event_csv_rows(engine, rows: List[Tuple[str, ...]]) -> None:
+    """Append one frame's event rows to data.csv with a single write."""
+    if not rows or not hasattr(engine, "data_csv_path"):
+        return
     try:
-        if hasattr(engine, "data_csv_path"):
-            row = f"{image_id},{timestamp},{feature_name},{warning_label},{data_rel},{image_rel}\n"
+        text = "".join(
+            f"{image_id},{timestamp},{feature_name},{warning_label},{data_rel},{image_rel}\n"
+            for image_id, timestamp, feature_name, warning_label, data_rel, image_rel in rows
+        )
+        csv_file = getattr(engine, "_data_csv_file", None)
+        if csv_file is not None and not csv_file.closed:
+            csv_file.write(text)
+            pending = getattr(engine, "_data_csv_pending_rows", 0) + len(rows)
+            now = time.monotonic()
+            last_flush = getattr(engine, "_data_csv_last_flush", 0.0)
+            if pending >= _CSV_FLUSH_EVERY_ROWS or now - last_flush >= _CSV_FLUSH_INTERVAL_S:
+                csv_file.flush()
+                pending = 0
+                engine._data_csv_last_flush = now
+            engine._data_csv_pending_rows = pending
+        else:
             with engine.data_csv_path.open("a", encoding="utf-8") as file_obj:
-                file_obj.write(row)
+                file_obj.write(text)
     except Exception as exc:
-        engine.logger.warning(f"Failed to append event row to {engine.data_csv_path}: {exc}")
+        engine.logger.warning("Failed to append event rows to %s: %s", engine.data_csv_path, exc)
 
 
 def handle_feature_alert_events(
@@ -231,15 +393,41 @@ def handle_feature_alert_events(
     annotated_frame,
     feature_result,
     track_bbox_map: Dict[int, Any] | None = None,
+    alerts: List[Dict[str, Any]] | None = None,
+    metrics: Dict[str, Any] | None = None,
 ) -> None:
-    alerts = getattr(feature_result, "alerts", None) or []
+    """Persist image/data/status files and a CSV row for each alert.
+
+    Callers that already hold ``feature_result.alerts``/``.metrics`` can pass
+    them in to skip re-reading the attributes.
+    """
+    if alerts is None:
+        alerts = getattr(feature_result, "alerts", None)
     if not alerts:
         return
 
-    metrics: Dict[str, Any] = getattr(feature_result, "metrics", {}) or {}
+    if metrics is None:
+        metrics = getattr(feature_result, "metrics", None)
+    metrics = metrics or {}
     feature_name = str(metrics.get("feature") or getattr(feature_result, "feature_type", "unknown"))
-    source_name = _source_name_from_input(engine)
-    config_name = str(getattr(engine.config, "config_name", "default") or "default")
+    source_name = getattr(engine, "_cached_source_name", None) or _source_name_from_input(engine)
+    config_name = getattr(engine, "_cached_config_name", None) or str(
+        getattr(engine.config, "config_name", "default") or "default"
+    )
+    # Files and CSV rows for every alert in this frame go to the writer as one batch.
+    pending_writes: List[Tuple[str, Any, str]] = []
+    csv_rows: List[Tuple[str, ...]] = []
+    deferred = getattr(engine, "_event_writer", None) is not None
+    image_dir_str = getattr(engine, "_image_dir_str", None) or str(engine.image_dir) + os.sep
+    data_dir_str = getattr(engine, "_data_dir_str", None) or str(engine.data_dir) + os.sep
+    status_dir_str = getattr(engine, "_status_dir_str", None) or str(engine.status_dir) + os.sep
+    feature_token = _safe_token(feature_name)
+    event_metrics = {
+        key: value for key, value in metrics.items() if key not in _EVENT_METRICS_EXCLUDED_KEYS
+    }
+    cctv_id = getattr(engine.config, "cctv_id", "")
+    status_enabled = bool(getattr(engine, "_event_status_enabled", False))
+    full_snapshot = None
 
     for alert in alerts:
         if not isinstance(alert, dict):
@@ -250,17 +438,14 @@ def handle_feature_alert_events(
             engine._event_counter += 1
 
             warning_label = _safe_token(str(alert.get("type", "warning")).lower())
-            image_id = (
-                f"{frame_idx:06d}_{engine._event_counter:04d}_"
-                f"{_safe_token(feature_name)}_{warning_label}"
-            )
+            image_id = f"{frame_idx:06d}_{engine._event_counter:04d}_{feature_token}_{warning_label}"
 
-            image_rel = f"image/{image_id}.jpg"
-            data_rel = f"data/{image_id}.json"
+            image_rel = "image/" + image_id + ".jpg"
+            data_rel = "data/" + image_id + ".json"
 
-            image_path = engine.image_dir / f"{image_id}.jpg"
-            data_path = engine.data_dir / f"{image_id}.json"
-            status_path = engine.status_dir / f"{image_id}.json"
+            image_path = image_dir_str + image_id + ".jpg"
+            data_path = data_dir_str + image_id + ".json"
+            status_path = status_dir_str + image_id + ".json"
 
             track_id_raw = alert.get("track_id")
             track_id = None
@@ -271,12 +456,15 @@ def handle_feature_alert_events(
                     track_id = None
 
             cropped = _resolve_track_crop(frame, track_bbox_map, track_id)
-            capture_frame = cropped if cropped is not None else annotated_frame
-
-            try:
-                cv2.imwrite(str(image_path), capture_frame)
-            except Exception as exc:
-                engine.logger.warning(f"Failed to save alert image {image_path}: {exc}")
+            if cropped is not None:
+                capture_frame = _prepare_snapshot(cropped, deferred)
+            else:
+                # Alerts without a track crop share one full-frame snapshot,
+                # which the writer encodes once for all of them.
+                if full_snapshot is None:
+                    full_snapshot = _prepare_snapshot(annotated_frame, deferred)
+                capture_frame = full_snapshot
+            pending_writes.append((image_path, capture_frame, "alert image"))
 
             event_payload: Dict[str, Any] = {
                 "image_id": image_id,
@@ -287,21 +475,20 @@ def handle_feature_alert_events(
                 "warning": str(alert.get("type", "warning")),
                 "frame_idx": frame_idx,
                 "track_id": track_id,
-                "cctv_id": getattr(engine.config, "cctv_id", ""),
+                "cctv_id": cctv_id,
                 "alert": alert,
-                "metrics": metrics,
+                "metrics": event_metrics,
                 "image_path": image_rel,
             }
 
+            # Serialize now: alert and metrics dicts are mutated by later frames.
             try:
-                data_path.write_text(
-                    json.dumps(event_payload, ensure_ascii=False, indent=2),
-                    encoding="utf-8",
-                )
+                data_bytes = json_dumps_bytes(event_payload)
+                pending_writes.append((data_path, data_bytes, "alert data"))
             except Exception as exc:
-                engine.logger.warning(f"Failed to write alert data {data_path}: {exc}")
+                engine.logger.warning("Failed to write alert data %s: %s", data_path, exc)
 
-            if bool(getattr(engine, "_event_status_enabled", False)):
+            if status_enabled:
                 status_payload: Dict[str, Any] = {
                     "image_id": image_id,
                     "timestamp": ts,
@@ -312,27 +499,17 @@ def handle_feature_alert_events(
                     "sent_to_dashboard": False,
                 }
                 try:
-                    status_path.write_text(
-                        json.dumps(status_payload, ensure_ascii=False, indent=2),
-                        encoding="utf-8",
-                    )
+                    status_bytes = json_dumps_bytes(status_payload)
+                    pending_writes.append((status_path, status_bytes, "status file"))
                 except Exception as exc:
-                    engine.logger.warning(f"Failed to write status file {status_path}: {exc}")
-            elif status_path.exists():
+                    engine.logger.warning("Failed to write status file %s: %s", status_path, exc)
+            elif os.path.exists(status_path):
                 try:
-                    status_path.unlink()
+                    os.unlink(status_path)
                 except Exception:
                     pass
 
-            _append_event_csv_row(
-                engine=engine,
-                image_id=image_id,
-                timestamp=ts,
-                feature_name=feature_name,
-                warning_label=warning_label,
-                data_rel=data_rel,
-                image_rel=image_rel,
-            )
+            csv_rows.append((image_id, ts, feature_name, warning_label, data_rel, image_rel))
 
             engine.logger.info(
                 "ALERT_EVENT feature=%s warning=%s track_id=%s image=%s",
@@ -343,7 +520,9 @@ def handle_feature_alert_events(
             )
 
         except Exception as exc:
-            engine.logger.warning(f"Error while handling feature alert event: {exc}")
+            engine.logger.warning("Error while handling feature alert event: %s", exc)
+
+    _submit_event_batch(engine, pending_writes, csv_rows)
 
 
 def _initialize_rtsp(engine) -> None:
@@ -464,21 +643,59 @@ def cleanup_engine(engine) -> None:
             engine.logger.warning(f"Error while stopping RTSP pusher: {exc}")
 
     if engine.video_reader:
-        engine.video_reader.close()
+        prefetcher = getattr(engine, "_frame_prefetcher", None)
+        if prefetcher is not None and prefetcher.is_alive:
+            # Closing under a read still in progress on that thread would release
+            # the capture mid-read; the reader stops itself once the read returns.
+            engine.logger.warning("Frame reader thread still running; not closing video reader")
+        else:
+            engine.video_reader.close()
+
+    if getattr(engine, "alert_manager", None) is not None:
+        engine.alert_manager.close()
+
+    event_writer = getattr(engine, "_event_writer", None)
+    if event_writer is not None:
+        event_writer.close()
+        engine._event_writer = None
+        if event_writer.dropped:
+            engine.logger.warning(
+                "Event writer dropped %s alert batch(es) while its queue was full",
+                event_writer.dropped,
+            )
+
+    data_csv_file = getattr(engine, "_data_csv_file", None)
+    if data_csv_file is not None:
+        engine._data_csv_file = None
+        try:
+            data_csv_file.close()
+        except OSError as exc:
+            # Closing flushes the last batch of rows, which can fail (e.g. disk full).
+            engine.logger.warning(f"Failed to close data CSV {engine.data_csv_path}: {exc}")
 
     save_annotations = (
         _flag_enabled(engine.config.output.save_annotations) if engine.config.output else False
     )
-    if save_annotations:
+    analytics_engine = getattr(engine, "analytics_engine", None)
+    if getattr(engine, "_export_debug_artifacts", False) and analytics_engine is not None:
+        try:
+            exported = analytics_engine.export_summaries(str(engine.output_dir / "analytics"))
+            engine.logger.info(f"Analytics artifacts: {exported}")
+        except Exception as exc:
+            engine.logger.warning(f"Failed to export analytics artifacts: {exc}")
+    elif save_annotations:
         engine.logger.info("Skipping debug artifact exports to keep minimal output layout")
 
-    total_time = time.time() - engine.start_time
+    total_time = time.monotonic() - engine.start_time
     engine.logger.info("=" * 70)
     if getattr(engine, "_stop_requested", False):
         engine.logger.info("Processing stopped gracefully (interrupted)")
     else:
         engine.logger.info("Processing completed!")
     engine.logger.info(f"Frames processed: {engine.frame_count}")
+    prefetcher = getattr(engine, "_frame_prefetcher", None)
+    if prefetcher is not None and prefetcher.dropped:
+        engine.logger.info(f"Frames dropped (stale live frames): {prefetcher.dropped}")
     engine.logger.info(f"Total time: {total_time:.2f} seconds")
     engine.logger.info(f"Average FPS: {engine.frame_count / total_time:.2f}")
     engine.logger.info(f"Output directory: {engine.output_dir}")
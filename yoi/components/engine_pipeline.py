@@ -0,0 +1,303 @@
+"""Background pipeline stages for VisionEngine.
+
+Frame decode and annotated-frame output (RTSP push / video encode) run on
+daemon threads connected to the engine loop by bounded queues, so decoding
+frame N+1 and pushing frame N-1 overlap inference of frame N. Alert event
+files are written by a further daemon thread. Inference, tracking and
+feature state stay on the engine thread and need no locks.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+_END = object()
+_POLL_SECONDS = 0.1
+
+
+class FramePrefetcher:
+    """Drain a frame generator on a daemon thread into a bounded queue.
+
+    With ``latest_only`` the consumer always receives the newest queued frame
+    and older ones are dropped, keeping live streams at the live edge. The
+    reader then never blocks on a full queue either: it evicts the oldest
+    queued frame, so the capture keeps draining while the engine is busy.
+    """
+
+    def __init__(
+        self,
+        frames: Iterator[Tuple[int, Any]],
+        maxsize: int,
+        should_stop: Optional[Callable[[], bool]] = None,
+        name: str = "yoi-frame-reader",
+        latest_only: bool = False,
+    ):
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, maxsize))
+        # Separate counters so the reader and consumer threads never share a +=.
+        self._evicted = 0
+        self._skipped = 0
+        self._frames = frames
+        self._should_stop = should_stop or (lambda: False)
+        self._latest_only = latest_only
+        self._closed = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def dropped(self) -> int:
+        """Frames discarded to stay at the live edge (``latest_only`` mode)."""
+        return self._evicted + self._skipped
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether the reader thread is still running (e.g. after a close timeout)."""
+        return self._thread.is_alive()
+
+    @property
+    def fill_ratio(self) -> float:
+        """Fraction of the prefetch queue currently occupied (0.0 - 1.0)."""
+        return self.queue.qsize() / self.queue.maxsize
+
+    def _put(self, item: Any) -> bool:
+        # Bounded put that gives up once the stage is closed or a stop is requested.
+        while not self._closed.is_set() and not self._should_stop():
+            if self._latest_only:
+                try:
+                    self.queue.put_nowait(item)
+                    return True
+                except queue.Full:
+                    self._evict_oldest()
+                    continue
+            try:
+                self.queue.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _evict_oldest(self) -> None:
+        # Only the reader thread puts, so the queue holds frames, never _END.
+        try:
+            self.queue.get_nowait()
+        except queue.Empty:
+            return
+        self._evicted += 1
+
+    def _run(self) -> None:
+        try:
+            for item in self._frames:
+                if not self._put(item):
+                    break
+        except Exception as exc:
+            self._error = exc
+        finally:
+            close = getattr(self._frames, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+            self._put(_END)
+
+    def _drain_to_latest(self, item: Any) -> Tuple[Any, bool]:
+        # Swap item for the newest queued frame; report whether the end was seen.
+        while True:
+            try:
+                newer = self.queue.get_nowait()
+            except queue.Empty:
+                return item, False
+            if newer is _END:
+                return item, True
+            self._skipped += 1
+            item = newer
+
+    def __iter__(self) -> Iterator[Tuple[int, Any]]:
+        while True:
+            try:
+                item = self.queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if self._should_stop():
+                    return
+                continue
+            if item is _END:
+                break
+            if self._latest_only:
+                item, ended = self._drain_to_latest(item)
+                yield item
+                if ended:
+                    break
+                continue
+            yield item
+        if self._error is not None:
+            raise self._error
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop prefetching and wait briefly for the reader thread to exit."""
+        self._closed.set()
+        self._thread.join(timeout=timeout)
+
+
+class OrderedWorker:
+    """Run a handler over submitted items, in order, on a daemon thread.
+
+    submit() blocks when the queue is full, giving back-pressure to the engine
+    loop instead of letting a stalled output grow memory without bound. The
+    first handler error is kept and re-raised on the engine thread.
+    """
+
+    def __init__(self, handler: Callable[[Any], None], maxsize: int, name: str):
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, maxsize))
+        self._handler = handler
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is _END:
+                return
+            if self._error is not None:
+                # Keep draining so submit() never blocks on a failed stage.
+                continue
+            try:
+                self._handler(item)
+            except Exception as exc:
+                self._error = exc
+
+    def submit(self, item: Any) -> None:
+        if self._error is not None:
+            raise self._error
+        self.queue.put(item)
+
+    def close(self, raise_error: bool = True) -> None:
+        """Flush queued items and stop the worker thread."""
+        if not self._closed:
+            self._closed = True
+            self.queue.put(_END)
+            self._thread.join()
+        if raise_error and self._error is not None:
+            raise self._error
+
+
+class EventWriter:
+    """Run a handler over submitted items on a daemon thread, dropping when full.
+
+    Unlike OrderedWorker, submit() never blocks: alert side effects (snapshot
+    encode, JSON and CSV writes) must not stall the engine loop, so items are
+    dropped and counted once ``maxsize`` are pending. Handler errors are
+    counted and do not stop the worker.
+    """
+
+    def __init__(self, handler: Callable[[Any], None], maxsize: int, name: str):
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, maxsize))
+        self.dropped = 0
+        self.errors = 0
+        self._handler = handler
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is _END:
+                return
+            try:
+                self._handler(item)
+            except Exception:
+                self.errors += 1
+
+    def submit(self, item: Any) -> bool:
+        """Queue item for the worker; return False if it was dropped."""
+        if self._closed:
+            return False
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def close(self) -> None:
+        """Write out queued items and stop the worker thread."""
+        if not self._closed:
+            self._closed = True
+            self.queue.put(_END)
+            self._thread.join()
+
+
+class AdaptiveSkipper:
+    """Adjust the inference stride from pipeline back-pressure.
+
+    The stride grows by one while the engine is busy (prefetch queue above
+    ``busy_ratio`` or, without a queue, inference slower than the frame
+    interval) and shrinks by one after ``idle_seconds`` of a drained queue.
+    It always stays within ``[min_stride, max_stride]``.
+    """
+
+    def __init__(
+        self,
+        min_stride: int,
+        max_stride: int,
+        *,
+        busy_ratio: float = 0.75,
+        idle_ratio: float = 0.25,
+        idle_seconds: float = 2.0,
+        logger: Any = None,
+    ):
+        self.min_stride = max(1, min_stride)
+        self.max_stride = max(self.min_stride, max_stride)
+        self.stride = self.min_stride
+        self._busy_ratio = busy_ratio
+        self._idle_ratio = idle_ratio
+        self._idle_seconds = idle_seconds
+        self._idle_since: Optional[float] = None
+        self._logger = logger
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_stride > self.min_stride
+
+    def update(
+        self,
+        now: float,
+        fill_ratio: Optional[float] = None,
+        infer_seconds: Optional[float] = None,
+        frame_interval: Optional[float] = None,
+    ) -> int:
+        """Feed one back-pressure sample and return the stride to use."""
+        if fill_ratio is not None:
+            busy = fill_ratio > self._busy_ratio
+            idle = fill_ratio <= self._idle_ratio
+        elif infer_seconds is not None and frame_interval:
+            busy = infer_seconds > frame_interval
+            idle = infer_seconds <= frame_interval * 0.5
+        else:
+            return self.stride
+
+        if busy:
+            self._idle_since = None
+            if self.stride < self.max_stride:
+                self._set_stride(self.stride + 1, "pipeline busy")
+        elif idle:
+            if self._idle_since is None:
+                self._idle_since = now
+            elif now - self._idle_since >= self._idle_seconds and self.stride > self.min_stride:
+                self._idle_since = now
+                self._set_stride(self.stride - 1, "pipeline idle")
+        else:
+            self._idle_since = None
+        return self.stride
+
+    def _set_stride(self, stride: int, reason: str) -> None:
+        if self._logger is not None:
+            self._logger.warning(
+                "Adaptive frame-skip: inference every %s -> %s frame(s) (%s)",
+                self.stride,
+                stride,
+                reason,
+            )
+        self.stride = stride
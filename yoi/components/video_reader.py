@@ -1,5 +1,8 @@
 """Video readers for files and RTSP streams."""
 
+import os
+import subprocess
+import threading
 import time
 from abc import ABC, abstractmethod
 from pathlib import Path
@@ -10,6 +13,39 @@ import numpy as np
 
 from yoi.utils.logger import logger_service
 
+# RTSP reconnect backoff: min(cap, base * 2**attempts); give up after max attempts.
+_RECONNECT_BACKOFF_BASE_S = 0.25
+_RECONNECT_BACKOFF_CAP_S = 8.0
+_RECONNECT_MAX_ATTEMPTS = 10
+
+
+class _ReconnectBackoff:
+    """Exponential reconnect delays for a live source, with a give-up limit."""
+
+    def __init__(
+        self,
+        base: float = _RECONNECT_BACKOFF_BASE_S,
+        cap: float = _RECONNECT_BACKOFF_CAP_S,
+        max_attempts: int = _RECONNECT_MAX_ATTEMPTS,
+    ):
+        self.base = base
+        self.cap = cap
+        self.max_attempts = max_attempts
+        self.attempts = 0
+        self.gave_up = False
+
+    def next_delay(self) -> Optional[float]:
+        """Return the delay before the next reconnect, or None once exhausted."""
+        if self.attempts >= self.max_attempts:
+            self.gave_up = True
+            return None
+        delay = min(self.cap, self.base * (1 << self.attempts))
+        self.attempts += 1
+        return delay
+
+    def reset(self) -> None:
+        self.attempts = 0
+
 
 class BaseVideoReader(ABC):
     """Abstract base class for video readers."""
@@ -100,14 +136,95 @@ class FileVideoReader(BaseVideoReader):
         return bool(ok)
 
 
-class RTSPVideoReader(BaseVideoReader):
-    """Video reader for RTSP streams."""
+class CachedLoopFileVideoReader(FileVideoReader):
+    """File reader that replays looped playback from memory.
+
+    The first pass decodes normally and copies each frame into a preallocated
+    ``(N, H, W, 3)`` array. Later passes serve copies from that array instead
+    of seeking and re-decoding. Files whose frames exceed ``cache_mb`` fall
+    back to FileVideoReader's seek-based rewind.
+    """
+
+    def __init__(self, file_path: str, max_fps: Optional[int] = None, cache_mb: int = 512):
+        super().__init__(file_path, max_fps)
+        self._cache: Optional[np.ndarray] = None
+        self._cached_frames = 0
+        self._cache_idx = 0
+        self._replaying = False
+
+        cache_bytes = self._frame_count * self._width * self._height * 3
+        if 0 < cache_bytes <= cache_mb * 1024 * 1024:
+            self._cache = np.empty(
+                (self._frame_count, self._height, self._width, 3), dtype=np.uint8
+            )
+            self.logger.info(
+                f"Loop frame cache enabled: {self._frame_count} frames "
+                f"({cache_bytes / (1024 * 1024):.1f} MB)"
+            )
+        else:
+            self.logger.info(
+                f"Loop frame cache disabled: {self.file_path.name} needs "
+                f"{cache_bytes / (1024 * 1024):.1f} MB (limit {cache_mb} MB)"
+            )
+
+    def _drop_cache(self, reason: str) -> None:
+        self.logger.info(f"Loop frame cache disabled: {reason}")
+        self._cache = None
+        self._cached_frames = 0
+
+    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Read a frame from the file, or from the cache once replaying."""
+        if self._replaying:
+            if self._cache_idx >= self._cached_frames:
+                return False, None
+            # Copy so downstream in-place drawing never touches the cache.
+            frame = self._cache[self._cache_idx].copy()
+            self._cache_idx += 1
+            self.current_frame_idx += 1
+            return True, frame
+
+        ret, frame = super().read_frame()
+        if ret and self._cache is not None:
+            if self._cached_frames < len(self._cache) and frame.shape == self._cache.shape[1:]:
+                self._cache[self._cached_frames] = frame
+                self._cached_frames += 1
+            else:
+                self._drop_cache("frame count or size differs from container metadata")
+        return ret, frame
+
+    def rewind(self) -> bool:
+        """Rewind to the first frame, replaying from the cache when filled."""
+        if self._replaying or (self._cache is not None and self._cached_frames):
+            if not self._replaying:
+                self._replaying = True
+                # Every frame is in memory now; the decoder is no longer needed.
+                self.cap.release()
+            self._cache_idx = 0
+            self.current_frame_idx = 0
+            return True
+        return super().rewind()
+
 
-    def __init__(self, rtsp_url: str, max_fps: Optional[int] = None, buffer_size: int = 1):
+class RTSPVideoReader(BaseVideoReader):
+    """Video reader for RTSP streams.
+
+    Reconnect backoff waits on ``stop_event`` (the engine's stop event when
+    given), which close() also sets, so a stop cuts the wait short and no
+    capture is reopened after close.
+    """
+
+    def __init__(
+        self,
+        rtsp_url: str,
+        max_fps: Optional[int] = None,
+        buffer_size: int = 1,
+        stop_event: Optional[threading.Event] = None,
+    ):
         self.rtsp_url = rtsp_url
         self.max_fps = max_fps
         self.buffer_size = buffer_size
         self.logger = logger_service.get_rtsp_logger()
+        self._stop_event = stop_event if stop_event is not None else threading.Event()
 
         if not rtsp_url.startswith("rtsp://"):
             raise ValueError(f"Invalid RTSP URL: {rtsp_url}")
@@ -130,30 +247,54 @@ class RTSPVideoReader(BaseVideoReader):
         self.current_frame_idx = 0
         self.last_read_time = time.time()
 
+        self._backoff = _ReconnectBackoff()
+
         self.logger.info(
             f"RTSP CONNECTED: {rtsp_url} ({self._width}x{self._height}) @ {self._fps} FPS"
         )
 
     def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
-        """Read a frame from RTSP stream."""
+        """Read a frame from RTSP stream.
+
+        A failed read keeps reconnecting with exponential backoff until a
+        frame arrives. After ``_RECONNECT_MAX_ATTEMPTS`` consecutive failed
+        reconnects the reader gives up and returns ``(False, None)`` from then
+        on, which ends the frame generator. A set stop event ends it early.
+        """
+        if self._backoff.gave_up or self._stop_event.is_set():
+            return False, None
+
         ret, frame = self.cap.read()
-        if ret:
-            self.current_frame_idx += 1
-            self.last_read_time = time.time()
-        else:
+        while not ret:
+            delay = self._backoff.next_delay()
+            if delay is None:
+                self.logger.error(
+                    f"RTSP GIVING UP: {self.rtsp_url} after "
+                    f"{self._backoff.attempts} failed reconnects"
+                )
+                return False, None
             self.logger.warning("Failed to read frame, attempting reconnect...")
-            self._reconnect()
+            if not self._reconnect(delay):
+                return False, None
             ret, frame = self.cap.read()
 
+        self._backoff.reset()
+        self.current_frame_idx += 1
+        self.last_read_time = time.time()
         return ret, frame
 
-    def _reconnect(self):
-        """Reconnect to RTSP stream."""
-        self.logger.info("RTSP RECONNECT: releasing and reopening stream")
+    def _reconnect(self, delay: float) -> bool:
+        """Reopen the RTSP stream after a backoff delay; False if stopped meanwhile."""
+        self.logger.info(
+            f"RTSP RECONNECT: releasing and reopening stream in {delay:.2f}s "
+            f"(attempt {self._backoff.attempts}/{self._backoff.max_attempts})"
+        )
         self.cap.release()
-        time.sleep(1)
+        if self._stop_event.wait(delay):
+            return False
         self.cap = cv2.VideoCapture(self.rtsp_url, cv2.CAP_FFMPEG)
         self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        return True
 
     def get_fps(self) -> float:
         return self._fps
@@ -168,30 +309,232 @@ class RTSPVideoReader(BaseVideoReader):
         return (self._width, self._height)
 
     def close(self):
+        self._stop_event.set()
         if self.cap:
             self.cap.release()
 
 
+class FFmpegRTSPReader(BaseVideoReader):
+    """RTSP reader that decodes with an FFmpeg subprocess.
+
+    FFmpeg decodes the stream (hardware decode via ``-hwaccel``, see
+    YOI_FFMPEG_HWACCEL) and writes raw BGR frames to stdout. Each frame is
+    read straight into a fresh ndarray, with no intermediate bytes copy.
+    Decoder errors from stderr go to the RTSP logger, and a dead decoder is
+    restarted with the same backoff, give-up and stop-event handling as
+    RTSPVideoReader.
+    """
+
+    def __init__(
+        self,
+        rtsp_url: str,
+        max_fps: Optional[int] = None,
+        hwaccel: str = "auto",
+        stop_event: Optional[threading.Event] = None,
+    ):
+        self.rtsp_url = rtsp_url
+        self.max_fps = max_fps
+        self.hwaccel = hwaccel
+        self.logger = logger_service.get_rtsp_logger()
+        self._stop_event = stop_event if stop_event is not None else threading.Event()
+
+        if not rtsp_url.startswith("rtsp://"):
+            raise ValueError(f"Invalid RTSP URL: {rtsp_url}")
+
+        self.logger.info(f"RTSP CONNECTING (ffmpeg, hwaccel={hwaccel}): {rtsp_url}")
+        self._width, self._height, self._fps = self._probe_stream()
+        self._frame_shape = (self._height, self._width, 3)
+        self._frame_bytes = self._width * self._height * 3
+        self.proc: Optional[subprocess.Popen] = None
+        self._stderr_thread: Optional[threading.Thread] = None
+        self._backoff = _ReconnectBackoff()
+        self._start_process()
+
+        self.current_frame_idx = 0
+        self.logger.info(
+            f"RTSP CONNECTED (ffmpeg): {rtsp_url} ({self._width}x{self._height}) @ {self._fps} FPS"
+        )
+
+    def _probe_stream(self) -> Tuple[int, int, float]:
+        command = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-rtsp_transport",
+            "tcp",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "stream=width,height,avg_frame_rate",
+            "-of",
+            "csv=p=0",
+            self.rtsp_url,
+        ]
+        try:
+            output = subprocess.run(
+                command, capture_output=True, text=True, timeout=15, check=True
+            ).stdout
+            width, height, rate = output.strip().splitlines()[0].split(",")[:3]
+            num, _, den = rate.partition("/")
+            fps = float(num) / float(den or 1) if float(den or 1) else 0.0
+            return int(width), int(height), fps if fps > 0 else 30
+        except Exception as exc:
+            self.logger.error(f"RTSP CONNECT FAILED: {self.rtsp_url} (ffprobe: {exc})")
+            raise RuntimeError(f"Cannot probe RTSP stream: {self.rtsp_url}") from exc
+
+    def _start_process(self) -> None:
+        command = ["ffmpeg", "-loglevel", "error", "-rtsp_transport", "tcp"]
+        if self.hwaccel and self.hwaccel != "none":
+            command += ["-hwaccel", self.hwaccel]
+        command += ["-i", self.rtsp_url, "-an", "-f", "rawvideo", "-pix_fmt", "bgr24", "-"]
+        self.proc = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=self._frame_bytes,
+        )
+        self._stderr_thread = threading.Thread(
+            target=self._drain_stderr,
+            args=(self.proc,),
+            name="yoi-ffmpeg-reader-stderr",
+            daemon=True,
+        )
+        self._stderr_thread.start()
+
+    def _drain_stderr(self, proc: subprocess.Popen) -> None:
+        # ffmpeg runs with -loglevel error, so every line is a decode/hwaccel error.
+        try:
+            for line in iter(proc.stderr.readline, b""):
+                self.logger.warning(
+                    "FFmpeg decoder: %s", line.decode("utf-8", errors="replace").rstrip()
+                )
+        except Exception as exc:
+            self.logger.debug(f"Error reading FFmpeg decoder stderr: {exc}")
+        finally:
+            proc.stderr.close()
+
+    def _stop_process(self) -> None:
+        if self.proc is None:
+            return
+        self.proc.kill()
+        self.proc.wait()
+        if self.proc.stdout:
+            self.proc.stdout.close()
+        if self._stderr_thread is not None:
+            self._stderr_thread.join(timeout=1.0)
+            self._stderr_thread = None
+        self.proc = None
+
+    def _restart_process(self, delay: float) -> bool:
+        """Restart the decoder after a backoff delay; False if stopped meanwhile."""
+        self.logger.info(
+            f"RTSP RECONNECT (ffmpeg): restarting decoder in {delay:.2f}s "
+            f"(attempt {self._backoff.attempts}/{self._backoff.max_attempts})"
+        )
+        self._stop_process()
+        if self._stop_event.wait(delay):
+            return False
+        try:
+            self._start_process()
+        except OSError as exc:
+            # e.g. the ffmpeg binary went missing; counts as a failed attempt.
+            self.logger.error(f"RTSP DECODER START FAILED: {exc}")
+        return True
+
+    def _read_raw_frame(self) -> Optional[np.ndarray]:
+        if self.proc is None or self.proc.stdout is None:
+            return None
+        frame = np.empty(self._frame_shape, dtype=np.uint8)
+        view = memoryview(frame).cast("B")
+        filled = 0
+        while filled < self._frame_bytes:
+            count = self.proc.stdout.readinto(view[filled:])
+            if not count:
+                return None
+            filled += count
+        return frame
+
+    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Read a frame from the FFmpeg decoder, restarting it with backoff."""
+        if self._backoff.gave_up or self._stop_event.is_set():
+            return False, None
+
+        frame = self._read_raw_frame()
+        while frame is None:
+            delay = self._backoff.next_delay()
+            if delay is None:
+                self.logger.error(
+                    f"RTSP GIVING UP: {self.rtsp_url} after "
+                    f"{self._backoff.attempts} failed decoder restarts"
+                )
+                self._stop_process()
+                return False, None
+            self.logger.warning("Failed to read frame from ffmpeg, restarting decoder...")
+            if not self._restart_process(delay):
+                return False, None
+            frame = self._read_raw_frame()
+
+        self._backoff.reset()
+        self.current_frame_idx += 1
+        return True, frame
+
+    def get_fps(self) -> float:
+        return self._fps
+
+    def get_current_frame_idx(self) -> int:
+        return self.current_frame_idx
+
+    def get_frame_count(self) -> int:
+        return -1
+
+    def get_frame_size(self) -> Tuple[int, int]:
+        return (self._width, self._height)
+
+    def close(self):
+        self._stop_event.set()
+        self._stop_process()
+
+
 class VideoReader:
     """Factory class for video readers."""
 
     @staticmethod
-    def create(source: str, max_fps: Optional[int] = None, buffer_size: int = 1) -> BaseVideoReader:
+    def create(
+        source: str,
+        max_fps: Optional[int] = None,
+        buffer_size: int = 1,
+        loop_cache_mb: int = 0,
+        stop_event: Optional[threading.Event] = None,
+    ) -> BaseVideoReader:
         """
         Create a video reader based on source type.
 
         Args:
             source: File path or RTSP URL
             max_fps: Max FPS for processing
-            buffer_size: Buffer size for RTSP
+            buffer_size: Buffer size for RTSP (OpenCV reader only)
+            loop_cache_mb: Memory budget for caching looped file playback
+                (0 disables the cache)
+            stop_event: Event that cuts RTSP reconnect backoff short
+
+        RTSP sources use FFmpegRTSPReader instead of OpenCV when
+        YOI_USE_HWDECODE is enabled.
 
         Returns:
             Appropriate video reader instance
         """
         if source.startswith("rtsp://"):
-            return RTSPVideoReader(source, max_fps, buffer_size)
-        else:
-            return FileVideoReader(source, max_fps)
+            use_ffmpeg = os.getenv("YOI_USE_HWDECODE", "0").strip().lower()
+            if use_ffmpeg in {"1", "true", "on", "yes"}:
+                hwaccel = os.getenv("YOI_FFMPEG_HWACCEL", "").strip() or "auto"
+                return FFmpegRTSPReader(
+                    source, max_fps, hwaccel=hwaccel, stop_event=stop_event
+                )
+            return RTSPVideoReader(source, max_fps, buffer_size, stop_event=stop_event)
+        if loop_cache_mb > 0:
+            return CachedLoopFileVideoReader(source, max_fps, cache_mb=loop_cache_mb)
+        return FileVideoReader(source, max_fps)
 
     @staticmethod
     def create_frame_generator(
@@ -203,12 +546,15 @@ class VideoReader:
         Args:
             reader: Video reader instance
             max_fps: Max FPS for processing
+            loop_file: Rewind file sources at end of stream
 
         Yields:
             Tuple of (frame_idx, frame)
         """
-        frame_delay = 1.0 / max_fps if max_fps else 0
-        last_frame_time = time.time()
+        # Frames are released on a fixed monotonic schedule, so sleep overshoot
+        # does not accumulate as drift.
+        interval_ns = int(1e9 / max_fps) if max_fps else 0
+        deadline_ns = time.monotonic_ns()
 
         frame_idx = 0
         while True:
@@ -218,11 +564,15 @@ class VideoReader:
                     continue
                 break
 
-            if frame_delay > 0:
-                elapsed = time.time() - last_frame_time
-                if elapsed < frame_delay:
-                    time.sleep(frame_delay - elapsed)
+            if interval_ns:
+                now_ns = time.monotonic_ns()
+                if now_ns < deadline_ns:
+                    time.sleep((deadline_ns - now_ns) / 1e9)
+                elif now_ns - deadline_ns > 2 * interval_ns:
+                    # Fell well behind (slow consumer): restart the schedule
+                    # instead of bursting frames to catch up.
+                    deadline_ns = now_ns
+                deadline_ns += interval_ns
 
             yield frame_idx, frame
             frame_idx += 1
-            last_frame_time = time.time()
@@ -4,13 +4,34 @@ Mendukung YAML, JSON, dan programmatic configuration
 Supports full complex config structure with features, lines, regions, etc.
 """
 
+import copy
 import json
+import os
 from dataclasses import asdict, dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import yaml
 
+# Prefer the libyaml-backed loader/dumper when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Top-level sections the engine cannot run without (model/feature have defaults).
+_REQUIRED_SECTIONS = ("input",)
+
+# Expected types for the model section, checked once at load so engine code
+# can use config.model fields without per-access guards. None means "unset".
+_MODEL_FIELD_TYPES: Dict[str, Tuple[type, ...]] = {
+    "name": (str,),
+    "device": (str, int),  # GPU index (0) or name ("cuda:0", "cpu")
+    "conf": (int, float),
+    "iou": (int, float),
+    "type": (str,),
+    "classes": (list,),
+}
+
 
 def _normalize_feature_name(value: Any) -> Optional[str]:
     """Normalize feature aliases from builder/user configs.
@@ -35,9 +56,36 @@ def _normalize_feature_name(value: Any) -> Optional[str]:
     return aliases.get(normalized, normalized)
 
 
-@dataclass
+@lru_cache(maxsize=32)
+def _load_yaml_document(resolved_path: str, mtime_ns: int, size: int) -> Any:
+    """Parse YAML file once per (path, mtime, size); stale entries miss automatically."""
+    return yaml.load(Path(resolved_path).read_text(encoding="utf-8"), Loader=_YAML_LOADER)
+
+
+def _check_model_section(raw_model: Dict[str, Any]) -> None:
+    """Validate model section value types against _MODEL_FIELD_TYPES."""
+    for key, expected in _MODEL_FIELD_TYPES.items():
+        value = raw_model.get(key)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, expected):
+            names = " or ".join(t.__name__ for t in expected)
+            raise ValueError(f"model.{key} must be {names}, got {type(value).__name__}: {value!r}")
+
+
+def _check_required_sections(data: Any, path: str) -> None:
+    """Reject malformed config files before building any dataclass."""
+    if not isinstance(data, dict):
+        raise ValueError(f"Config {path} must be a mapping, got {type(data).__name__}")
+
+    missing = [key for key in _REQUIRED_SECTIONS if not data.get(key)]
+    if missing:
+        raise ValueError(f"Config {path} is missing required section(s): {', '.join(missing)}")
+
+
+@dataclass(frozen=True)
 class CoordPoint:
-    """Single coordinate point (x, y)"""
+    """Single coordinate point (x, y) - immutable, safe to share across configs"""
 
     x: float
     y: float
@@ -101,7 +149,7 @@ class ModelConfig:
     """Konfigurasi YOLO model"""
 
     name: str = "yolov8n"
-    device: str = "cpu"  # cpu, cuda, mps
+    device: Union[str, int] = "cpu"  # cpu, cuda, mps, or a GPU index
     conf: float = 0.5
     iou: float = 0.7
     type: Optional[str] = None  # Model size: "small", "medium", dll.
@@ -365,8 +413,23 @@ class YOIConfig:
         return data
 
     def to_yaml_str(self) -> str:
-        """Convert ke YAML string"""
-        return yaml.dump(self.to_dict(), default_flow_style=False, allow_unicode=True)
+        """Convert ke YAML string (memoized selama isi config tidak berubah)"""
+        data = self.to_dict()
+        # Cache disimpan di __dict__ (bukan dataclass field) agar tidak ikut asdict().
+        # Dibandingkan per-isi karena config bisa dimutasi setelah load (runtime context).
+        cached = self.__dict__.get("_yaml_cache")
+        if cached is not None and cached[0] == data:
+            return cached[1]
+
+        yaml_str = yaml.dump(
+            data,
+            Dumper=_YAML_DUMPER,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+        )
+        self.__dict__["_yaml_cache"] = (data, yaml_str)
+        return yaml_str
 
     def to_json_str(self) -> str:
         """Convert ke JSON string"""
@@ -384,9 +447,13 @@ class YOIConfig:
 
     @classmethod
     def from_yaml(cls, path: str) -> "YOIConfig":
-        """Load dari YAML file"""
-        data = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
-        if isinstance(data, dict) and not data.get("config_name"):
+        """Load dari YAML file (parse di-cache per path + mtime)"""
+        stat = os.stat(path)
+        cached = _load_yaml_document(str(Path(path).resolve()), stat.st_mtime_ns, stat.st_size)
+        # _from_dict memodifikasi dict input, jadi setiap caller dapat salinan sendiri.
+        data = copy.deepcopy(cached)
+        _check_required_sections(data, path)
+        if not data.get("config_name"):
             data["config_name"] = Path(path).stem
         return cls._from_dict(data)
 
@@ -394,7 +461,8 @@ class YOIConfig:
     def from_json(cls, path: str) -> "YOIConfig":
         """Load dari JSON file"""
         data = json.loads(Path(path).read_text(encoding="utf-8"))
-        if isinstance(data, dict) and not data.get("config_name"):
+        _check_required_sections(data, path)
+        if not data.get("config_name"):
             data["config_name"] = Path(path).stem
         return cls._from_dict(data)
 
@@ -418,6 +486,7 @@ class YOIConfig:
             # Bentuk lain yang tidak dikenal, fallback ke kosong
             raw_model = {}
 
+        _check_model_section(raw_model)
         model_cfg = ModelConfig(
             **{k: v for k, v in raw_model.items() if k in ModelConfig.__dataclass_fields__}
         )
@@ -4,6 +4,7 @@ Wrapper for Ultralytics YOLO with optional metadata.yaml support.
 """
 
 import os
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -363,37 +364,10 @@ class YOLOInferencer:
             FrameInference object
         """
         try:
-            infer_kwargs = {
-                "conf": self.conf_threshold,
-                "iou": self.iou_threshold,
-                "verbose": False,
-                "device": self.device,
-            }
-            if self._imgsz is not None:
-                infer_kwargs["imgsz"] = self._imgsz
-            results = self.model(frame, **infer_kwargs)
-
+            results = self.model(frame, **self._infer_kwargs())
             detections = []
             for result in results:
-                if result.boxes is not None:
-                    for box_data in result.boxes:
-                        # Extract coordinates
-                        x1, y1, x2, y2 = box_data.xyxy[0].tolist()
-                        conf = float(box_data.conf[0])
-                        class_id = int(box_data.cls[0])
-                        class_name = self.class_names[class_id]
-
-                        # Filter by target classes
-                        if class_name not in self.target_classes:
-                            continue
-
-                        detection = Detection(
-                            box=[x1, y1, x2, y2],
-                            confidence=conf,
-                            class_id=class_id,
-                            class_name=class_name,
-                        )
-                        detections.append(detection)
+                detections.extend(self._result_detections(result))
 
             return FrameInference(frame_idx=0, detections=detections)
 
@@ -408,6 +382,43 @@ class YOLOInferencer:
                     return self.infer(frame)
             return FrameInference(frame_idx=0, detections=[])
 
+    def _infer_kwargs(self) -> Dict:
+        infer_kwargs = {
+            "conf": self.conf_threshold,
+            "iou": self.iou_threshold,
+            "verbose": False,
+            "device": self.device,
+        }
+        if self._imgsz is not None:
+            infer_kwargs["imgsz"] = self._imgsz
+        return infer_kwargs
+
+    def _result_detections(self, result) -> List[Detection]:
+        """Convert one ultralytics result into target-class detections."""
+        detections = []
+        if result.boxes is None:
+            return detections
+        for box_data in result.boxes:
+            # Extract coordinates
+            x1, y1, x2, y2 = box_data.xyxy[0].tolist()
+            conf = float(box_data.conf[0])
+            class_id = int(box_data.cls[0])
+            class_name = self.class_names[class_id]
+
+            # Filter by target classes
+            if class_name not in self.target_classes:
+                continue
+
+            detections.append(
+                Detection(
+                    box=[x1, y1, x2, y2],
+                    confidence=conf,
+                    class_id=class_id,
+                    class_name=class_name,
+                )
+            )
+        return detections
+
     def _should_try_cpu_fallback(self, error_message: str) -> bool:
         """Return True when runtime error indicates GPU binding/provider issue."""
         if self.strict_device:
@@ -443,17 +454,53 @@ class YOLOInferencer:
 
     def infer_batch(self, frames: List[np.ndarray]) -> List[FrameInference]:
         """
-        Run inference pada batch frames
+        Run inference pada batch frames dalam satu panggilan model
 
         Args:
             frames: List of frames
 
         Returns:
-            List of FrameInference objects
+            List of FrameInference objects (urutan sama dengan frames)
         """
+        if len(frames) > 1:
+            try:
+                results = self.model(list(frames), **self._infer_kwargs())
+                if len(results) == len(frames):
+                    return [
+                        FrameInference(frame_idx=idx, detections=self._result_detections(result))
+                        for idx, result in enumerate(results)
+                    ]
+                self.logger.warning(
+                    "Batch inference returned %s result(s) for %s frame(s)",
+                    len(results),
+                    len(frames),
+                )
+            except Exception as e:
+                self.logger.warning(f"Batch inference failed, falling back to per-frame: {e}")
+                if self.strict_device:
+                    raise
+
         results = []
         for idx, frame in enumerate(frames):
             result = self.infer(frame)
             result.frame_idx = idx
             results.append(result)
         return results
+
+    def warmup(self, frame_shape: Tuple[int, int, int] = (640, 640, 3), runs: int = 3) -> float:
+        """
+        Jalankan inference dummy beberapa kali agar frame pertama tidak menanggung
+        biaya cold-start (lazy model setup, cuDNN autotune, alokasi memori device).
+
+        Args:
+            frame_shape: Shape frame dummy (H, W, C), sebaiknya sama dengan stream
+            runs: Jumlah inference dummy
+
+        Returns:
+            Total durasi warm-up dalam detik
+        """
+        dummy = np.zeros(frame_shape, dtype=np.uint8)
+        start = time.perf_counter()
+        for _ in range(max(0, runs)):
+            self.infer(dummy)
+        return time.perf_counter() - start
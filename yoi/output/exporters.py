@@ -22,6 +22,10 @@ def _to_jsonable(value: Any) -> Any:
     if isinstance(value, (list, tuple, set)):
         return [_to_jsonable(item) for item in value]
 
+    to_dict = getattr(value, "to_dict", None)
+    if callable(to_dict):
+        return _to_jsonable(to_dict())
+
     if hasattr(value, "tolist"):
         try:
             return _to_jsonable(value.tolist())
@@ -84,15 +88,21 @@ class VideoWriter:
 class DataExporter:
     """Collect and export frame-level data produced by the engine."""
 
-    def __init__(self, output_dir: str):
+    def __init__(self, output_dir: str, enabled: bool = True):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._enabled = enabled
 
         self._frames: list[dict[str, Any]] = []
         self._json_path = self.output_dir / "detections.json"
         self._csv_path = self.output_dir / "detections.csv"
         self._log_path = self.output_dir / "processing.log"
 
+    @property
+    def is_active(self) -> bool:
+        """Whether collected frames will be exported; callers skip add_frame otherwise."""
+        return self._enabled
+
     def add_frame(
         self,
         frame_idx: int,
@@ -105,14 +115,23 @@ class DataExporter:
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "detections": _to_jsonable(detections),
             "tracked_objects": _to_jsonable(tracked_objects),
-            "analytics": _to_jsonable(analytics),
+            # Objects with to_dict() (FrameAnalytics) are immutable per frame and
+            # only serialized when an export is written.
+            "analytics": analytics
+            if callable(getattr(analytics, "to_dict", None))
+            else _to_jsonable(analytics),
         }
         self._frames.append(record)
 
+    def _materialized_frames(self) -> list[dict[str, Any]]:
+        for record in self._frames:
+            record["analytics"] = _to_jsonable(record["analytics"])
+        return self._frames
+
     def export_json(self) -> None:
         payload = {
             "total_frames": len(self._frames),
-            "frames": self._frames,
+            "frames": self._materialized_frames(),
         }
         self._json_path.write_text(
             json.dumps(payload, ensure_ascii=False, indent=2),
@@ -135,7 +154,7 @@ class DataExporter:
             )
             writer.writeheader()
 
-            for frame in self._frames:
+            for frame in self._materialized_frames():
                 detections = frame.get("detections") or []
                 tracked_objects = frame.get("tracked_objects") or []
                 writer.writerow(
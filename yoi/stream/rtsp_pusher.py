@@ -69,6 +69,10 @@ class RTSPPusher:
         self._stderr_thread: Optional[threading.Thread] = None
         self.last_startup_output: List[str] = []
         self._max_startup_lines = 200
+        # Reused target for frames that need resizing to the stream size.
+        self._resize_buf: Optional[np.ndarray] = None
+        flush_env = os.getenv("YOI_RTSP_FLUSH_EVERY_FRAME", "0").strip().lower()
+        self._flush_every_frame = flush_env in {"1", "true", "on", "yes"}
 
     def _build_ffmpeg_command(self) -> list:
         """
@@ -177,7 +181,7 @@ class RTSPPusher:
                             # Store limited recent startup output
                             if len(self.last_startup_output) < self._max_startup_lines:
                                 self.last_startup_output.append(decoded)
-                            logger.debug(f"FFmpeg: {decoded}")
+                            logger.debug("FFmpeg: %s", decoded)
                     except Exception as e:
                         logger.debug(f"Error reading FFmpeg stderr: {e}")
 
@@ -226,6 +230,16 @@ class RTSPPusher:
 
         return False
 
+    def _resize_to_stream(self, frame: np.ndarray) -> np.ndarray:
+        """Resize frame to the stream size into a reused buffer."""
+        shape = (self.config.height, self.config.width) + frame.shape[2:]
+        buf = self._resize_buf
+        if buf is None or buf.shape != shape or buf.dtype != frame.dtype:
+            buf = np.empty(shape, dtype=frame.dtype)
+            self._resize_buf = buf
+        cv2.resize(frame, (self.config.width, self.config.height), dst=buf)
+        return buf
+
     def push_frame(self, frame: np.ndarray) -> bool:
         """
         Push a single frame to RTSP stream
@@ -249,14 +263,12 @@ class RTSPPusher:
         try:
             # Resize frame if dimensions don't match config
             if frame.shape[1] != self.config.width or frame.shape[0] != self.config.height:
-                frame = cv2.resize(frame, (self.config.width, self.config.height))
+                frame = self._resize_to_stream(frame)
 
-            # Write frame to FFmpeg stdin
-            self.process.stdin.write(frame.tobytes())
+            # Write frame to FFmpeg stdin straight from the array's memory.
+            self.process.stdin.write(memoryview(np.ascontiguousarray(frame)).cast("B"))
             # Optional immediate flush; can reduce latency but may lower throughput.
-            flush_env = os.getenv("YOI_RTSP_FLUSH_EVERY_FRAME", "0").strip().lower()
-            flush_every_frame = flush_env in {"1", "true", "on", "yes"}
-            if flush_every_frame:
+            if self._flush_every_frame:
                 try:
                     self.process.stdin.flush()
                 except Exception:
@@ -265,9 +277,9 @@ class RTSPPusher:
 
             # Log early progress so we can see whether frames are being delivered
             if self.frame_count <= 5:
-                logger.info(f"Pushed initial frame {self.frame_count} to RTSP")
+                logger.info("Pushed initial frame %s to RTSP", self.frame_count)
             elif self.frame_count % 100 == 0:
-                logger.debug(f"Pushed {self.frame_count} frames to RTSP")
+                logger.debug("Pushed %s frames to RTSP", self.frame_count)
 
             return True
 
@@ -276,7 +288,7 @@ class RTSPPusher:
             self.is_running = False
             return False
         except Exception as e:
-            logger.error(f"Error pushing frame: {e}")
+            logger.error("Error pushing frame: %s", e)
             return False
 
     def stop(self):
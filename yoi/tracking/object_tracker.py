@@ -4,6 +4,7 @@ Uses ByteTrack when available, with automatic fallback to centroid matching.
 """
 
 import os
+from array import array
 from dataclasses import dataclass
 from types import SimpleNamespace
 from typing import Dict, List, Optional, Tuple
@@ -21,6 +22,9 @@ except Exception:
     _BYTETrackerClass = None  # type: ignore[assignment]
     HAS_BYTETRACK = False
 
+# Recent per-frame entries kept on each TrackedObject (10 s at 30 FPS).
+_TRACK_HISTORY_CAPACITY = 300
+
 
 class _ByteTrackDetections:
     """Minimal detection container compatible with Ultralytics BYTETracker."""
@@ -57,24 +61,78 @@ class _ByteTrackDetections:
 
 @dataclass
 class TrackedObject:
-    """Single tracked object."""
+    """Single tracked object.
+
+    The per-frame sequences keep only the most recent observations, at least
+    ``_TRACK_HISTORY_CAPACITY`` of them; they are trimmed in blocks so appends
+    stay amortized O(1). Lifetime figures (entry frame and position, frame
+    count, confidence stats) are kept in separate fields.
+    """
 
     track_id: int
     class_name: str
     history: List[Tuple[float, float]]
-    frame_indices: List[int]
+    frame_indices: "array[int]"  # array("q"): 8 bytes per frame instead of a boxed int
     last_frame_idx: int
-    confidence_history: List[float]
+    confidence_history: "array[float]"  # array("d"), exposed to NumPy without copying
+    first_frame_idx: int = -1
+    entry_position: Optional[Tuple[float, float]] = None
+    frames_seen: int = 0
+    confidence_count: int = 0
+    confidence_sum: float = 0.0
+    max_confidence: float = 0.0
+
+    def __post_init__(self):
+        if self.frame_indices:
+            self.first_frame_idx = self.frame_indices[0]
+            self.frames_seen = len(self.frame_indices)
+        if self.history:
+            self.entry_position = self.history[0]
+        for confidence in self.confidence_history:
+            self._add_confidence(confidence)
+
+    def _add_confidence(self, confidence: float) -> None:
+        self.confidence_count += 1
+        self.confidence_sum += confidence
+        if confidence > self.max_confidence:
+            self.max_confidence = confidence
+
+    def record(self, center: Tuple[float, float], frame_idx: int, confidence: float) -> None:
+        """Append one observation and trim the per-frame sequences when full."""
+        self.history.append(center)
+        self.frame_indices.append(frame_idx)
+        self.last_frame_idx = frame_idx
+        self.frames_seen += 1
+        self.confidence_history.append(confidence)
+        self._add_confidence(confidence)
+        if len(self.history) > 2 * _TRACK_HISTORY_CAPACITY:
+            for sequence in (self.history, self.frame_indices, self.confidence_history):
+                del sequence[:-_TRACK_HISTORY_CAPACITY]
+
+    @property
+    def entry_frame(self) -> int:
+        """Frame index where the track was first seen."""
+        return self.first_frame_idx
+
+    @property
+    def avg_confidence(self) -> float:
+        """Mean confidence over the whole track lifetime."""
+        return self.confidence_sum / self.confidence_count if self.confidence_count else 0.0
 
     @property
     def current_center(self) -> Tuple[float, float]:
         """Get latest position."""
         return self.history[-1] if self.history else (0, 0)
 
+    @property
+    def confidence_array(self) -> np.ndarray:
+        """Zero-copy float64 view of confidence history for vectorized reductions."""
+        return np.frombuffer(self.confidence_history, dtype=np.float64)
+
     @property
     def frames_alive(self) -> int:
         """Number of frames object has been tracked."""
-        return len(self.frame_indices)
+        return self.frames_seen
 
     @property
     def dwell_time_sec(self, fps: float = 30) -> float:
@@ -281,9 +339,9 @@ class ObjectTracker:
             track_id=stable_track_id,
             class_name=class_name,
             history=[(center_x, center_y)],
-            frame_indices=[self.frame_idx],
+            frame_indices=array("q", [self.frame_idx]),
             last_frame_idx=self.frame_idx,
-            confidence_history=[],
+            confidence_history=array("d"),
         )
         return stable_track_id
 
@@ -362,16 +420,13 @@ class ObjectTracker:
                     track_id=stable_track_id,
                     class_name=class_name,
                     history=[(center_x, center_y)],
-                    frame_indices=[self.frame_idx],
+                    frame_indices=array("q", [self.frame_idx]),
                     last_frame_idx=self.frame_idx,
-                    confidence_history=[float(score)],
+                    confidence_history=array("d", [float(score)]),
                 )
             else:
                 existing.class_name = class_name
-                existing.history.append((center_x, center_y))
-                existing.frame_indices.append(self.frame_idx)
-                existing.last_frame_idx = self.frame_idx
-                existing.confidence_history.append(float(score))
+                existing.record((center_x, center_y), self.frame_idx, float(score))
 
         # Drop stale tracks from local cache to keep interface behavior consistent.
         for track_id, track in list(self.tracks.items()):
@@ -461,10 +516,7 @@ class ObjectTracker:
 
                 if best_track_id is not None:
                     track = self.tracks[best_track_id]
-                    track.history.append((det_x, det_y))
-                    track.frame_indices.append(self.frame_idx)
-                    track.last_frame_idx = self.frame_idx
-                    track.confidence_history.append(det_obj.confidence)
+                    track.record((det_x, det_y), self.frame_idx, det_obj.confidence)
                     self._update_track_embedding(best_track_id, det_embedding)
                     matched_tracks.add(best_track_id)
                     used_detections.add(detection_idx)
@@ -477,9 +529,9 @@ class ObjectTracker:
                         track_id=self.next_track_id,
                         class_name=class_name,
                         history=[(det_x, det_y)],
-                        frame_indices=[self.frame_idx],
+                        frame_indices=array("q", [self.frame_idx]),
                         last_frame_idx=self.frame_idx,
-                        confidence_history=[det_obj.confidence],
+                        confidence_history=array("d", [det_obj.confidence]),
                     )
                     self.tracks[self.next_track_id] = new_track
                     self._update_track_embedding(self.next_track_id, det_embedding)
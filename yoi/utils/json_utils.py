@@ -0,0 +1,51 @@
+"""JSON serialization helpers with optional orjson acceleration."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except Exception:
+    orjson = None  # type: ignore[assignment]
+    HAS_ORJSON = False
+
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to JSON text, keeping non-ASCII as-is (like ensure_ascii=False).
+
+    Uses orjson when installed and falls back to stdlib json for anything
+    orjson rejects (e.g. arbitrary objects, >64-bit ints). Non-indented
+    output is compact (no spaces after separators) with either backend.
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            pass
+
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def json_dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes; same output as ``json_dumps(...).encode()``.
+
+    orjson already produces bytes, so this skips the decode/encode round trip
+    when writing straight to a file.
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            pass
+
+    return json_dumps(obj, indent=indent).encode("utf-8")